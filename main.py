@@ -1,8 +1,13 @@
 import asyncio
 
 from src.application import start_bot
+from src.config import settings
 from src.logger import setup_logging
+from src.supervisor import run_supervisor
 
 if __name__ == "__main__":
     setup_logging()
-    asyncio.run(start_bot())
+    if settings.BOT_WORKERS > 1:
+        asyncio.run(run_supervisor())
+    else:
+        asyncio.run(start_bot())
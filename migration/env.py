@@ -6,10 +6,22 @@ from sqlalchemy import pool
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
+from src.bot.models.event import (
+    EventConsumerOffset,  # noqa: F401
+    SwipeDailyStats,  # noqa: F401
+    SwipeEvent,  # noqa: F401
+    UserSwipeCounters,  # noqa: F401
+)
 from src.bot.models.like import (
     Likes,  # noqa: F401
+    LikesInbox,  # noqa: F401
     Matches,  # noqa: F401
 )
+from src.bot.models.moderation import (
+    ModerationJob,  # noqa: F401
+    ModerationResult,  # noqa: F401
+)
+from src.bot.models.notification import NotificationOutbox  # noqa: F401
 from src.bot.models.report import Reports  # noqa: F401
 from src.bot.models.user import Users  # noqa: F401
 from src.core.database import DATABASE_URL, Base
@@ -0,0 +1,63 @@
+"""add report_count and triage indexes
+
+Revision ID: 2b6f9e4d8a15
+Revises: 7d2e5b8c1f43
+Create Date: 2026-10-18 22:16:48.204519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b6f9e4d8a15'
+down_revision: Union[str, Sequence[str], None] = '7d2e5b8c1f43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reports', sa.Column('claimed_until', sa.DateTime(), nullable=True))
+    op.add_column('reports', sa.Column('accepted', sa.Boolean(), nullable=True))
+    op.add_column('users', sa.Column('report_count', sa.Integer(), server_default='0', nullable=False))
+    # Жалобы, поданные до появления разбора, считаются учтёнными
+    op.execute(
+        """
+        UPDATE users SET report_count = counts.n
+        FROM (SELECT target_user_id, count(*) AS n FROM reports GROUP BY target_user_id) AS counts
+        WHERE users.tg_id = counts.target_user_id
+        """
+    )
+    op.execute("UPDATE reports SET reviewed_at = now() AT TIME ZONE 'utc', accepted = true WHERE reviewed_at IS NULL")
+
+    # CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_reports_unreviewed',
+            'reports',
+            ['id'],
+            postgresql_where=sa.text('reviewed_at IS NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_users_feed',
+            'users',
+            ['id', 'report_count'],
+            postgresql_where=sa.text("moderation_status = 'approved'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_feed', table_name='users', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_reports_unreviewed', table_name='reports', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('users', 'report_count')
+    op.drop_column('reports', 'accepted')
+    op.drop_column('reports', 'claimed_until')
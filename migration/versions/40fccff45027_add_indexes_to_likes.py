@@ -0,0 +1,68 @@
+"""add indexes to likes
+
+Revision ID: 40fccff45027
+Revises: b605c0ed54d2
+Create Date: 2026-10-18 12:10:41.512304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '40fccff45027'
+down_revision: Union[str, Sequence[str], None] = 'b605c0ed54d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Перед уникальным индексом убираем повторные оценки одной пары, оставляя последнюю
+    op.execute(
+        """
+        DELETE FROM likes AS older
+        USING likes AS newer
+        WHERE older.from_user_id = newer.from_user_id
+          AND older.to_user_id = newer.to_user_id
+          AND older.id < newer.id
+        """
+    )
+
+    # CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_likes_from_user_id_to_user_id',
+            'likes',
+            ['from_user_id', 'to_user_id'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_likes_to_user_id_liked',
+            'likes',
+            ['to_user_id', 'from_user_id'],
+            postgresql_where=sa.text('is_like'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_likes_to_user_id',
+            'likes',
+            ['to_user_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_likes_to_user_id', table_name='likes', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_likes_to_user_id_liked', table_name='likes', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(
+            'uq_likes_from_user_id_to_user_id', table_name='likes', postgresql_concurrently=True, if_exists=True
+        )
@@ -0,0 +1,62 @@
+"""unique pair in matches
+
+Revision ID: 53741404310d
+Revises: 40fccff45027
+Create Date: 2026-10-18 13:02:17.883406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '53741404310d'
+down_revision: Union[str, Sequence[str], None] = '40fccff45027'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Пара в мэтче всегда хранится упорядоченной (user1_id < user2_id)
+    op.execute(
+        """
+        UPDATE matches
+        SET user1_id = user2_id, user2_id = user1_id
+        WHERE user1_id > user2_id
+        """
+    )
+    # Оставляем самый ранний мэтч каждой пары
+    op.execute(
+        """
+        DELETE FROM matches AS newer
+        USING matches AS older
+        WHERE newer.user1_id = older.user1_id
+          AND newer.user2_id = older.user2_id
+          AND newer.id > older.id
+        """
+    )
+
+    # Индекс строим CONCURRENTLY, затем превращаем его в ограничение без повторного сканирования
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_matches_user1_id_user2_id',
+            'matches',
+            ['user1_id', 'user2_id'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    op.execute(
+        sa.text(
+            "ALTER TABLE matches ADD CONSTRAINT uq_matches_user1_id_user2_id "
+            "UNIQUE USING INDEX uq_matches_user1_id_user2_id"
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_matches_user1_id_user2_id', 'matches', type_='unique')
@@ -0,0 +1,48 @@
+"""add indexes to matches
+
+Revision ID: 79b28bdc1718
+Revises: 92938b2e474f
+Create Date: 2026-10-18 14:21:33.270918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '79b28bdc1718'
+down_revision: Union[str, Sequence[str], None] = '92938b2e474f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_matches_user1_id_created_at',
+            'matches',
+            ['user1_id', 'created_at', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_matches_user2_id_created_at',
+            'matches',
+            ['user2_id', 'created_at', 'id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_matches_user2_id_created_at', table_name='matches', postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            'ix_matches_user1_id_created_at', table_name='matches', postgresql_concurrently=True, if_exists=True
+        )
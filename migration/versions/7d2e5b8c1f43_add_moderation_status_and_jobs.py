@@ -0,0 +1,42 @@
+"""add moderation_status and moderation_jobs
+
+Revision ID: 7d2e5b8c1f43
+Revises: e4b9a07c3d21
+Create Date: 2026-10-18 21:04:12.538217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e5b8c1f43'
+down_revision: Union[str, Sequence[str], None] = 'e4b9a07c3d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('moderation_jobs',
+    sa.Column('tg_id', sa.BigInteger(), nullable=False),
+    sa.Column('profile_text', sa.Text(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('available_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('tg_id')
+    )
+    op.create_index('ix_moderation_jobs_available_at', 'moderation_jobs', ['available_at'], unique=False)
+    # Уже заполненные анкеты остаются в ленте, новые ждут модерации
+    op.add_column('users', sa.Column('moderation_status', sa.String(length=16), server_default='approved', nullable=False))
+    op.alter_column('users', 'moderation_status', server_default='pending')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'moderation_status')
+    op.drop_index('ix_moderation_jobs_available_at', table_name='moderation_jobs')
+    op.drop_table('moderation_jobs')
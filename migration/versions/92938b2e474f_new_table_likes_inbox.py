@@ -0,0 +1,56 @@
+"""new table likes_inbox
+
+Revision ID: 92938b2e474f
+Revises: 53741404310d
+Create Date: 2026-10-18 13:48:05.104772
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '92938b2e474f'
+down_revision: Union[str, Sequence[str], None] = '53741404310d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('likes_inbox',
+    sa.Column('recipient_id', sa.BigInteger(), nullable=False),
+    sa.Column('sender_id', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['recipient_id'], ['users.tg_id'], ),
+    sa.ForeignKeyConstraint(['sender_id'], ['users.tg_id'], ),
+    sa.PrimaryKeyConstraint('recipient_id', 'sender_id')
+    )
+    op.create_index(
+        'ix_likes_inbox_recipient_id_created_at', 'likes_inbox', ['recipient_id', 'created_at', 'sender_id']
+    )
+    op.create_index('ix_likes_inbox_sender_id', 'likes_inbox', ['sender_id'])
+
+    # Заполняем входящие из уже существующих лайков, на которые получатель ещё не ответил
+    op.execute(
+        """
+        INSERT INTO likes_inbox (recipient_id, sender_id, created_at)
+        SELECT liked.to_user_id, liked.from_user_id, liked.created_at
+        FROM likes AS liked
+        WHERE liked.is_like
+          AND NOT EXISTS (
+              SELECT 1 FROM likes AS answer
+              WHERE answer.from_user_id = liked.to_user_id
+                AND answer.to_user_id = liked.from_user_id
+          )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_likes_inbox_sender_id', table_name='likes_inbox')
+    op.drop_index('ix_likes_inbox_recipient_id_created_at', table_name='likes_inbox')
+    op.drop_table('likes_inbox')
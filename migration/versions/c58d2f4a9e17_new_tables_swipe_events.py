@@ -0,0 +1,65 @@
+"""new tables swipe_events, event_consumer_offsets, user_swipe_counters, swipe_daily_stats
+
+Revision ID: c58d2f4a9e17
+Revises: a3c1e6f0b2d4
+Create Date: 2026-10-18 18:41:37.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58d2f4a9e17'
+down_revision: Union[str, Sequence[str], None] = 'a3c1e6f0b2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('swipe_events',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('xid', sa.BigInteger(), server_default=sa.text('(pg_current_xact_id()::text)::bigint'), nullable=False),
+    sa.Column('event_type', sa.String(length=16), nullable=False),
+    sa.Column('actor_id', sa.BigInteger(), nullable=False),
+    sa.Column('target_id', sa.BigInteger(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_swipe_events_xid_id', 'swipe_events', ['xid', 'id'])
+    op.create_table('event_consumer_offsets',
+    sa.Column('consumer', sa.String(length=64), nullable=False),
+    sa.Column('last_xid', sa.BigInteger(), nullable=False),
+    sa.Column('last_event_id', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('consumer')
+    )
+    op.create_table('user_swipe_counters',
+    sa.Column('tg_id', sa.BigInteger(), nullable=False),
+    sa.Column('likes_given', sa.Integer(), nullable=False),
+    sa.Column('dislikes_given', sa.Integer(), nullable=False),
+    sa.Column('likes_received', sa.Integer(), nullable=False),
+    sa.Column('matches', sa.Integer(), nullable=False),
+    sa.Column('reports_received', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('tg_id')
+    )
+    op.create_table('swipe_daily_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('event_type', sa.String(length=16), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'event_type')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('swipe_daily_stats')
+    op.drop_table('user_swipe_counters')
+    op.drop_table('event_consumer_offsets')
+    op.drop_index('ix_swipe_events_xid_id', table_name='swipe_events')
+    op.drop_table('swipe_events')
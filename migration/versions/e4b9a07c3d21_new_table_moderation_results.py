@@ -0,0 +1,36 @@
+"""new table moderation_results
+
+Revision ID: e4b9a07c3d21
+Revises: c58d2f4a9e17
+Create Date: 2026-10-18 19:27:54.110382
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9a07c3d21'
+down_revision: Union[str, Sequence[str], None] = 'c58d2f4a9e17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('moderation_results',
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('model_name', sa.String(length=128), nullable=False),
+    sa.Column('prompt_version', sa.String(length=16), nullable=False),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('content_hash', 'model_name', 'prompt_version')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('moderation_results')
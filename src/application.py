@@ -1,43 +1,198 @@
-from aiogram import Bot, Dispatcher
+import asyncio
+
+from aiogram import Bot, Dispatcher, Router
 from aiogram.client.default import DefaultBotProperties
 from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.enums import ParseMode
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
 
+from src.bot.dao.event import SwipeCountersDAO, SwipeDailyStatsDAO, SwipeEventsDAO
+from src.bot.dao.hot_queries import HOT_QUERIES
+from src.bot.dao.like import LikesInboxDAO
+from src.bot.dao.moderation import ModerationJobsDAO
+from src.bot.dao.notification import NotificationOutboxDAO
+from src.bot.dao.profile_cache import profile_cache
+from src.bot.dao.report import ReportsDAO
+from src.bot.dao.user import UsersDAO
+from src.bot.events.consumers import AnalyticsConsumer, CountersConsumer, InboxConsumer, NotificationConsumer
+from src.bot.events.pipeline import EventPipeline
 from src.bot.handlers.questionnaire import questionnaire_router
 from src.bot.handlers.start import start_router
 from src.bot.handlers.swipe import swipe_router
 from src.bot.handlers.user_profile import user_router
-from src.bot.llm_service import get_moderation_service
+from src.bot.llm_service import get_moderation_service, get_report_checker
+from src.bot.middlewares.db_session import DbSessionMiddleware
+from src.bot.middlewares.send_scheduler import SendSchedulerMiddleware, send_scheduler
+from src.bot.notifications.likes import LikeNotificationAggregator
+from src.bot.notifications.worker import NotificationWorker
 from src.bot.presenters import get_swipe_presenter, get_user_profile_presenter
 from src.bot.services import get_questionnaire_service, get_swipe_service, get_user_profile_service
+from src.bot.services.moderation_worker import ModerationWorker
+from src.bot.services.report_triage import ReportTriageWorker
 from src.config import settings
+from src.core.database import warm_up_pool
+from src.core.fsm_storage import build_fsm_storage
+from src.logger import logger
 
 
 def setup_bot() -> Bot:
     session = AiohttpSession(proxy="http://127.0.0.1:10808")
     bot = Bot(token=settings.BOT_TOKEN, session=session, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+    # Все исходящие запросы в чаты — через общий планировщик с лимитами Telegram
+    bot.session.middleware(SendSchedulerMiddleware(send_scheduler))
     return bot
 
 
-def setup_dispatcher() -> Dispatcher:
-    dp = Dispatcher()
+def setup_routers() -> Router:
+    """Все хендлеры бота; без сервисов и фоновых задач, поэтому годится и чтобы узнать используемые типы апдейтов"""
+    router = Router(name="bot")
+    router.include_routers(start_router, questionnaire_router, swipe_router, user_router)
+    return router
+
+
+def setup_dispatcher(worker: int | None = None) -> Dispatcher:
+    """worker — номер процесса-обработчика под супервизором: уведомления он шлёт только получателям своего шарда"""
+    dp = Dispatcher(storage=build_fsm_storage())
+    dp.update.outer_middleware(DbSessionMiddleware())
 
     dp.workflow_data["questionnaire_service"] = get_questionnaire_service()
-    dp.workflow_data["swipe_service"] = get_swipe_service()
+    swipe_service = get_swipe_service()
+    dp.workflow_data["swipe_service"] = swipe_service
     dp.workflow_data["swipe_presenter"] = get_swipe_presenter()
     dp.workflow_data["user_profile_service"] = get_user_profile_service()
     dp.workflow_data["user_profile_presenter"] = get_user_profile_presenter()
-    dp.workflow_data["moderation_service"] = get_moderation_service()
+    moderation_service = get_moderation_service()
+    dp.workflow_data["moderation_service"] = moderation_service
+
+    notifications = NotificationWorker(
+        outbox_dao=NotificationOutboxDAO,
+        durable=settings.NOTIFY_OUTBOX,
+        concurrency=settings.NOTIFY_CONCURRENCY,
+        max_attempts=settings.NOTIFY_MAX_ATTEMPTS,
+        lease_seconds=settings.NOTIFY_LEASE_SECONDS,
+        poll_interval=settings.NOTIFY_OUTBOX_POLL_INTERVAL,
+    )
+    like_notifier = LikeNotificationAggregator(
+        storage=dp.storage,
+        presenter=get_swipe_presenter(),
+        notifications=notifications,
+        window=settings.LIKE_NOTIFICATION_WINDOW,
+    )
+    events = EventPipeline(
+        events_dao=SwipeEventsDAO,
+        consumers=[
+            NotificationConsumer(
+                users_dao=UsersDAO,
+                presenter=get_swipe_presenter(),
+                notifications=notifications,
+                like_notifier=like_notifier,
+                max_age=settings.EVENTS_NOTIFY_MAX_AGE,
+                shard=worker or 0,
+                shards=settings.BOT_WORKERS if worker is not None else 1,
+            ),
+            InboxConsumer(inbox_dao=LikesInboxDAO),
+            CountersConsumer(counters_dao=SwipeCountersDAO),
+            AnalyticsConsumer(stats_dao=SwipeDailyStatsDAO),
+        ],
+        batch_size=settings.EVENTS_BATCH_SIZE,
+        poll_interval=settings.EVENTS_POLL_INTERVAL,
+    )
+    moderation_worker = ModerationWorker(
+        jobs_dao=ModerationJobsDAO,
+        users_dao=UsersDAO,
+        moderation=moderation_service,
+        presenter=get_user_profile_presenter(),
+        notifications=notifications,
+        concurrency=settings.MODERATION_WORKERS,
+        lease_seconds=settings.MODERATION_LEASE_SECONDS,
+        retry_delay=settings.MODERATION_RETRY_DELAY,
+        poll_interval=settings.MODERATION_QUEUE_POLL_INTERVAL,
+    )
+    report_triage = ReportTriageWorker(
+        reports_dao=ReportsDAO,
+        users_dao=UsersDAO,
+        checker=get_report_checker(),
+        batch_size=settings.REPORT_TRIAGE_BATCH_SIZE,
+        lease_seconds=settings.REPORT_TRIAGE_LEASE_SECONDS,
+        poll_interval=settings.REPORT_TRIAGE_POLL_INTERVAL,
+    )
+    dp.workflow_data["notifications"] = notifications
+    dp.workflow_data["like_notifier"] = like_notifier
+    dp.workflow_data["events"] = events
+    dp.startup.register(notifications.start)
+    dp.startup.register(events.start)
+    dp.startup.register(moderation_worker.start)
+    dp.startup.register(report_triage.start)
+    # Порядок важен: дописываются отложенные дизлайки, потребители событий и модерация перестают подкладывать
+    # уведомления, накопленные лайки уходят в очередь, и только потом очередь дорабатывает
+    if swipe_service.dislike_buffer:
+        dp.shutdown.register(swipe_service.dislike_buffer.stop)
+    dp.shutdown.register(events.stop)
+    dp.shutdown.register(moderation_worker.stop)
+    dp.shutdown.register(report_triage.stop)
+    dp.shutdown.register(moderation_service.stop)
+    dp.shutdown.register(like_notifier.flush_all)
+    dp.shutdown.register(notifications.stop)
 
-    dp.include_router(start_router)
-    dp.include_router(questionnaire_router)
-    dp.include_router(swipe_router)
-    dp.include_router(user_router)
+    dp.include_router(setup_routers())
     return dp
 
 
+async def prepare_runtime():
+    """Подготовка процесса, который обрабатывает апдейты: прогрев пула и подписка кэша анкет"""
+    if settings.DB_WARMUP:
+        # Открываем пул и готовим горячие запросы до первого апдейта
+        connections = await warm_up_pool(HOT_QUERIES)
+        logger.info(f"Пул БД прогрет: {connections} соединений")
+
+    await profile_cache.start()
+
+
 async def start_bot():
     bot = setup_bot()
     dp = setup_dispatcher()
+    await prepare_runtime()
+
+    if settings.BOT_RUN_MODE == "webhook":
+        await run_webhook(bot, dp)
+    else:
+        await dp.start_polling(bot)
+
+
+def setup_webhook_app(bot: Bot, dp: Dispatcher) -> web.Application:
+    """
+    aiohttp-приложение для приёма апдейтов вебхуком.
+    Запрос проверяется по секретному токену и сразу получает 200, апдейт обрабатывается фоновой задачей.
+    """
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        handle_in_background=True,
+        secret_token=settings.WEBHOOK_SECRET,
+    ).register(app, path=settings.WEBHOOK_PATH)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher):
+    if settings.WEBHOOK_URL:
+
+        @dp.startup()
+        async def register_webhook():
+            await bot.set_webhook(
+                url=settings.WEBHOOK_URL + settings.WEBHOOK_PATH,
+                secret_token=settings.WEBHOOK_SECRET,
+                allowed_updates=dp.resolve_used_update_types(),
+            )
 
-    await dp.start_polling(bot)
+    runner = web.AppRunner(setup_webhook_app(bot, dp))
+    await runner.setup()
+    site = web.TCPSite(runner, host=settings.WEBHOOK_HOST, port=settings.WEBHOOK_PORT)
+    await site.start()
+    logger.info(f"Вебхук слушает {settings.WEBHOOK_HOST}:{settings.WEBHOOK_PORT}{settings.WEBHOOK_PATH}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
@@ -1,6 +1,6 @@
 from sqlalchemy import delete, insert, select  # TODO: добавить update
 
-from src.core.database import async_session_maker
+from src.core.database import session_scope
 
 
 class BaseDAO:
@@ -29,31 +29,29 @@ class BaseDAO:
 
     @classmethod
     async def find_one_or_none(cls, **filter_by):
-        async with async_session_maker() as session:
+        async with session_scope(read_only=True) as session:
             query = select(cls.model).filter_by(**filter_by)
             result = await session.execute(query)
             return result.scalar_one_or_none()
 
     @classmethod
     async def find_all(cls, **filter_by):
-        async with async_session_maker() as session:
+        async with session_scope(read_only=True) as session:
             query = select(cls.model).filter_by(**filter_by)
             result = await session.execute(query)
             return result.scalars().all()
 
     @classmethod
     async def add(cls, **data):
-        async with async_session_maker() as session:
+        async with session_scope() as session:
             query = insert(cls.model).values(**data)
             await session.execute(query)
-            await session.commit()
 
     @classmethod
     async def delete_by_id(cls, id):
-        async with async_session_maker() as session:
+        async with session_scope() as session:
             query = delete(cls.model).where(cls.model.id == id)
             await session.execute(query)
-            await session.commit()
 
     @classmethod
     async def exists(cls, **filter_by) -> bool:
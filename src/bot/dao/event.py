@@ -0,0 +1,163 @@
+from collections.abc import Callable
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Insert, String, Text, cast, func, insert, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.bot.dao.base import BaseDAO
+from src.bot.enum.event import SwipeEventType
+from src.bot.models.event import EventConsumerOffset, SwipeDailyStats, SwipeEvent, UserSwipeCounters
+from src.core.database import session_scope
+
+# Кого будить после коммита транзакции с новыми событиями (потребители этого процесса)
+_listeners: list[Callable[[], None]] = []
+
+
+def on_swipe_events(listener: Callable[[], None]) -> None:
+    _listeners.append(listener)
+
+
+async def swipe_events_written() -> None:
+    """after_commit-колбэк для транзакций, которые пишут в swipe_events"""
+    for listener in _listeners:
+        listener()
+
+
+class SwipeEventsDAO(BaseDAO):
+    model = SwipeEvent  # type: ignore
+
+    @classmethod
+    def insert_event(
+        cls, event_type: SwipeEventType, actor_id: int, target_id: int, payload: dict | None = None
+    ) -> Insert:
+        """INSERT события — выполняется в транзакции того действия, которое его породило"""
+        return insert(cls.model).values(
+            event_type=event_type.value, actor_id=actor_id, target_id=target_id, payload=payload
+        )
+
+    @classmethod
+    async def ensure_offsets(cls, consumers: list[str], start_from: dict[str, str] | None = None):
+        """
+        Завести позиции новым потребителям: с начала или, если указан в start_from, с позиции другого потребителя
+        (чтобы новый не переигрывал то, что тот уже обработал)
+        """
+        async with session_scope() as session:
+            for consumer, source in (start_from or {}).items():
+                copy = select(
+                    literal(consumer, String(64)), EventConsumerOffset.last_xid, EventConsumerOffset.last_event_id
+                ).where(EventConsumerOffset.consumer == source)
+                query = (
+                    pg_insert(EventConsumerOffset)
+                    .from_select(["consumer", "last_xid", "last_event_id"], copy)
+                    .on_conflict_do_nothing(index_elements=[EventConsumerOffset.consumer])
+                )
+                await session.execute(query)
+            query = (
+                pg_insert(EventConsumerOffset)
+                .values([{"consumer": name, "last_xid": 0, "last_event_id": 0} for name in consumers])
+                .on_conflict_do_nothing(index_elements=[EventConsumerOffset.consumer])
+            )
+            await session.execute(query)
+
+    @classmethod
+    async def claim_offset(cls, consumer: str) -> tuple[int, int] | None:
+        """
+        Заблокировать позицию потребителя до конца транзакции и вернуть её (xid, id).
+        None — эту пачку уже обрабатывает другой процесс.
+        """
+        async with session_scope() as session:
+            query = (
+                select(EventConsumerOffset.last_xid, EventConsumerOffset.last_event_id)
+                .where(EventConsumerOffset.consumer == consumer)
+                .with_for_update(skip_locked=True)
+            )
+            row = (await session.execute(query)).one_or_none()
+            return tuple(row) if row else None
+
+    @classmethod
+    async def read_after(cls, last_xid: int, last_event_id: int, limit: int) -> list[SwipeEvent]:
+        """
+        События после позиции в порядке (xid, id), только из уже завершённых транзакций:
+        всё, что ниже xmin текущего снимка, закоммичено или откачено, и новых событий с таким xid не появится.
+        """
+        async with session_scope() as session:
+            snapshot_xmin = cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
+            query = (
+                select(cls.model)
+                .where(
+                    cls.model.xid < snapshot_xmin,
+                    tuple_(cls.model.xid, cls.model.id)
+                    > tuple_(literal(last_xid, BigInteger), literal(last_event_id, BigInteger)),
+                )
+                .order_by(cls.model.xid, cls.model.id)
+                .limit(limit)
+            )
+            result = await session.execute(query)
+            return list(result.scalars().all())
+
+    @classmethod
+    async def save_offset(cls, consumer: str, last_xid: int, last_event_id: int):
+        async with session_scope() as session:
+            query = (
+                update(EventConsumerOffset)
+                .where(EventConsumerOffset.consumer == consumer)
+                .values(last_xid=last_xid, last_event_id=last_event_id, updated_at=datetime.utcnow())
+            )
+            await session.execute(query)
+
+    @classmethod
+    async def reset_offset(cls, consumer: str, from_event_id: int):
+        """Переиграть события потребителя начиная с from_event_id (0 — с самого начала)"""
+        async with session_scope() as session:
+            position = (0, 0)
+            if from_event_id:
+                event_xid = await session.scalar(select(cls.model.xid).where(cls.model.id == from_event_id))
+                if event_xid is None:
+                    raise ValueError(f"События {from_event_id} нет")
+                position = (event_xid, from_event_id - 1)
+
+            query = (
+                pg_insert(EventConsumerOffset)
+                .values(consumer=consumer, last_xid=position[0], last_event_id=position[1])
+                .on_conflict_do_update(
+                    index_elements=[EventConsumerOffset.consumer],
+                    set_={"last_xid": position[0], "last_event_id": position[1], "updated_at": datetime.utcnow()},
+                )
+            )
+            await session.execute(query)
+
+
+class SwipeCountersDAO(BaseDAO):
+    model = UserSwipeCounters  # type: ignore
+
+    @classmethod
+    async def increment(cls, deltas: dict[int, dict[str, int]]):
+        """Прибавить счётчики пачкой: {tg_id: {"likes_given": 1, ...}}"""
+        if not deltas:
+            return
+        columns = ["likes_given", "dislikes_given", "likes_received", "matches", "reports_received"]
+        rows = [{"tg_id": tg_id, **{column: delta.get(column, 0) for column in columns}} for tg_id, delta in deltas.items()]
+        async with session_scope() as session:
+            query = pg_insert(cls.model).values(rows)
+            query = query.on_conflict_do_update(
+                index_elements=[cls.model.tg_id],
+                set_={column: getattr(cls.model, column) + getattr(query.excluded, column) for column in columns},
+            )
+            await session.execute(query)
+
+
+class SwipeDailyStatsDAO(BaseDAO):
+    model = SwipeDailyStats  # type: ignore
+
+    @classmethod
+    async def increment(cls, counts: dict[tuple[date, str], int]):
+        if not counts:
+            return
+        rows = [{"day": day, "event_type": event_type, "count": count} for (day, event_type), count in counts.items()]
+        async with session_scope() as session:
+            query = pg_insert(cls.model).values(rows)
+            query = query.on_conflict_do_update(
+                index_elements=[cls.model.day, cls.model.event_type],
+                set_={"count": cls.model.count + query.excluded.count},
+            )
+            await session.execute(query)
@@ -0,0 +1,18 @@
+from src.bot.dao.like import LikesInboxDAO, MatchesDAO
+from src.bot.dao.user import UsersDAO
+from src.bot.enum.gender import Gender
+from src.config import settings
+
+# Запросы, которые выполняются почти на каждый апдейт. При старте их прогоняют на каждом
+# соединении пула (warm_up_pool), чтобы первые пользователи после деплоя не платили за подготовку.
+# Только чтение и с несуществующим tg_id — прогрев ничего не меняет в БД.
+_NOBODY = 0
+
+HOT_QUERIES = [
+    lambda: UsersDAO.get_by_tg_id(_NOBODY),
+    lambda: UsersDAO.get_status_of_questionnaire(_NOBODY),
+    lambda: UsersDAO.get_candidates(_NOBODY, Gender.MALE, after_id=0, limit=settings.CANDIDATE_BATCH_SIZE),
+    lambda: UsersDAO.get_candidates(_NOBODY, Gender.SKIP_GENDER, after_id=0, limit=settings.CANDIDATE_BATCH_SIZE),
+    lambda: LikesInboxDAO.get_oldest_senders(_NOBODY),
+    lambda: MatchesDAO.get_match_cards(_NOBODY, limit=settings.MATCHES_PAGE_SIZE + 1),
+]
@@ -1,12 +1,36 @@
 # src/likes/dao.py
 
+from datetime import datetime
 from typing import List, Sequence
 
-from sqlalchemy import and_, delete, or_, select
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    String,
+    and_,
+    column,
+    delete,
+    exists,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert
 
 from src.bot.dao.base import BaseDAO
-from src.bot.models.like import Likes, Matches
-from src.core.database import async_session_maker
+from src.bot.dao.event import swipe_events_written
+from src.bot.enum.event import SwipeEventType
+from src.bot.enum.moderation import ModerationStatus
+from src.bot.models.event import SwipeEvent
+from src.bot.models.like import Likes, LikesInbox, Matches
+from src.bot.models.responses import LikeRegistration, MatchCard
+from src.bot.models.user import Users
+from src.core.database import after_commit, session_scope
 
 
 class LikesDAO(BaseDAO):
@@ -17,10 +41,159 @@ class LikesDAO(BaseDAO):
         """Добавить лайк или дизлайк"""
         await cls.add(from_user_id=from_user_id, to_user_id=to_user_id, is_like=is_like)
 
+    @classmethod
+    async def register_like(cls, from_user_id: int, to_user_id: int, is_like: bool) -> LikeRegistration:
+        """
+        Записать оценку и, если лайк взаимный, создать мэтч — одним CTE-запросом в одной транзакции.
+
+        Повторная оценка той же пары обновляет существующую (ON CONFLICT DO UPDATE),
+        мэтч вставляется идемпотентно (ON CONFLICT DO NOTHING по uq_matches_user1_id_user2_id).
+        Тем же запросом в swipe_events пишутся события оценки и мэтча — всё производное
+        (уведомления, счётчики, likes_inbox, аналитика) ведут потребители событий.
+        Перед запросом берётся advisory-блокировка на пару, чтобы два одновременных
+        встречных лайка не разминулись и мэтч создался ровно один раз.
+        """
+        user1_id, user2_id = sorted((from_user_id, to_user_id))
+        now = datetime.utcnow()
+
+        upsert_like = insert(Likes).values(
+            from_user_id=from_user_id, to_user_id=to_user_id, is_like=is_like, created_at=now
+        )
+        new_like = (
+            upsert_like.on_conflict_do_update(
+                index_elements=[Likes.from_user_id, Likes.to_user_id],
+                set_={"is_like": upsert_like.excluded.is_like, "created_at": upsert_like.excluded.created_at},
+            )
+            .returning(Likes.is_like)
+            .cte("new_like")
+        )
+        liked_back = exists().where(
+            Likes.from_user_id == to_user_id,
+            Likes.to_user_id == from_user_id,
+            Likes.is_like.is_(True),
+        )
+        is_match = and_(select(new_like.c.is_like).scalar_subquery(), liked_back)
+
+        new_match = (
+            insert(Matches)
+            .from_select(
+                ["user1_id", "user2_id", "created_at"],
+                select(literal(user1_id, BigInteger), literal(user2_id, BigInteger), literal(now)).where(is_match),
+            )
+            .on_conflict_do_nothing(index_elements=[Matches.user1_id, Matches.user2_id])
+            .returning(Matches.id)
+            .cte("new_match")
+        )
+
+        match_created = exists(select(new_match.c.id))
+        event_columns = ["event_type", "actor_id", "target_id", "payload", "created_at"]
+        rating_event = (
+            insert(SwipeEvent)
+            .from_select(
+                event_columns,
+                select(
+                    literal((SwipeEventType.LIKE if is_like else SwipeEventType.DISLIKE).value, String),
+                    literal(from_user_id, BigInteger),
+                    literal(to_user_id, BigInteger),
+                    func.jsonb_build_object("match", match_created),
+                    literal(now),
+                ),
+            )
+            .cte("rating_event")
+        )
+        match_event = (
+            insert(SwipeEvent)
+            .from_select(
+                event_columns,
+                select(
+                    literal(SwipeEventType.MATCH.value, String),
+                    literal(from_user_id, BigInteger),
+                    literal(to_user_id, BigInteger),
+                    null(),
+                    literal(now),
+                ).where(match_created),
+            )
+            .cte("match_event")
+        )
+
+        query = (
+            select(
+                Users,
+                is_match.label("is_match"),
+                match_created.label("match_created"),
+            )
+            .where(Users.tg_id.in_([from_user_id, to_user_id]))
+            .add_cte(rating_event, match_event)
+        )
+
+        async with session_scope() as session:
+            await session.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"like:{user1_id}:{user2_id}"))))
+            rows = (await session.execute(query)).all()
+            after_commit(session, swipe_events_written)
+
+        users = {user.tg_id: user for user, _, _ in rows}
+        return LikeRegistration(
+            is_match=any(row.is_match for row in rows),
+            match_created=any(row.match_created for row in rows),
+            current_user=users.get(from_user_id),
+            target_user=users.get(to_user_id),
+        )
+
+    @classmethod
+    async def add_dislikes(cls, dislikes: Sequence[tuple[int, int, datetime]]) -> int:
+        """
+        Записать пачку дизлайков (from_user_id, to_user_id, created_at) одним запросом:
+        многострочный upsert в likes и по событию DISLIKE на каждую записанную строку.
+        Пары внутри пачки должны быть уникальны. Дизлайк не создаёт мэтч, поэтому блокировка пары не нужна;
+        оценки пользователей, удалённых до записи, отбрасываются. Возвращает число записанных строк.
+        """
+        batch = values(
+            column("from_user_id", BigInteger),
+            column("to_user_id", BigInteger),
+            column("created_at", DateTime),
+            name="batch",
+        ).data(list(dislikes))
+        sender = Users.__table__.alias("sender")
+        target = Users.__table__.alias("target")
+        rows = (
+            select(batch.c.from_user_id, batch.c.to_user_id, literal(False), batch.c.created_at)
+            .join(sender, sender.c.tg_id == batch.c.from_user_id)
+            .join(target, target.c.tg_id == batch.c.to_user_id)
+        )
+        written = insert(cls.model).from_select(["from_user_id", "to_user_id", "is_like", "created_at"], rows)
+        written = (
+            written.on_conflict_do_update(
+                index_elements=[cls.model.from_user_id, cls.model.to_user_id],  # type: ignore
+                set_={"is_like": written.excluded.is_like, "created_at": written.excluded.created_at},
+            )
+            .returning(cls.model.from_user_id, cls.model.to_user_id, cls.model.created_at)  # type: ignore
+            .cte("written")
+        )
+        events = (
+            insert(SwipeEvent)
+            .from_select(
+                ["event_type", "actor_id", "target_id", "payload", "created_at"],
+                select(
+                    literal(SwipeEventType.DISLIKE.value, String),
+                    written.c.from_user_id,
+                    written.c.to_user_id,
+                    func.jsonb_build_object("match", False),
+                    written.c.created_at,
+                ),
+            )
+            .cte("dislike_events")
+        )
+        query = select(func.count()).select_from(written).add_cte(events)
+
+        async with session_scope() as session:
+            count = await session.scalar(query)
+            after_commit(session, swipe_events_written)
+        return count
+
     @classmethod
     async def check_mutual_like(cls, user1_id: int, user2_id: int) -> bool:
         """Проверка взаимного лайка"""
-        async with async_session_maker() as session:
+        async with session_scope(read_only=True) as session:
             # Проверяем, что оба пользователя лайкнули друг друга
             query = select(cls.model).where(  # type: ignore
                 or_(
@@ -55,7 +228,7 @@ class LikesDAO(BaseDAO):
     @classmethod
     async def get_rated_user_ids(cls, from_user_id: int) -> List[int]:
         """ID всех анкет, которые пользователь уже оценил (лайк или дизлайк)"""
-        async with async_session_maker() as session:
+        async with session_scope(read_only=True) as session:
             query = select(cls.model.to_user_id).where(
                 cls.model.from_user_id == from_user_id  # type: ignore
             )
@@ -65,7 +238,7 @@ class LikesDAO(BaseDAO):
     @classmethod
     async def get_users_who_liked_me(cls, user_id: int) -> List[int]:
         """ID пользователей, которые лайкнули меня"""
-        async with async_session_maker() as session:
+        async with session_scope(read_only=True) as session:
             liked_me_query = select(cls.model.from_user_id).where(
                 and_(
                     cls.model.to_user_id == user_id,  # type: ignore
@@ -90,7 +263,7 @@ class LikesDAO(BaseDAO):
         if not other_user_ids:
             return []
 
-        async with async_session_maker() as session:
+        async with session_scope(read_only=True) as session:
             query = select(cls.model.to_user_id).where(  # type: ignore
                 cls.model.from_user_id == user_id,  # type: ignore
                 cls.model.to_user_id.in_(other_user_ids),  # type: ignore
@@ -111,7 +284,7 @@ class LikesDAO(BaseDAO):
         if not other_user_ids:
             return []
 
-        async with async_session_maker() as session:
+        async with session_scope(read_only=True) as session:
             query = select(cls.model.to_user_id).where(  # type: ignore
                 cls.model.from_user_id == user_id,  # type: ignore
                 cls.model.to_user_id.in_(other_user_ids),  # type: ignore
@@ -122,7 +295,7 @@ class LikesDAO(BaseDAO):
 
     @classmethod
     async def delete_likes_by_user(cls, tg_id: int):
-        async with async_session_maker() as session:
+        async with session_scope() as session:
             query = delete(cls.model).where(
                 or_(
                     cls.model.from_user_id == tg_id,  # type: ignore
@@ -130,7 +303,100 @@ class LikesDAO(BaseDAO):
                 )
             )
             await session.execute(query)
-            await session.commit()
+
+
+class LikesInboxDAO(BaseDAO):
+    model = LikesInbox  # type: ignore
+
+    @classmethod
+    async def get_oldest_senders(
+        cls, recipient_id: int, limit: int = 1, after: tuple[datetime, int] | None = None
+    ) -> list[Users]:
+        """
+        Анкеты тех, кто лайкнул recipient_id и ещё не получил ответа, начиная с самого старого лайка.
+        Читается только голова индекса (recipient_id, created_at); записи ведёт потребитель событий,
+        поэтому уже отвеченные или отозванные, но ещё не убранные лайки отсекаются проверкой по likes.
+        after — курсор (created_at, sender_id) последней полученной записи для следующей страницы.
+        """
+        async with session_scope(read_only=True) as session:
+            still_liked = exists().where(
+                Likes.from_user_id == cls.model.sender_id,  # type: ignore
+                Likes.to_user_id == recipient_id,
+                Likes.is_like.is_(True),
+            )
+            answered = exists().where(
+                Likes.from_user_id == recipient_id,
+                Likes.to_user_id == cls.model.sender_id,  # type: ignore
+            )
+            query = (
+                select(Users)
+                .join(cls.model, cls.model.sender_id == Users.tg_id)  # type: ignore
+                .where(
+                    cls.model.recipient_id == recipient_id,  # type: ignore
+                    Users.moderation_status == ModerationStatus.APPROVED.value,
+                    still_liked,
+                    ~answered,
+                )
+                .order_by(cls.model.created_at, cls.model.sender_id)  # type: ignore
+                .limit(limit)
+            )
+            if after is not None:
+                query = query.where(tuple_(cls.model.created_at, cls.model.sender_id) > after)  # type: ignore
+            result = await session.execute(query)
+            return list(result.scalars().all())
+
+    @classmethod
+    async def apply_rating(cls, from_user_id: int, to_user_id: int, is_like: bool, rated_at: datetime):
+        """
+        Учесть оценку во входящих (вызывается потребителем событий).
+        Ответ на входящий лайк убирает его; лайк попадает во входящие получателя, только если он всё ещё
+        в силе и получатель ещё не оценивал автора, — поэтому повторная обработка событий безопасна.
+        """
+        async with session_scope() as session:
+            answered = delete(cls.model).where(
+                cls.model.recipient_id == from_user_id,  # type: ignore
+                cls.model.sender_id == to_user_id,  # type: ignore
+            )
+            await session.execute(answered)
+
+            if not is_like:
+                # Переоценка лайка на дизлайк отзывает его из входящих получателя
+                revoked = delete(cls.model).where(
+                    cls.model.recipient_id == to_user_id,  # type: ignore
+                    cls.model.sender_id == from_user_id,  # type: ignore
+                )
+                await session.execute(revoked)
+                return
+
+            still_liked = exists().where(
+                Likes.from_user_id == from_user_id,
+                Likes.to_user_id == to_user_id,
+                Likes.is_like.is_(True),
+            )
+            rated_back = exists().where(Likes.from_user_id == to_user_id, Likes.to_user_id == from_user_id)
+            both_exist = select(func.count()).where(Users.tg_id.in_([from_user_id, to_user_id])).scalar_subquery() == 2
+            query = (
+                insert(cls.model)
+                .from_select(
+                    ["recipient_id", "sender_id", "created_at"],
+                    select(literal(to_user_id, BigInteger), literal(from_user_id, BigInteger), literal(rated_at)).where(
+                        still_liked, ~rated_back, both_exist
+                    ),
+                )
+                .on_conflict_do_nothing(index_elements=[cls.model.recipient_id, cls.model.sender_id])  # type: ignore
+            )
+            await session.execute(query)
+
+    @classmethod
+    async def delete_inbox_by_user(cls, tg_id: int):
+        async with session_scope() as session:
+            query = delete(cls.model).where(
+                or_(
+                    cls.model.recipient_id == tg_id,  # type: ignore
+                    cls.model.sender_id == tg_id,  # type: ignore
+                )
+            )
+            await session.execute(query)
 
 
 class MatchesDAO(BaseDAO):
@@ -167,7 +433,7 @@ class MatchesDAO(BaseDAO):
     @classmethod
     async def get_user_matches(cls, user_id: int):
         """Получить все мэтчи пользователя"""
-        async with async_session_maker() as session:
+        async with session_scope(read_only=True) as session:
             query = select(cls.model).where(  # type: ignore
                 or_(
                     cls.model.user1_id == user_id,  # type: ignore
@@ -177,9 +443,51 @@ class MatchesDAO(BaseDAO):
             result = await session.execute(query)
             return result.scalars().all()
 
+    @classmethod
+    async def get_match_cards(
+        cls, user_id: int, limit: int, before: tuple[datetime, int] | None = None
+    ) -> list[MatchCard]:
+        """
+        Страница мэтчей пользователя одним запросом, от новых к старым.
+
+        Пользователь может быть и в user1_id, и в user2_id, поэтому обе стороны выбираются
+        отдельно (UNION ALL) — каждая по своему индексу (userN_id, created_at, id) и с LIMIT,
+        а затем соединяются с users. before — курсор (created_at, id) последнего мэтча прошлой страницы.
+        """
+        sides = []
+        for me, other in ((cls.model.user1_id, cls.model.user2_id), (cls.model.user2_id, cls.model.user1_id)):  # type: ignore
+            side = select(
+                cls.model.id.label("match_id"),  # type: ignore
+                other.label("other_id"),
+                cls.model.created_at.label("matched_at"),  # type: ignore
+            ).where(me == user_id)
+            if before is not None:
+                side = side.where(tuple_(cls.model.created_at, cls.model.id) < before)  # type: ignore
+            sides.append(side.order_by(cls.model.created_at.desc(), cls.model.id.desc()).limit(limit))  # type: ignore
+        page = union_all(*sides).subquery("page")
+
+        query = (
+            select(
+                page.c.match_id,
+                page.c.matched_at,
+                Users.tg_id,
+                Users.name,
+                Users.age,
+                Users.city,
+                Users.username,
+            )
+            .join(Users, Users.tg_id == page.c.other_id)
+            .order_by(page.c.matched_at.desc(), page.c.match_id.desc())
+            .limit(limit)
+        )
+
+        async with session_scope(read_only=True) as session:
+            result = await session.execute(query)
+            return [MatchCard.model_validate(row, from_attributes=True) for row in result.all()]
+
     @classmethod
     async def delete_matches_by_user(cls, tg_id: int):
-        async with async_session_maker() as session:
+        async with session_scope() as session:
             query = delete(cls.model).where(
                 or_(
                     cls.model.user1_id == tg_id,  # type: ignore
@@ -187,4 +495,3 @@ class MatchesDAO(BaseDAO):
                 )
             )
             await session.execute(query)
-            await session.commit()
@@ -0,0 +1,112 @@
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from src.bot.dao.base import BaseDAO
+from src.bot.models.moderation import ModerationJob, ModerationResult
+from src.core.database import after_commit, session_scope
+
+# Кого будить после коммита транзакции с новой задачей модерации (обработчики этого процесса)
+_listeners: list[Callable[[], None]] = []
+
+
+def on_moderation_jobs(listener: Callable[[], None]) -> None:
+    _listeners.append(listener)
+
+
+async def moderation_jobs_written() -> None:
+    for listener in _listeners:
+        listener()
+
+
+class ModerationResultsDAO(BaseDAO):
+    model = ModerationResult  # type: ignore
+
+    @classmethod
+    async def get_result(cls, content_hash: str, model_name: str, prompt_version: str) -> dict | None:
+        async with session_scope(read_only=True) as session:
+            query = select(cls.model.result).where(
+                cls.model.content_hash == content_hash,
+                cls.model.model_name == model_name,
+                cls.model.prompt_version == prompt_version,
+            )
+            return await session.scalar(query)
+
+    @classmethod
+    async def save_result(cls, content_hash: str, model_name: str, prompt_version: str, result: dict):
+        async with session_scope() as session:
+            query = (
+                insert(cls.model)
+                .values(content_hash=content_hash, model_name=model_name, prompt_version=prompt_version, result=result)
+                .on_conflict_do_update(
+                    index_elements=[cls.model.content_hash, cls.model.model_name, cls.model.prompt_version],
+                    set_={"result": result},
+                )
+            )
+            await session.execute(query)
+
+
+class ModerationJobsDAO(BaseDAO):
+    model = ModerationJob  # type: ignore
+
+    @classmethod
+    async def enqueue(cls, tg_id: int, profile_text: str):
+        """Поставить анкету на модерацию; если прежняя ещё в очереди, она заменяется новой версией"""
+        async with session_scope() as session:
+            now = datetime.utcnow()
+            query = insert(cls.model).values(
+                tg_id=tg_id, profile_text=profile_text, version=1, attempts=0, available_at=now, created_at=now
+            )
+            query = query.on_conflict_do_update(
+                index_elements=[cls.model.tg_id],
+                set_={
+                    "profile_text": query.excluded.profile_text,
+                    "version": cls.model.version + 1,
+                    "attempts": 0,
+                    "available_at": now,
+                    "created_at": now,
+                },
+            )
+            await session.execute(query)
+            after_commit(session, moderation_jobs_written)
+
+    @classmethod
+    async def claim_due(cls, limit: int, lease_seconds: float) -> list[ModerationJob]:
+        """Забрать свободные задачи на lease_seconds; SKIP LOCKED не даёт двум процессам взять одну"""
+        async with session_scope() as session:
+            now = datetime.utcnow()
+            due = (
+                select(cls.model.tg_id)
+                .where(cls.model.available_at <= now)
+                .order_by(cls.model.available_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            query = (
+                update(cls.model)
+                .where(cls.model.tg_id.in_(due.scalar_subquery()))
+                .values(available_at=now + timedelta(seconds=lease_seconds))
+                .returning(cls.model)
+            )
+            result = await session.execute(query)
+            return list(result.scalars().all())
+
+    @classmethod
+    async def reschedule(cls, tg_id: int, version: int, attempts: int, available_at: datetime):
+        async with session_scope() as session:
+            query = (
+                update(cls.model)
+                .where(cls.model.tg_id == tg_id, cls.model.version == version)
+                .values(attempts=attempts, available_at=available_at)
+            )
+            await session.execute(query)
+
+    @classmethod
+    async def complete(cls, tg_id: int, version: int) -> bool:
+        """Снять задачу с очереди; False — пока шла модерация, анкету заменили и вердикт устарел"""
+        async with session_scope() as session:
+            query = delete(cls.model).where(cls.model.tg_id == tg_id, cls.model.version == version)
+            result = await session.execute(query)
+            return result.rowcount > 0
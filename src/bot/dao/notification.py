@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select, update
+
+from src.bot.dao.base import BaseDAO
+from src.bot.models.notification import NotificationOutbox
+from src.core.database import session_scope
+
+
+class NotificationOutboxDAO(BaseDAO):
+    model = NotificationOutbox  # type: ignore
+
+    @classmethod
+    async def add_notification(
+        cls, chat_id: int, text: str, reply_markup: dict | None, lease_seconds: float
+    ) -> int:
+        """Записать уведомление; lease — сколько времени его не забирает разбор хвоста (отправит сам процесс)"""
+        async with session_scope() as session:
+            query = (
+                insert(cls.model)
+                .values(
+                    chat_id=chat_id,
+                    text=text,
+                    reply_markup=reply_markup,
+                    attempts=0,
+                    available_at=datetime.utcnow() + timedelta(seconds=lease_seconds),
+                    created_at=datetime.utcnow(),
+                )
+                .returning(cls.model.id)
+            )
+            result = await session.execute(query)
+            return result.scalar_one()
+
+    @classmethod
+    async def claim_due(cls, limit: int, lease_seconds: float) -> list[NotificationOutbox]:
+        """
+        Забрать уведомления, которые никто не отправляет (процесс упал или перезапустился).
+        SKIP LOCKED и продление available_at не дают двум процессам взять одну запись.
+        """
+        async with session_scope() as session:
+            now = datetime.utcnow()
+            due = (
+                select(cls.model.id)
+                .where(cls.model.available_at <= now)
+                .order_by(cls.model.available_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            query = (
+                update(cls.model)
+                .where(cls.model.id.in_(due.scalar_subquery()))
+                .values(available_at=now + timedelta(seconds=lease_seconds))
+                .returning(cls.model)
+            )
+            result = await session.execute(query)
+            return list(result.scalars().all())
+
+    @classmethod
+    async def reschedule(cls, notification_id: int, attempts: int, available_at: datetime):
+        async with session_scope() as session:
+            query = (
+                update(cls.model)
+                .where(cls.model.id == notification_id)
+                .values(attempts=attempts, available_at=available_at)
+            )
+            await session.execute(query)
+
+    @classmethod
+    async def delete_notification(cls, notification_id: int):
+        async with session_scope() as session:
+            await session.execute(delete(cls.model).where(cls.model.id == notification_id))
@@ -0,0 +1,74 @@
+import json
+
+from src.bot.models.user import Users
+from src.config import settings
+from src.core.cache import CacheBackend, CacheStats, InMemoryCacheBackend, RedisCacheBackend, TTLLRUCache
+
+INVALIDATION_CHANNEL = "profile_cache:invalidate"
+
+
+class ProfileCache:
+    """
+    Кэш анкет по tg_id перед UsersDAO.get_by_tg_id.
+
+    Первый уровень — TTL+LRU в памяти процесса. Если задан общий бэкенд, он служит вторым уровнем,
+    а инвалидация рассылается через pub/sub, чтобы остальные процессы бота выбросили свою копию.
+    Хранятся значения колонок, а не ORM-объекты: каждый get отдаёт новый объект вне сессии.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, backend: CacheBackend | None = None):
+        self.ttl = ttl
+        self.backend = backend
+        self.local: TTLLRUCache[int, dict] = TTLLRUCache(maxsize, ttl)
+        self.shared_stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.local.stats
+
+    async def start(self) -> None:
+        """Подписаться на инвалидации от других процессов"""
+        if self.backend is not None:
+            await self.backend.subscribe(INVALIDATION_CHANNEL, lambda tg_id: self.local.delete(int(tg_id)))
+
+    async def get(self, tg_id: int) -> Users | None:
+        values = self.local.get(tg_id)
+        if values is None and self.backend is not None:
+            raw = await self.backend.get(self._key(tg_id))
+            if raw is None:
+                self.shared_stats.misses += 1
+                return None
+            self.shared_stats.hits += 1
+            values = json.loads(raw)
+            self.local.set(tg_id, values)
+        return Users(**values) if values is not None else None
+
+    async def set(self, user: Users) -> None:
+        values = {column.key: getattr(user, column.key) for column in Users.__table__.columns}
+        self.local.set(user.tg_id, values)
+        if self.backend is not None:
+            await self.backend.set(self._key(user.tg_id), json.dumps(values).encode(), self.ttl)
+
+    def invalidate_local(self, tg_id: int) -> None:
+        self.local.delete(tg_id)
+
+    async def invalidate(self, tg_id: int) -> None:
+        self.local.delete(tg_id)
+        if self.backend is not None:
+            await self.backend.delete(self._key(tg_id))
+            await self.backend.publish(INVALIDATION_CHANNEL, str(tg_id))
+
+    @staticmethod
+    def _key(tg_id: int) -> str:
+        return f"profile:{tg_id}"
+
+
+def build_backend() -> CacheBackend | None:
+    if settings.PROFILE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.PROFILE_CACHE_REDIS_URL)
+    if settings.PROFILE_CACHE_BACKEND == "memory":
+        return InMemoryCacheBackend()
+    return None
+
+
+profile_cache = ProfileCache(settings.PROFILE_CACHE_SIZE, settings.PROFILE_CACHE_TTL, build_backend())
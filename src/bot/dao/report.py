@@ -1,8 +1,12 @@
-from sqlalchemy import delete, or_
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, or_, select, update
 
 from src.bot.dao.base import BaseDAO
+from src.bot.dao.event import SwipeEventsDAO, swipe_events_written
+from src.bot.enum.event import SwipeEventType
 from src.bot.models.report import Reports
-from src.core.database import async_session_maker
+from src.core.database import after_commit, session_scope
 
 
 class ReportsDAO(BaseDAO):
@@ -10,12 +14,66 @@ class ReportsDAO(BaseDAO):
 
     @classmethod
     async def add_report(cls, reporter_user_id: int, target_user_id: int, comment: str):
-        """Добавить жалобу"""
-        await cls.add(reporter_user_id=reporter_user_id, target_user_id=target_user_id, comment=comment)
+        """Добавить жалобу и событие о ней в swipe_events (одной транзакцией)"""
+        async with session_scope() as session:
+            await session.execute(
+                insert(cls.model).values(
+                    reporter_user_id=reporter_user_id, target_user_id=target_user_id, comment=comment
+                )
+            )
+            await session.execute(
+                SwipeEventsDAO.insert_event(
+                    SwipeEventType.REPORT, reporter_user_id, target_user_id, payload={"comment": comment}
+                )
+            )
+            after_commit(session, swipe_events_written)
+
+    @classmethod
+    async def claim_unreviewed(cls, limit: int, lease_seconds: float) -> list[Reports]:
+        """
+        Забрать самые старые свободные неразобранные жалобы на lease_seconds.
+        SKIP LOCKED не даёт двум процессам взять одну, а блокировка держится только на время короткой транзакции.
+        """
+        async with session_scope() as session:
+            now = datetime.utcnow()
+            due = (
+                select(cls.model.id)
+                .where(
+                    cls.model.reviewed_at.is_(None),
+                    or_(cls.model.claimed_until.is_(None), cls.model.claimed_until <= now),
+                )
+                .order_by(cls.model.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            query = (
+                update(cls.model)
+                .where(cls.model.id.in_(due.scalar_subquery()))
+                .values(claimed_until=now + timedelta(seconds=lease_seconds))
+                .returning(cls.model)
+            )
+            result = await session.execute(query)
+            return list(result.scalars().all())
+
+    @classmethod
+    async def mark_reviewed(cls, accepted_ids: list[int], dismissed_ids: list[int], reviewed_at: datetime) -> list[int]:
+        """
+        Закрыть жалобы; возвращает target_user_id учтённых. Жалобы, которые уже закрыл другой обработчик
+        (аренда истекла, пока шла проверка), пропускаются и не учитываются повторно.
+        """
+        async with session_scope() as session:
+            query = (
+                update(cls.model)
+                .where(cls.model.id.in_(accepted_ids + dismissed_ids), cls.model.reviewed_at.is_(None))
+                .values(reviewed_at=reviewed_at, accepted=cls.model.id.in_(accepted_ids))
+                .returning(cls.model.target_user_id, cls.model.accepted)
+            )
+            result = await session.execute(query)
+            return [target_user_id for target_user_id, accepted in result.all() if accepted]
 
     @classmethod
     async def delete_reports_by_user(cls, tg_id: int):
-        async with async_session_maker() as session:
+        async with session_scope() as session:
             query = delete(cls.model).where(
                 or_(
                     cls.model.reporter_user_id == tg_id,
@@ -23,4 +81,3 @@ class ReportsDAO(BaseDAO):
                 )
             )
             await session.execute(query)
-            await session.commit()
@@ -1,12 +1,17 @@
 import logging
 from typing import List, Optional
 
-from sqlalchemy import and_, delete, select
+from sqlalchemy import BigInteger, Integer, and_, column, delete, exists, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.dao.base import BaseDAO
+from src.bot.dao.profile_cache import profile_cache
 from src.bot.enum.gender import Gender
+from src.bot.enum.moderation import ModerationStatus
+from src.bot.models.like import Likes
 from src.bot.models.user import Users
-from src.core.database import async_session_maker
+from src.config import settings
+from src.core.database import after_commit, current_session, session_scope
 
 logger = logging.getLogger(__name__)
 
@@ -20,14 +25,14 @@ class UsersDAO(BaseDAO):
         Обновляет данные пользователя по tg_id
         """
         # TODO: можно в базовом класса сделать метод update_by_id и использовать его здесь или в других DAO
-        async with async_session_maker() as session:
+        async with session_scope() as session:
             # Находим пользователя в этой же сессии
 
             result = await session.execute(select(cls.model).where(cls.model.tg_id == tg_id))  # type: ignore
             user = result.scalar_one_or_none()
 
             if not user:
-                print(f"❌ Пользователь с tg_id {tg_id} не найден")
+                logger.warning("Пользователь с tg_id %s не найден", tg_id)
                 return None
 
             # Обновляем поля
@@ -35,28 +40,64 @@ class UsersDAO(BaseDAO):
                 if value is not None and hasattr(user, key):
                     setattr(user, key, value)
 
-            # Коммитим изменения
-            await session.commit()
+            # Записываем изменения в транзакцию (коммит — на выходе из сессии или в конце апдейта)
+            await session.flush()
+            cls._invalidate_profile(session, tg_id)
 
             # Обновляем объект из БД
             await session.refresh(user)
 
-            print(f"✅ Данные пользователя {tg_id} обновлены")
+            logger.debug("Данные пользователя %s обновлены", tg_id)
             return user
 
     @classmethod
     # TODO: можно в базовом класса сделать метод find_one_or_none и использовать его здесь или в других DAO
     async def get_by_tg_id(cls, tg_id: int) -> Users:
-        async with async_session_maker() as session:
+        if tg_id not in cls._written_profiles():
+            cached = await profile_cache.get(tg_id)
+            if cached is not None:
+                return cached
+
+        async with session_scope(read_only=True) as session:
             query = select(cls.model).where(cls.model.tg_id == tg_id)
             result = await session.execute(query)
-            return result.scalar_one_or_none()
+            user = result.scalar_one_or_none()
+            # Незакоммиченные изменения этого апдейта в кэш не кладём — транзакция ещё может откатиться
+            cacheable = user is not None and not session.info.get("has_writes")
+
+        if cacheable:
+            await profile_cache.set(user)
+        return user
+
+    @classmethod
+    async def get_by_tg_ids(cls, tg_ids: set[int]) -> dict[int, Users]:
+        """Анкеты по tg_id: что есть в кэше — из кэша, остальные одним запросом"""
+        users = {}
+        for tg_id in tg_ids - cls._written_profiles():
+            cached = await profile_cache.get(tg_id)
+            if cached is not None:
+                users[tg_id] = cached
+        missing = tg_ids - users.keys()
+        if not missing:
+            return users
+
+        async with session_scope(read_only=True) as session:
+            query = select(cls.model).where(cls.model.tg_id.in_(missing))
+            result = await session.execute(query)
+            loaded = result.scalars().all()
+            cacheable = not session.info.get("has_writes")
+
+        for user in loaded:
+            users[user.tg_id] = user
+            if cacheable:
+                await profile_cache.set(user)
+        return users
 
     @classmethod
     # TODO: Повторение логики, можно один универсальный метод find_one_or_none использовать для всех DAO, просто передавать разные ключи в параметрах
     # У тебя глобально будет менять просто по id, по tg_id, по username, по name, по age, по city, по interests, по photo_id и так далее...
     async def get_by_id(cls, user_id: int) -> Users:
-        async with async_session_maker() as session:
+        async with session_scope(read_only=True) as session:
             query = select(cls.model).where(cls.model.id == user_id)
             result = await session.execute(query)
             return result.scalar_one_or_none()
@@ -65,7 +106,15 @@ class UsersDAO(BaseDAO):
     async def get_next_profile(
         cls, user_id: int, rated_user_ids: List[int], gender_interest: Gender
     ) -> Optional[Users]:
-        async with async_session_maker() as session:
+        profiles = await cls.get_next_profiles(user_id, rated_user_ids, gender_interest, limit=1)
+        return profiles[0] if profiles else None
+
+    @classmethod
+    async def get_next_profiles(
+        cls, user_id: int, rated_user_ids: List[int], gender_interest: Gender, limit: int
+    ) -> List[Users]:
+        """Пачка следующих подходящих анкет одним запросом (для буфера ленты)"""
+        async with session_scope(read_only=True) as session:
             query = select(cls.model).where(
                 and_(
                     cls.model.tg_id != user_id,
@@ -73,6 +122,8 @@ class UsersDAO(BaseDAO):
                     cls.model.age.isnot(None),
                     cls.model.city.isnot(None),
                     cls.model.status_of_the_questionnaire,
+                    cls.model.moderation_status == ModerationStatus.APPROVED.value,
+                    cls.model.report_count < settings.REPORT_HIDE_THRESHOLD,
                 )
             )
             # TODO: Тут идет бизнес логика, она должна быть в сервисе, а не в DAO, тут только запросы к БД
@@ -85,13 +136,45 @@ class UsersDAO(BaseDAO):
                 query = query.where(cls.model.user_gender == Gender.FEMALE)
             # SKIP_GENDER → без фильтра
 
-            query = query.order_by(cls.model.id)
+            query = query.order_by(cls.model.id).limit(limit)
             result = await session.execute(query)
-            return result.scalars().first()
+            return list(result.scalars().all())
+
+    @classmethod
+    async def get_candidates(cls, user_id: int, gender_interest: Gender, after_id: int, limit: int) -> List[Users]:
+        """
+        Следующие анкеты ленты после users.id = after_id (keyset-пагинация).
+        Уже оценённые анкеты отсекаются коррелированным NOT EXISTS по likes прямо в БД,
+        поэтому стоимость запроса не зависит от длины истории свайпов.
+        """
+        async with session_scope(read_only=True) as session:
+            already_rated = exists().where(
+                Likes.from_user_id == user_id,
+                Likes.to_user_id == cls.model.tg_id,
+            )
+            query = select(cls.model).where(
+                and_(
+                    cls.model.id > after_id,
+                    cls.model.tg_id != user_id,
+                    cls.model.name.isnot(None),
+                    cls.model.age.isnot(None),
+                    cls.model.city.isnot(None),
+                    cls.model.status_of_the_questionnaire,
+                    cls.model.moderation_status == ModerationStatus.APPROVED.value,
+                    cls.model.report_count < settings.REPORT_HIDE_THRESHOLD,
+                    ~already_rated,
+                )
+            )
+            if gender_interest in (Gender.MALE, Gender.FEMALE):
+                query = query.where(cls.model.user_gender == gender_interest)
+
+            query = query.order_by(cls.model.id).limit(limit)
+            result = await session.execute(query)
+            return list(result.scalars().all())
 
     @classmethod
     async def get_profiles_by_ids(cls, not_rated_yet):
-        async with async_session_maker() as session:
+        async with session_scope(read_only=True) as session:
             users_query = select(Users).where(Users.tg_id.in_(not_rated_yet))
             users_result = await session.execute(users_query)
             return users_result.scalars().all()
@@ -104,9 +187,31 @@ class UsersDAO(BaseDAO):
     async def set_status_questionnaire_false(cls, tg_id: int):
         return await cls.update_user_data(tg_id, status_of_the_questionnaire=False)
 
+    @classmethod
+    async def set_moderation_status(cls, tg_id: int, status: ModerationStatus):
+        return await cls.update_user_data(tg_id, moderation_status=status.value)
+
+    @classmethod
+    async def increment_report_counts(cls, counts: dict[int, int]):
+        """Прибавить учтённые жалобы к users.report_count одним UPDATE ... FROM (VALUES ...)"""
+        deltas = values(
+            column("tg_id", BigInteger),
+            column("delta", Integer),
+            name="deltas",
+        ).data(list(counts.items()))
+        async with session_scope() as session:
+            query = (
+                update(cls.model)
+                .where(cls.model.tg_id == deltas.c.tg_id)
+                .values(report_count=cls.model.report_count + deltas.c.delta)
+            )
+            await session.execute(query)
+            for tg_id in counts:
+                cls._invalidate_profile(session, tg_id)
+
     @classmethod
     async def get_status_of_questionnaire(cls, tg_id: int) -> bool:
-        async with async_session_maker() as session:
+        async with session_scope(read_only=True) as session:
             query = select(cls.model.status_of_the_questionnaire).where(cls.model.tg_id == tg_id)
             result = await session.execute(query)
             status = result.scalar_one_or_none()
@@ -117,7 +222,24 @@ class UsersDAO(BaseDAO):
         # TODO: Если пишешь документацию в функциях, пиши везде (если функция сложная) - это важно для других разработчиков и для себя в будущем
         # Если функция простая - не пиши, подумай только о названии функции и параметрах
         """Удаляет пользователя по tg_id (сработает только при удалении like and maches юзера)"""
-        async with async_session_maker() as session:
+        async with session_scope() as session:
             query = delete(cls.model).where(cls.model.tg_id == tg_id)
             await session.execute(query)
-            await session.commit()
+            cls._invalidate_profile(session, tg_id)
+
+    @staticmethod
+    def _invalidate_profile(session: AsyncSession, tg_id: int) -> None:
+        """
+        Сбросить анкету в кэше: сразу в этом процессе и ещё раз после коммита — везде, иначе конкурентное чтение
+        успеет закэшировать незакоммиченное прошлое. До конца unit of work эту анкету читаем мимо кэша:
+        в общем кэше до коммита лежит старая копия, и чтение вернуло бы её в локальный
+        """
+        session.info.setdefault("written_profiles", set()).add(tg_id)
+        profile_cache.invalidate_local(tg_id)
+        after_commit(session, lambda: profile_cache.invalidate(tg_id))
+
+    @staticmethod
+    def _written_profiles() -> set[int]:
+        """tg_id анкет, записанных в текущем unit of work"""
+        session = current_session.get()
+        return session.info.get("written_profiles", set()) if session is not None else set()
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class SwipeEventType(str, Enum):
+    LIKE = "like"
+    DISLIKE = "dislike"
+    MATCH = "match"
+    REPORT = "report"
@@ -26,3 +26,11 @@ class ApplicationStatus(Enum):
             return "✅ Да, показать!"
         else:
             return "❌ Нет, спасибо"
+
+
+class MatchesAction(Enum):
+    MORE = "more"
+
+    @classmethod
+    def get_button_text(cls, action: "MatchesAction") -> str:
+        return "➡️ Ещё мэтчи"
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class ModerationStatus(str, Enum):
+    PENDING = "pending"
+    APPROVED = "approved"
+    REJECTED = "rejected"
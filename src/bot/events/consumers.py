@@ -0,0 +1,149 @@
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from aiogram import Bot
+
+from src.bot.dao.event import SwipeCountersDAO, SwipeDailyStatsDAO
+from src.bot.dao.like import LikesInboxDAO
+from src.bot.dao.user import UsersDAO
+from src.bot.enum.event import SwipeEventType
+from src.bot.models.event import SwipeEvent
+from src.bot.notifications.likes import LikeNotificationAggregator
+from src.bot.notifications.worker import NotificationWorker
+from src.bot.presenters.swipe import SwipePresenter
+from src.core.database import after_commit, current_session
+
+
+class NotificationConsumer:
+    """
+    Уведомления второму участнику: о лайке — через агрегатор, о мэтче — сразу.
+    События старше max_age пропускаются, чтобы переигрывание истории не разослало старые уведомления.
+
+    При нескольких процессах (shards > 1) у каждого свой потребитель notifications.<shard>, который берёт только
+    события получателей своего шарда — тех же, чьи апдейты супервизор отдаёт этому процессу. Так агрегатор
+    видит состояние FSM получателя и копит его лайки в одном процессе, а не по окну в каждом.
+    """
+
+    starts_from = None
+
+    def __init__(
+        self,
+        users_dao: type[UsersDAO],
+        presenter: SwipePresenter,
+        notifications: NotificationWorker,
+        like_notifier: LikeNotificationAggregator,
+        max_age: float,
+        shard: int = 0,
+        shards: int = 1,
+    ):
+        self.users_dao = users_dao
+        self.presenter = presenter
+        self.notifications = notifications
+        self.like_notifier = like_notifier
+        self.max_age = max_age
+        self.shard = shard
+        self.shards = shards
+        self.name = "notifications"
+        if shards > 1:
+            self.name = f"notifications.{shard}"
+            self.starts_from = "notifications"
+
+    async def handle(self, bot: Bot, events: list[SwipeEvent]) -> None:
+        oldest = datetime.utcnow() - timedelta(seconds=self.max_age)
+        events = [
+            event for event in events if event.created_at >= oldest and event.target_id % self.shards == self.shard
+        ]
+        likes = [
+            event
+            for event in events
+            if event.event_type == SwipeEventType.LIKE and not (event.payload or {}).get("match")
+        ]
+        matches = [event for event in events if event.event_type == SwipeEventType.MATCH]
+        if not likes and not matches:
+            return
+
+        users = await self.users_dao.get_by_tg_ids(
+            {event.target_id for event in likes} | {event.actor_id for event in matches}
+        )
+        # Уведомления о мэтчах уходят в очередь после коммита (это делает enqueue)
+        for event in matches:
+            actor = users.get(event.actor_id)
+            if actor:
+                await self.notifications.enqueue(event.target_id, self.presenter.format_match_message(actor))
+
+        recipients = []
+        for event in likes:
+            target = users.get(event.target_id)
+            if target and target.status_of_the_questionnaire:
+                recipients.append(event.target_id)
+        if not recipients:
+            return
+
+        # Окна агрегатора живут в памяти: открываем их только после коммита пачки,
+        # иначе откатившаяся и повторённая пачка уведомит о тех же лайках второй раз
+        async def notify():
+            for recipient_id in recipients:
+                await self.like_notifier.add(bot, recipient_id)
+
+        session = current_session.get()
+        if session is None:
+            await notify()
+        else:
+            after_commit(session, notify)
+
+
+class InboxConsumer:
+    """Ведёт likes_inbox: лайк попадает во входящие получателя, ответ или отзыв лайка убирает запись"""
+
+    name = "likes_inbox"
+    starts_from = None
+
+    def __init__(self, inbox_dao: type[LikesInboxDAO]):
+        self.inbox_dao = inbox_dao
+
+    async def handle(self, bot: Bot, events: list[SwipeEvent]) -> None:
+        for event in events:
+            if event.event_type in (SwipeEventType.LIKE, SwipeEventType.DISLIKE):
+                await self.inbox_dao.apply_rating(
+                    event.actor_id, event.target_id, event.event_type == SwipeEventType.LIKE, event.created_at
+                )
+
+
+class CountersConsumer:
+    """Счётчики пользователя (user_swipe_counters), одним upsert на пачку"""
+
+    name = "counters"
+    starts_from = None
+
+    def __init__(self, counters_dao: type[SwipeCountersDAO]):
+        self.counters_dao = counters_dao
+
+    async def handle(self, bot: Bot, events: list[SwipeEvent]) -> None:
+        deltas: dict[int, Counter] = defaultdict(Counter)
+        for event in events:
+            match event.event_type:
+                case SwipeEventType.LIKE:
+                    deltas[event.actor_id]["likes_given"] += 1
+                    deltas[event.target_id]["likes_received"] += 1
+                case SwipeEventType.DISLIKE:
+                    deltas[event.actor_id]["dislikes_given"] += 1
+                case SwipeEventType.MATCH:
+                    deltas[event.actor_id]["matches"] += 1
+                    deltas[event.target_id]["matches"] += 1
+                case SwipeEventType.REPORT:
+                    deltas[event.target_id]["reports_received"] += 1
+        await self.counters_dao.increment(deltas)
+
+
+class AnalyticsConsumer:
+    """Число событий каждого типа по дням (swipe_daily_stats)"""
+
+    name = "analytics"
+    starts_from = None
+
+    def __init__(self, stats_dao: type[SwipeDailyStatsDAO]):
+        self.stats_dao = stats_dao
+
+    async def handle(self, bot: Bot, events: list[SwipeEvent]) -> None:
+        counts = Counter((event.created_at.date(), event.event_type) for event in events)
+        await self.stats_dao.increment(counts)
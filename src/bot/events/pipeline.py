@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Protocol
+
+from aiogram import Bot
+
+from src.bot.dao.event import SwipeEventsDAO, on_swipe_events
+from src.bot.models.event import SwipeEvent
+from src.core.database import unit_of_work
+
+logger = logging.getLogger(__name__)
+
+
+class EventConsumer(Protocol):
+    name: str
+    starts_from: str | None  # новый потребитель начинает с позиции этого, а не с начала
+
+    async def handle(self, bot: Bot, events: list[SwipeEvent]) -> None: ...
+
+
+@dataclass
+class ConsumerStats:
+    events: int = 0
+    batches: int = 0
+    errors: int = 0
+
+
+class EventPipeline:
+    """
+    Доставка swipe_events потребителям.
+
+    У каждого потребителя своя позиция в event_consumer_offsets и своя задача: пачка событий обрабатывается
+    в одной транзакции с блокировкой позиции (SKIP LOCKED) и её сдвигом, так что результат обработки
+    и позиция коммитятся вместе, а при нескольких процессах пачку берёт кто-то один.
+    Упавшая пачка откатывается целиком и повторяется после паузы. Новые события будят потребителей
+    своего процесса сразу после коммита, чужого — не позже poll_interval.
+    """
+
+    def __init__(
+        self, events_dao: type[SwipeEventsDAO], consumers: list[EventConsumer], batch_size: int, poll_interval: float
+    ):
+        self.events_dao = events_dao
+        self.consumers = consumers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.stats = {consumer.name: ConsumerStats() for consumer in consumers}
+        self._wakeups = {consumer.name: asyncio.Event() for consumer in consumers}
+        self._tasks: list[asyncio.Task] = []
+        on_swipe_events(self.wake_up)
+
+    def wake_up(self) -> None:
+        for wakeup in self._wakeups.values():
+            wakeup.set()
+
+    async def start(self, bot: Bot) -> None:
+        await self.events_dao.ensure_offsets(
+            [consumer.name for consumer in self.consumers],
+            start_from={consumer.name: consumer.starts_from for consumer in self.consumers if consumer.starts_from},
+        )
+        self._tasks = [asyncio.create_task(self._run(bot, consumer)) for consumer in self.consumers]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for name, stats in self.stats.items():
+            logger.info(f"События [{name}]: обработано {stats.events} в {stats.batches} пачках, ошибок {stats.errors}")
+
+    async def _run(self, bot: Bot, consumer: EventConsumer) -> None:
+        wakeup = self._wakeups[consumer.name]
+        while True:
+            wakeup.clear()
+            try:
+                processed = await self._process_batch(bot, consumer)
+            except Exception:
+                self.stats[consumer.name].errors += 1
+                logger.exception(f"Потребитель событий {consumer.name} не обработал пачку")
+                processed = 0
+
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=self.poll_interval)
+                except TimeoutError:
+                    pass
+
+    async def _process_batch(self, bot: Bot, consumer: EventConsumer) -> int:
+        async with unit_of_work():
+            offset = await self.events_dao.claim_offset(consumer.name)
+            if offset is None:
+                # Пачку этого потребителя сейчас обрабатывает другой процесс
+                return 0
+
+            events = await self.events_dao.read_after(*offset, limit=self.batch_size)
+            if not events:
+                return 0
+
+            await consumer.handle(bot, events)
+            await self.events_dao.save_offset(consumer.name, events[-1].xid, events[-1].id)
+
+        stats = self.stats[consumer.name]
+        stats.events += len(events)
+        stats.batches += 1
+        return len(events)
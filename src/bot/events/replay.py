@@ -0,0 +1,25 @@
+"""
+Переиграть swipe_events для потребителя: python -m src.bot.events.replay <consumer> [from_event_id]
+
+Позиция потребителя переносится перед from_event_id (без него — в начало), дальше события
+заново обработает работающий бот. Счётчики и аналитика при этом прибавятся повторно — перед
+переигрыванием с начала их таблицы нужно очистить; уведомления старше EVENTS_NOTIFY_MAX_AGE не отправляются.
+"""
+
+import asyncio
+import sys
+
+from src.bot.dao.event import SwipeEventsDAO
+from src.logger import logger, setup_logging
+
+
+async def replay(consumer: str, from_event_id: int) -> None:
+    await SwipeEventsDAO.reset_offset(consumer, from_event_id)
+    logger.info(f"Потребитель {consumer} переигрывает события с {from_event_id or 'начала'}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.exit(__doc__)
+    setup_logging()
+    asyncio.run(replay(sys.argv[1], int(sys.argv[2]) if len(sys.argv) == 3 else 0))
@@ -118,7 +118,10 @@ async def process_photo(message: Message, state: FSMContext, questionnaire_servi
     if photo:
         await message.answer("Так выглядит твоя анкета:")
         await message.answer_photo(photo, caption=caption)
-        await message.answer("Команды:\n/search - начать просмотр анкет\n/my_profile(изменить или выключить анкету)")
+        await message.answer("🕓 Анкета на модерации — в поиске она появится сразу после проверки, мы напишем.")
+        await message.answer(
+            "Команды:\n/search - начать просмотр анкет\n/matches - твои мэтчи\n/my_profile(изменить или выключить анкету)"
+        )
 
 
 # Если пользователь отправил не фото
@@ -5,6 +5,7 @@ from aiogram.types import Message
 
 from src.bot.dao.user import UsersDAO
 from src.bot.states.form_states import FormStates
+from src.core.database import commit_unit_of_work
 
 start_router = Router()
 
@@ -19,9 +20,10 @@ async def cmd_start(message: Message, state: FSMContext):
     user = await UsersDAO.get_by_tg_id(message.from_user.id)
     if user is None:
         await UsersDAO.add(tg_id=message.from_user.id, username=message.from_user.username)
+        await commit_unit_of_work()
         await state.set_state(FormStates.waiting_for_name)
         await message.answer("Давай заполним твою анкету. Как тебя зовут?")
     else:
         await message.answer(
-            "Ты уже зарегистрирован!\n\nКоманды:\n/search - начать просмотр анкет\n/my_profile(изменить или выключить анкету)"
+            "Ты уже зарегистрирован!\n\nКоманды:\n/search - начать просмотр анкет\n/matches - твои мэтчи\n/my_profile(изменить или выключить анкету)"
         )
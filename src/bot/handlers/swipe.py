@@ -1,11 +1,13 @@
-from aiogram import Bot, F, Router
+from datetime import datetime
+
+from aiogram import F, Router
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message  # Добавлен импорт
 
-from src.bot.enum.like import ApplicationStatus, LikeStatus
+from src.bot.enum.like import ApplicationStatus, LikeStatus, MatchesAction
 from src.bot.enum.user_profile import UserProfile
-from src.bot.keyboards.swipe import get_search_only_keyboard, get_show_likes_keyboard
+from src.bot.keyboards.swipe import get_search_only_keyboard
 from src.bot.presenters.swipe import SwipePresenter
 from src.bot.services.swipe import SwipeService
 from src.bot.states.swipe_states import SwipeStates
@@ -20,8 +22,8 @@ async def start_search(
     """Команда для начала просмотра анкет"""
     user_id = message.from_user.id
 
-    # Получаем первую анкету
-    next_profile = await swipe_service.get_next_profile(user_id)
+    # Получаем первую анкету (лента начинается заново)
+    next_profile = await swipe_service.get_next_profile(user_id, refresh=True)
 
     if not next_profile:
         await swipe_presenter.send_no_profiles_message(message)
@@ -47,6 +49,47 @@ async def continue_search_after_likes(
     await start_search(message, swipe_service, swipe_presenter, state)
 
 
+@swipe_router.message(Command("matches"))
+async def show_matches(
+    message: Message, swipe_service: SwipeService, swipe_presenter: SwipePresenter, state: FSMContext
+):
+    """Первая страница мэтчей"""
+    page = await swipe_service.get_matches_page(message.from_user.id)
+    await swipe_presenter.send_matches_page(message, page, first_page=True)
+    await _remember_matches_cursor(page.next_cursor, state)
+
+
+@swipe_router.message(F.text == MatchesAction.get_button_text(MatchesAction.MORE), SwipeStates.viewing_matches)
+async def show_more_matches(
+    message: Message, swipe_service: SwipeService, swipe_presenter: SwipePresenter, state: FSMContext
+):
+    """Следующая страница мэтчей по курсору из состояния"""
+    data = await state.get_data()
+    created_at, match_id = data["matches_cursor"]
+    page = await swipe_service.get_matches_page(message.from_user.id, (datetime.fromisoformat(created_at), match_id))
+    await swipe_presenter.send_matches_page(message, page, first_page=False)
+    await _remember_matches_cursor(page.next_cursor, state)
+
+
+async def _remember_matches_cursor(cursor: tuple[datetime, int] | None, state: FSMContext):
+    """
+    Пока есть следующая страница, состояние — viewing_matches, а прежнее (просмотр анкет или лайкнувших)
+    запоминается и возвращается, когда страницы кончились. Остальные данные, в том числе current_profile_id, не трогаем
+    """
+    current = await state.get_state()
+    if cursor is None:
+        if current == SwipeStates.viewing_matches:
+            data = await state.get_data()
+            await state.set_state(data.get("state_before_matches"))
+        await state.update_data(matches_cursor=None, state_before_matches=None)
+        return
+    if current != SwipeStates.viewing_matches:
+        await state.update_data(state_before_matches=current)
+    await state.set_state(SwipeStates.viewing_matches)
+    # Курсор храним в сериализуемом виде
+    await state.update_data(matches_cursor=[cursor[0].isoformat(), cursor[1]])
+
+
 @swipe_router.message(F.text == LikeStatus.get_display_name(LikeStatus.REPORT))
 async def initiate_report_profile(
     message: Message,
@@ -85,10 +128,10 @@ async def show_who_liked_me(
     """Показать анкеты тех, кто лайкнул"""
     user_id = message.from_user.id
 
-    # Получаем анкеты тех, кто лайкнул
-    profiles = await swipe_service.get_profiles_who_liked_me(user_id)
+    # Самая старая анкета из тех, кто лайкнул
+    first_profile = await swipe_service.get_next_profile_who_liked_me(user_id)
 
-    if not profiles:
+    if not first_profile:
         await message.answer("Никто пока не лайкнул твою анкету 😔")
         return
 
@@ -96,7 +139,6 @@ async def show_who_liked_me(
     await state.set_state(SwipeStates.viewing_likes)
 
     # Сохраняем ID первого профиля
-    first_profile = profiles[0]
     await state.update_data(current_profile_id=first_profile.tg_id)
 
     # Показываем первую анкету
@@ -115,7 +157,10 @@ async def decline_show_likes(message: Message):
 @swipe_router.message(F.text == LikeStatus.get_display_name(LikeStatus.LIKE), SwipeStates.normal_browsing)
 @swipe_router.message(F.text == LikeStatus.get_display_name(LikeStatus.LIKE), SwipeStates.viewing_likes)
 async def process_like(
-    message: Message, swipe_service: SwipeService, state: FSMContext, swipe_presenter: SwipePresenter, bot: Bot
+    message: Message,
+    swipe_service: SwipeService,
+    state: FSMContext,
+    swipe_presenter: SwipePresenter,
 ):
     """Обработка нажатия на кнопку лайк"""
     from_user_id = message.from_user.id
@@ -129,41 +174,28 @@ async def process_like(
         return
 
     # Получаем текущее состояние
-    current_state = await state.get_state()
+    viewing_likes = await state.get_state() == SwipeStates.viewing_likes
 
     # Обрабатываем лайк
-    result = await swipe_service.process_like(from_user_id, to_user_id)
+    result = await swipe_service.process_like(from_user_id, to_user_id, viewing_likes=viewing_likes)
 
     if result.is_match:
         # Отправляем сообщение о мэтче
         match_text = swipe_presenter.format_match_message(result.matched_user)
         await message.answer(match_text)
+        # Второго пользователя уведомит потребитель swipe_events (NotificationConsumer)
 
-        # Уведомляем второго пользователя
-        await bot.send_message(to_user_id, swipe_presenter.format_match_message(result.current_user))
-    else:
-        if result.can_notify_target:
-            # Уведомление о лайке
-            await bot.send_message(
-                to_user_id, swipe_presenter.format_like_notification(), reply_markup=get_show_likes_keyboard()
-            )
-
-    # Определяем следующую анкету
-    if current_state == SwipeStates.viewing_likes:
-        profiles = await swipe_service.get_profiles_who_liked_me(from_user_id)
-
-        if not profiles:
-            # Лайкнувшие закончились
-            await message.answer(
-                "Анкеты тех, кто тебя лайкнул, закончились.\nХочешь продолжить просмотр новых анкет?",
-                reply_markup=get_search_only_keyboard(),
-            )
-            await state.clear()
-            return
-
-        next_profile = profiles[0]
-    else:
-        next_profile = result.next_profile
+    # Следующая анкета уже выбрана сервисом в зависимости от состояния
+    next_profile = result.next_profile
+
+    if viewing_likes and not next_profile:
+        # Лайкнувшие закончились
+        await message.answer(
+            "Анкеты тех, кто тебя лайкнул, закончились.\nХочешь продолжить просмотр новых анкет?",
+            reply_markup=get_search_only_keyboard(),
+        )
+        await state.clear()
+        return
 
     if not next_profile:
         await swipe_presenter.send_no_profiles_message(message)
@@ -192,26 +224,21 @@ async def process_dislike(
         return
 
     # Получаем текущее состояние
-    current_state = await state.get_state()
+    viewing_likes = await state.get_state() == SwipeStates.viewing_likes
 
     # Обрабатываем дизлайк
-    result = await swipe_service.process_dislike(from_user_id, to_user_id)
-
-    # Определяем следующую анкету в зависимости от состояния
-    if current_state == SwipeStates.viewing_likes:
-        profiles = await swipe_service.get_profiles_who_liked_me(from_user_id)
-
-        if not profiles:
-            await message.answer(
-                "Анкеты тех, кто тебя лайкнул, закончились.\nХочешь продолжить просмотр новых анкет?",
-                reply_markup=get_search_only_keyboard(),
-            )
-            await state.clear()
-            return
-
-        next_profile = profiles[0]
-    else:
-        next_profile = result.next_profile
+    result = await swipe_service.process_dislike(from_user_id, to_user_id, viewing_likes=viewing_likes)
+
+    # Следующая анкета уже выбрана сервисом в зависимости от состояния
+    next_profile = result.next_profile
+
+    if viewing_likes and not next_profile:
+        await message.answer(
+            "Анкеты тех, кто тебя лайкнул, закончились.\nХочешь продолжить просмотр новых анкет?",
+            reply_markup=get_search_only_keyboard(),
+        )
+        await state.clear()
+        return
 
     if not next_profile:
         await swipe_presenter.send_no_profiles_message(message)
@@ -1,7 +1,7 @@
 # src/bot/keyboards/swipe.py
 from aiogram.types import KeyboardButton, ReplyKeyboardMarkup
 
-from src.bot.enum.like import ApplicationStatus, LikeStatus
+from src.bot.enum.like import ApplicationStatus, LikeStatus, MatchesAction
 from src.bot.enum.user_profile import UserProfile
 
 
@@ -38,3 +38,16 @@ def get_search_only_keyboard() -> ReplyKeyboardMarkup:
         keyboard=[[KeyboardButton(text=UserProfile.get_button_text(UserProfile.SEARCH))]],
         resize_keyboard=True,
     )
+
+
+def get_more_matches_keyboard() -> ReplyKeyboardMarkup:
+    """Клавиатура для следующей страницы мэтчей"""
+    return ReplyKeyboardMarkup(
+        keyboard=[
+            [
+                KeyboardButton(text=MatchesAction.get_button_text(MatchesAction.MORE)),
+                KeyboardButton(text=UserProfile.get_button_text(UserProfile.SEARCH)),
+            ]
+        ],
+        resize_keyboard=True,
+    )
@@ -1,9 +1,96 @@
-from src.bot.llm_service.client import llm, prompt
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+
+from src.bot.dao.moderation import ModerationResultsDAO
+from src.bot.llm_service.batcher import ModerationBatcher
+from src.bot.llm_service.cache import ModerationCache
+from src.bot.llm_service.classifier import WEIGHTS_PATH, LinearClassifier
+from src.bot.llm_service.client import PROMPT_VERSION, fallback_llm, llm, prompt, report_prompt
 from src.bot.llm_service.moderation import ModerationService
-from src.bot.llm_service.prompt_templates.schemas import ProfileCheck
+from src.bot.llm_service.prompt_templates.schemas import FallbackProfileCheck, ProfileCheck, ReportCheck
+from src.bot.llm_service.report_check import ReportCommentChecker
+from src.bot.llm_service.resilience import CircuitBreaker, Endpoint, ResilientModerationChain
+from src.bot.llm_service.rules import RuleTier
+from src.bot.llm_service.tiered import TieredModerator
+from src.config import settings
+
+
+def _endpoint(
+    name: str,
+    chat_model,
+    template: ChatPromptTemplate,
+    schema: type[BaseModel],
+    result_type: type[BaseModel] | None = None,
+) -> Endpoint:
+    breaker = CircuitBreaker(
+        name=name,
+        window=settings.MODERATION_BREAKER_WINDOW,
+        min_calls=settings.MODERATION_BREAKER_MIN_CALLS,
+        failure_rate=settings.MODERATION_BREAKER_FAILURE_RATE,
+        slow_call_seconds=settings.MODERATION_SLOW_CALL_SECONDS,
+        open_seconds=settings.MODERATION_BREAKER_OPEN_SECONDS,
+    )
+    chain = template | chat_model.with_structured_output(schema)
+    if result_type:
+        # Ответ получает свой тип, чтобы по нему было видно, какая модель ответила
+        chain = chain | RunnableLambda(lambda result: result_type.model_validate(result.model_dump()))
+    return Endpoint(
+        name=name,
+        chain=chain,
+        breaker=breaker,
+        max_concurrency=settings.MODERATION_CONCURRENCY,
+    )
+
+
+def _resilient_chain(
+    template: ChatPromptTemplate,
+    schema: type[BaseModel],
+    prefix: str = "",
+    fallback_type: type[BaseModel] | None = None,
+) -> ResilientModerationChain:
+    secondary = None
+    if fallback_llm:
+        secondary = _endpoint(f"{prefix}fallback", fallback_llm, template, schema, result_type=fallback_type)
+    return ResilientModerationChain(
+        primary=_endpoint(f"{prefix}primary", llm, template, schema),
+        secondary=secondary,
+        timeout=settings.MODERATION_TIMEOUT,
+        hedge_delay=settings.MODERATION_HEDGE_DELAY,
+    )
 
 
 def get_moderation_service() -> ModerationService:
     """Фабрика для создания сервиса модерации"""
-    chain = prompt | llm.with_structured_output(ProfileCheck)
-    return ModerationService(chain=chain)
+    resilient = _resilient_chain(prompt, ProfileCheck, fallback_type=FallbackProfileCheck)
+    chain = RunnableLambda(resilient.ainvoke)
+    cache = ModerationCache(
+        results_dao=ModerationResultsDAO,
+        model_name=settings.MODEL_NAME,
+        prompt_version=PROMPT_VERSION,
+        maxsize=settings.MODERATION_CACHE_SIZE,
+        ttl=settings.MODERATION_CACHE_TTL,
+    )
+    batcher = None
+    if settings.MODERATION_BATCH_SIZE > 1:
+        batcher = ModerationBatcher(
+            chain=chain,
+            max_batch=settings.MODERATION_BATCH_SIZE,
+            max_wait=settings.MODERATION_BATCH_WAIT,
+            max_concurrency=settings.MODERATION_CONCURRENCY,
+        )
+    fast_path = None
+    if settings.MODERATION_FAST_PATH:
+        fast_path = TieredModerator(
+            rules=RuleTier(),
+            classifier=LinearClassifier.load(WEIGHTS_PATH) if settings.MODERATION_CLASSIFIER else None,
+            accept_below=settings.MODERATION_ACCEPT_BELOW,
+            reject_above=settings.MODERATION_REJECT_ABOVE,
+        )
+    return ModerationService(chain=chain, cache=cache, batcher=batcher, fast_path=fast_path)
+
+
+def get_report_checker() -> ReportCommentChecker:
+    """Фабрика проверки комментариев к жалобам: свой промпт и свои предохранители, без кэша и быстрых уровней"""
+    resilient = _resilient_chain(report_prompt, ReportCheck, prefix="report-")
+    return ReportCommentChecker(chain=RunnableLambda(resilient.ainvoke))
@@ -0,0 +1,117 @@
+import asyncio
+from dataclasses import dataclass
+
+from langchain_core.runnables import Runnable, RunnableLambda
+
+from src.bot.llm_service.prompt_templates.schemas import ProfileCheck
+from src.logger import logger
+
+
+@dataclass
+class BatcherStats:
+    submitted: int = 0
+    deduplicated: int = 0  # одинаковый текст уже ждал в пачке — отдельного запроса не будет
+    batches: int = 0
+    max_batch: int = 0
+    failed: int = 0
+
+
+class ModerationBatcher:
+    """
+    Микро-пачки запросов к LLM-модерации.
+
+    Тексты копятся до max_batch штук или max_wait секунд с первого, затем пачка уходит в chain.abatch.
+    Одновременно в LLM не больше max_concurrency запросов на все пачки вместе — при всплеске регистраций
+    очередь растёт у нас, а не превращается в 429 от провайдера. Одинаковые тексты в пачке проверяются один раз.
+    Результат (или исключение) возвращается каждому ожидающему вызову submit.
+    """
+
+    def __init__(self, chain: Runnable, max_batch: int, max_wait: float, max_concurrency: int):
+        self.chain = chain
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.stats = BatcherStats()
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._limited_chain = RunnableLambda(self._invoke_limited)
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._arrived = asyncio.Event()
+        self._collector: asyncio.Task | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    async def submit(self, profile_text: str) -> ProfileCheck:
+        if self._collector is None or self._collector.done():
+            self._collector = asyncio.create_task(self._collect())
+
+        self.stats.submitted += 1
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._pending.setdefault(profile_text, [])
+        if waiters:
+            self.stats.deduplicated += 1
+        waiters.append(future)
+        self._arrived.set()
+        return await future
+
+    async def stop(self) -> None:
+        """Отправить накопленное и дождаться всех пачек"""
+        if self._collector:
+            self._collector.cancel()
+            await asyncio.gather(self._collector, return_exceptions=True)
+        while self._pending:
+            self._dispatch()
+        await asyncio.gather(*self._batches, return_exceptions=True)
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._arrived.wait()
+            self._arrived.clear()
+            deadline = loop.time() + self.max_wait
+            while len(self._pending) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._arrived.wait(), timeout=remaining)
+                except TimeoutError:
+                    break
+                self._arrived.clear()
+
+            if self._pending:
+                self._dispatch()
+            if self._pending:
+                # Набралось больше пачки — остаток сразу становится следующей
+                self._arrived.set()
+
+    def _dispatch(self) -> None:
+        texts = list(self._pending)[: self.max_batch]
+        batch = {text: self._pending.pop(text) for text in texts}
+        self.stats.batches += 1
+        self.stats.max_batch = max(self.stats.max_batch, len(batch))
+        task = asyncio.create_task(self._run_batch(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: dict[str, list[asyncio.Future]]) -> None:
+        texts = list(batch)
+        try:
+            results = await self._limited_chain.abatch(
+                [{"profile_text": text} for text in texts], return_exceptions=True
+            )
+        except Exception as e:
+            results = [e] * len(texts)
+
+        for text, result in zip(texts, results):
+            if isinstance(result, Exception):
+                self.stats.failed += 1
+                logger.error(f"Ошибка модерации в пачке: {result}")
+            for future in batch[text]:
+                if future.done():  # вызывающего успели отменить
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def _invoke_limited(self, inputs: dict) -> ProfileCheck:
+        async with self._slots:
+            return await self.chain.ainvoke(inputs)
@@ -0,0 +1,85 @@
+import hashlib
+import re
+import unicodedata
+
+from src.bot.dao.moderation import ModerationResultsDAO
+from src.bot.llm_service.prompt_templates.schemas import ProfileCheck
+from src.core.cache import CacheStats, TTLLRUCache
+from src.core.database import run_detached
+from src.logger import logger
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_profile_text(profile_text: str) -> str:
+    """Текст для ключа кэша: без различий в регистре, юникодных вариантах символов и пробелах"""
+    text = unicodedata.normalize("NFKC", profile_text).casefold()
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def content_hash(profile_text: str) -> str:
+    return hashlib.sha256(normalize_profile_text(profile_text).encode()).hexdigest()
+
+
+class ModerationCache:
+    """
+    Кэш результатов модерации по хэшу нормализованного текста анкеты.
+
+    Первый уровень — TTL+LRU в памяти процесса, второй — таблица moderation_results.
+    В ключ БД входят модель и версия промпта, так что смена любой из них означает новую модерацию,
+    а старые записи просто перестают читаться. К таблице ходим своими сессиями, вне транзакции апдейта:
+    ошибка кэша не должна откатывать сам апдейт.
+    """
+
+    def __init__(
+        self,
+        results_dao: type[ModerationResultsDAO],
+        model_name: str,
+        prompt_version: str,
+        maxsize: int,
+        ttl: float,
+    ):
+        self.results_dao = results_dao
+        self.model_name = model_name
+        self.prompt_version = prompt_version
+        self.local: TTLLRUCache[str, ProfileCheck] = TTLLRUCache(maxsize, ttl)
+        self.db_stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.local.stats
+
+    @property
+    def hit_rate(self) -> float:
+        """Доля проверок без обращения к LLM (попадание в память или в БД)"""
+        lookups = self.stats.hits + self.stats.misses
+        return (self.stats.hits + self.db_stats.hits) / lookups if lookups else 0.0
+
+    async def get(self, key: str) -> ProfileCheck | None:
+        result = self.local.get(key)
+        if result is not None:
+            return result
+
+        try:
+            stored = await run_detached(self.results_dao.get_result(key, self.model_name, self.prompt_version))
+        except Exception as e:
+            # Кэш не должен ломать модерацию — без него просто спросим LLM
+            logger.warning(f"Не удалось прочитать moderation_results: {e}")
+            stored = None
+        if stored is None:
+            self.db_stats.misses += 1
+            return None
+
+        self.db_stats.hits += 1
+        result = ProfileCheck.model_validate(stored)
+        self.local.set(key, result)
+        return result
+
+    async def set(self, key: str, result: ProfileCheck) -> None:
+        self.local.set(key, result)
+        try:
+            await run_detached(
+                self.results_dao.save_result(key, self.model_name, self.prompt_version, result.model_dump())
+            )
+        except Exception as e:
+            logger.warning(f"Не удалось сохранить результат модерации: {e}")
@@ -0,0 +1,110 @@
+"""
+Локальный линейный классификатор анкет: хэширование признаков + логистическая регрессия.
+
+Обучение на размеченном JSONL ({"text", "label", "split"}, label "ok" — допустимая анкета):
+
+    uv run python -m src.bot.llm_service.classifier tests/fixtures/moderation_corpus.jsonl
+"""
+
+import json
+import math
+import random
+import re
+import sys
+import zlib
+from pathlib import Path
+
+from src.bot.llm_service.cache import normalize_profile_text
+
+WEIGHTS_PATH = Path(__file__).parent / "classifier_weights.json"
+_WORD = re.compile(r"\w+")
+
+
+def hash_features(profile_text: str, n_features: int) -> dict[int, float]:
+    """
+    Признаки как в HashingVectorizer: слова и символьные 3-граммы слов, индекс — crc32 по модулю n_features,
+    знак — по старшему биту (коллизии гасят друг друга, а не копятся). Вектор нормирован по L2.
+    """
+    text = normalize_profile_text(profile_text)
+    tokens = []
+    for word in _WORD.findall(text):
+        tokens.append("w:" + word)
+        padded = f" {word} "
+        tokens += ["c:" + padded[i : i + 3] for i in range(len(padded) - 2)]
+
+    features: dict[int, float] = {}
+    for token in tokens:
+        digest = zlib.crc32(token.encode())
+        index = digest % n_features
+        features[index] = features.get(index, 0.0) + (1.0 if digest & 0x80000000 else -1.0)
+
+    norm = math.sqrt(sum(value * value for value in features.values()))
+    return {index: value / norm for index, value in features.items() if value} if norm else {}
+
+
+class LinearClassifier:
+    """Логистическая регрессия по хэшированным признакам; predict — вероятность, что анкету надо отклонить"""
+
+    def __init__(self, weights: dict[int, float], bias: float, n_features: int):
+        self.weights = weights
+        self.bias = bias
+        self.n_features = n_features
+
+    def predict(self, profile_text: str) -> float:
+        features = hash_features(profile_text, self.n_features)
+        score = self.bias + sum(value * self.weights.get(index, 0.0) for index, value in features.items())
+        return 1 / (1 + math.exp(-max(min(score, 30), -30)))
+
+    @classmethod
+    def fit(
+        cls,
+        texts: list[str],
+        labels: list[int],
+        n_features: int = 2**18,
+        epochs: int = 30,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+    ) -> "LinearClassifier":
+        """SGD по логистической функции потерь; labels: 1 — отклонить, 0 — допустимо"""
+        samples = [(hash_features(text, n_features), label) for text, label in zip(texts, labels)]
+        model = cls({}, 0.0, n_features)
+        rng = random.Random(0)
+        for _ in range(epochs):
+            rng.shuffle(samples)
+            for features, label in samples:
+                score = model.bias + sum(value * model.weights.get(index, 0.0) for index, value in features.items())
+                error = 1 / (1 + math.exp(-max(min(score, 30), -30))) - label
+                model.bias -= learning_rate * error
+                for index, value in features.items():
+                    weight = model.weights.get(index, 0.0)
+                    model.weights[index] = weight - learning_rate * (error * value + l2 * weight)
+        return model
+
+    def save(self, path: Path) -> None:
+        data = {
+            "n_features": self.n_features,
+            "bias": self.bias,
+            "weights": {str(index): round(weight, 6) for index, weight in self.weights.items() if abs(weight) > 1e-6},
+        }
+        path.write_text(json.dumps(data, separators=(",", ":")))
+
+    @classmethod
+    def load(cls, path: Path) -> "LinearClassifier":
+        data = json.loads(path.read_text())
+        weights = {int(index): weight for index, weight in data["weights"].items()}
+        return cls(weights, data["bias"], data["n_features"])
+
+
+def load_corpus(path: Path, split: str | None = None) -> list[dict]:
+    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+    return [row for row in rows if split is None or row["split"] == split]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.exit(__doc__)
+    train = load_corpus(Path(sys.argv[1]), split="train")
+    model = LinearClassifier.fit([row["text"] for row in train], [int(row["label"] != "ok") for row in train])
+    output = Path(sys.argv[2]) if len(sys.argv) == 3 else WEIGHTS_PATH
+    model.save(output)
+    print(f"Обучено на {len(train)} анкетах, ненулевых весов {len(model.weights)}: {output}")
@@ -1,3 +1,5 @@
+import hashlib
+
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_mistralai import ChatMistralAI
 
@@ -7,6 +9,17 @@ llm = ChatMistralAI(
     api_key=settings.API_KEY, base_url=settings.BASE_URL, model_name=settings.MODEL_NAME, temperature=0.2, timeout=10
 )
 
+# Запасной провайдер для дублирующих запросов, если задан
+fallback_llm = None
+if settings.MODERATION_FALLBACK_BASE_URL:
+    fallback_llm = ChatMistralAI(
+        api_key=settings.API_KEY,
+        base_url=settings.MODERATION_FALLBACK_BASE_URL,
+        model_name=settings.MODERATION_FALLBACK_MODEL_NAME or settings.MODEL_NAME,
+        temperature=0.2,
+        timeout=10,
+    )
+
 prompt = ChatPromptTemplate.from_messages(
     [
         (
@@ -26,3 +39,28 @@ Return only structured data.""",
         ("user", "Profile:\n{profile_text}"),
     ]
 )
+
+# Комментарий к жалобе — не анкета: он пересказывает или цитирует нарушение, и это довод, а не повод отклонить
+report_prompt = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            """You review comments that users of a dating app attach to complaints about other profiles.
+
+Decide whether the comment is a genuine complaint.
+
+Rules:
+- A comment describing a problem with the reported profile is genuine
+- Quoted ads, links, phone numbers, insults or sexual content from the reported profile are evidence, not a reason to reject
+- Reject only comments that are themselves spam or ads unrelated to the profile, or abuse that describes no problem
+
+Return only structured data.""",
+        ),
+        ("user", "Complaint comment:\n{comment}"),
+    ]
+)
+
+# Версия промпта для кэша модерации: меняется вместе с текстом промпта
+PROMPT_VERSION = hashlib.sha256(
+    "\n".join(message.prompt.template for message in prompt.messages).encode()
+).hexdigest()[:16]
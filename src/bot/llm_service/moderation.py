@@ -1,24 +1,104 @@
+import time
+
 from langchain_core.runnables import Runnable
 
-from src.bot.llm_service.prompt_templates.schemas import ProfileCheck
+from src.bot.llm_service.batcher import ModerationBatcher
+from src.bot.llm_service.cache import ModerationCache, content_hash
+from src.bot.llm_service.prompt_templates.schemas import DegradedProfileCheck, FallbackProfileCheck, ProfileCheck
+from src.bot.llm_service.tiered import TieredModerator
+from src.config import settings
 from src.logger import logger
 
+# Раз в сколько проверок писать в лог статистику модерации
+STATS_LOG_EVERY = 100
+
 
 class ModerationService:
-    def __init__(self, chain: Runnable):
+    def __init__(
+        self,
+        chain: Runnable,
+        cache: ModerationCache | None = None,
+        batcher: ModerationBatcher | None = None,
+        fast_path: TieredModerator | None = None,
+        degraded_allow: bool = settings.MODERATION_DEGRADED_ALLOW,
+    ):
         self.chain = chain
+        self.cache = cache
+        self.batcher = batcher
+        self.fast_path = fast_path
+        self.degraded_allow = degraded_allow
+        self.checks = 0
+        self.degraded = 0
 
     async def moderate_profile(self, profile_text: str) -> ProfileCheck:
+        """
+        Вердикт по анкете; если LLM недоступна — DegradedProfileCheck. Он не кэшируется, как и вердикт
+        запасной модели (FallbackProfileCheck): кэш ведётся по модели и промпту основной
+        """
+        self._log_stats()
+        # Очевидные случаи решаются локально, в LLM уходят только спорные
+        if self.fast_path:
+            verdict = self.fast_path.check(profile_text)
+            if verdict is not None:
+                return verdict
+
+        key = content_hash(profile_text) if self.cache else None
+        if self.cache:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        started = time.perf_counter()
         try:
-            result = await self.chain.ainvoke({"profile_text": profile_text})
-            return result
+            if self.batcher:
+                result = await self.batcher.submit(profile_text)
+            else:
+                result = await self.chain.ainvoke({"profile_text": profile_text})
         except Exception as e:
-            logger.error(f"Error moderating profile: {e}")
-            return None
+            logger.error(f"Error moderating profile: {e!r}")
+            result = None
+        if self.fast_path:
+            self.fast_path.record_llm(time.perf_counter() - started, decided=result is not None)
+        if result is None:
+            # Неудачная модерация не кэшируется — в следующий раз спросим LLM снова
+            return self._degraded_verdict()
+
+        if self.cache and not isinstance(result, FallbackProfileCheck):
+            await self.cache.set(key, result)
+        return result
+
+    def _degraded_verdict(self) -> DegradedProfileCheck:
+        self.degraded += 1
+        return DegradedProfileCheck(
+            is_valid=self.degraded_allow,
+            toxicity=0.0,
+            nsfw=False,
+            spam=False,
+            summary=f"Модерация недоступна: анкета {'пропущена без проверки' if self.degraded_allow else 'отклонена'}",
+        )
+
+    async def stop(self) -> None:
+        if self.batcher:
+            await self.batcher.stop()
+
+    def _log_stats(self) -> None:
+        self.checks += 1
+        if self.checks % STATS_LOG_EVERY:
+            return
+        if self.fast_path:
+            tiers = ", ".join(
+                f"{tier} {stats.verdicts}/{stats.checks} ({stats.avg_ms:.2f} ms)"
+                for tier, stats in self.fast_path.stats.items()
+            )
+            logger.info(f"Модерация по уровням: {tiers}; в LLM {self.fast_path.escalation_rate:.0%}")
+        if self.degraded:
+            logger.warning(f"Модерация без LLM (degraded): {self.degraded} из {self.checks} проверок")
+        if self.cache:
+            logger.info(
+                f"Кэш модерации: попаданий {self.cache.hit_rate:.0%} "
+                f"(память {self.cache.stats.hits}, БД {self.cache.db_stats.hits}), в памяти {len(self.cache.local)}"
+            )
 
-    async def valid_text(self, profile_text: str) -> ProfileCheck:
+    async def valid_text(self, profile_text: str) -> bool:
         result = await self.moderate_profile(profile_text)
-        print(result)
-        if result.is_valid:
-            return True
-        return False
+        return result.is_valid
@@ -7,3 +7,20 @@ class ProfileCheck(BaseModel):
     nsfw: bool = Field(description="Contains sexual content")
     spam: bool = Field(description="Contains ads or spam")
     summary: str = Field(description="Short neutral summary")
+
+
+class DegradedProfileCheck(ProfileCheck):
+    """Вердикт без LLM: она недоступна, решение принято по настройке MODERATION_DEGRADED_ALLOW"""
+
+    degraded: bool = True
+
+
+class FallbackProfileCheck(ProfileCheck):
+    """Вердикт запасной модели: кэш ведётся по MODEL_NAME основной, поэтому такой вердикт не кэшируется"""
+
+    fallback: bool = True
+
+
+class ReportCheck(BaseModel):
+    is_genuine: bool = Field(description="Comment describes a real problem with the reported profile")
+    summary: str = Field(description="Short neutral summary")
@@ -0,0 +1,22 @@
+from langchain_core.runnables import Runnable
+
+from src.bot.llm_service.prompt_templates.schemas import ReportCheck
+from src.logger import logger
+
+
+class ReportCommentChecker:
+    """
+    Проверка комментариев к жалобам своим промптом, без правил и классификатора анкет:
+    настоящая жалоба часто цитирует ссылку, телефон или рекламу из анкеты, на которую жалуются.
+    """
+
+    def __init__(self, chain: Runnable):
+        self.chain = chain
+
+    async def check(self, comment: str) -> ReportCheck | None:
+        """None — LLM недоступна, жалоба разбирается позже"""
+        try:
+            return await self.chain.ainvoke({"comment": comment})
+        except Exception as e:
+            logger.error(f"Error checking report comment: {e!r}")
+            return None
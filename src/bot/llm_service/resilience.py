@@ -0,0 +1,214 @@
+import asyncio
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+
+from langchain_core.runnables import Runnable
+
+from src.logger import logger
+
+
+class CircuitOpenError(Exception):
+    """Все эндпоинты LLM выключены предохранителем — запрос даже не отправлялся"""
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Предохранитель, который учитывает и ошибки, и задержку: вызов дольше slow_call_seconds считается плохим.
+    Если среди последних window вызовов (не меньше min_calls) плохих не меньше failure_rate, цепь размыкается
+    на open_seconds; затем пропускается один пробный вызов — по его исходу цепь замыкается или снова размыкается.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int,
+        min_calls: int,
+        failure_rate: float,
+        slow_call_seconds: float,
+        open_seconds: float,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.state = BreakerState.CLOSED
+        self._outcomes: deque[bool] = deque(maxlen=window)  # True — плохой вызов
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """Можно ли вызывать; если да, вызывающий обязан потом сообщить исход в record"""
+        if self.state == BreakerState.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self.state = BreakerState.HALF_OPEN
+        if self.state == BreakerState.HALF_OPEN:
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return self.state != BreakerState.OPEN
+
+    def record(self, seconds: float, ok: bool) -> None:
+        bad = not ok or seconds >= self.slow_call_seconds
+        if self.state == BreakerState.HALF_OPEN:
+            self._probe_in_flight = False
+            self._open() if bad else self._close()
+            return
+
+        self._outcomes.append(bad)
+        if (
+            self.state == BreakerState.CLOSED
+            and len(self._outcomes) >= self.min_calls
+            and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate
+        ):
+            self._open()
+
+    def release(self) -> None:
+        """Разрешённый allow вызов так и не состоялся (отменён в очереди)"""
+        if self.state == BreakerState.HALF_OPEN:
+            self._probe_in_flight = False
+
+    def _open(self) -> None:
+        self.state = BreakerState.OPEN
+        self._opened_at = time.monotonic()
+        logger.warning(f"LLM {self.name}: предохранитель разомкнут на {self.open_seconds} с")
+
+    def _close(self) -> None:
+        self.state = BreakerState.CLOSED
+        self._outcomes.clear()
+        logger.info(f"LLM {self.name}: предохранитель замкнут")
+
+
+@dataclass
+class Endpoint:
+    """Один LLM-провайдер: своя цепочка, свой предел одновременных запросов и свой предохранитель"""
+
+    name: str
+    chain: Runnable
+    breaker: CircuitBreaker
+    max_concurrency: int
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+    def __post_init__(self):
+        self.slots = asyncio.Semaphore(self.max_concurrency)
+
+    def p95(self, min_samples: int) -> float | None:
+        if len(self.latencies) < min_samples:
+            return None
+        return statistics.quantiles(self.latencies, n=20)[-1]
+
+
+@dataclass
+class ResilienceStats:
+    calls: int = 0
+    hedged: int = 0  # основной медлит — параллельно спросили запасной
+    failovers: int = 0  # основной ответил ошибкой — спросили запасной
+    secondary_wins: int = 0  # ответ пришёл от запасного
+    rejected_open: int = 0
+    timeouts: int = 0
+
+
+class ResilientModerationChain:
+    """
+    Обёртка над цепочкой модерации с общим дедлайном timeout.
+
+    Запрос идёт в основной эндпоинт; если он не ответил за p95 своих последних задержек (пока замеров мало —
+    за hedge_delay), параллельно отправляется такой же запрос в запасной, и берётся первый ответ.
+    Ошибка основного до этого момента тоже переводит запрос на запасной. Эндпоинт с разомкнутым
+    предохранителем пропускается; если недоступны все, сразу CircuitOpenError.
+    """
+
+    def __init__(
+        self,
+        primary: Endpoint,
+        secondary: Endpoint | None,
+        timeout: float,
+        hedge_delay: float,
+        min_samples: int = 20,
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self.min_samples = min_samples
+        self.stats = ResilienceStats()
+
+    def hedge_after(self) -> float:
+        return self.primary.p95(self.min_samples) or self.hedge_delay
+
+    async def ainvoke(self, inputs: dict):
+        self.stats.calls += 1
+        try:
+            async with asyncio.timeout(self.timeout):
+                return await self._invoke(inputs)
+        except TimeoutError:
+            self.stats.timeouts += 1
+            raise
+
+    async def _invoke(self, inputs: dict):
+        if not self.primary.breaker.allow():
+            if self.secondary and self.secondary.breaker.allow():
+                return await self._call(self.secondary, inputs)
+            self.stats.rejected_open += 1
+            raise CircuitOpenError("LLM недоступна: все предохранители разомкнуты")
+
+        primary = asyncio.create_task(self._call(self.primary, inputs))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_after())
+            if done and primary.exception() is None:
+                return primary.result()
+
+            # Основной упал или медлит — подключаем запасной
+            error = primary.exception() if done else None
+            if self.secondary and self.secondary.breaker.allow():
+                if done:
+                    self.stats.failovers += 1
+                else:
+                    self.stats.hedged += 1
+                pending.add(asyncio.create_task(self._call(self.secondary, inputs)))
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.stats.secondary_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _call(self, endpoint: Endpoint, inputs: dict):
+        started = None
+        ok = False
+        cancelled = False
+        try:
+            async with endpoint.slots:
+                started = time.monotonic()
+                result = await endpoint.chain.ainvoke(inputs)
+                ok = True
+                return result
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            elapsed = time.monotonic() - started if started is not None else 0.0
+            if started is None or (cancelled and elapsed < endpoint.breaker.slow_call_seconds):
+                # Не начавшийся или проигравший гонку, но ещё не медленный вызов ничего не говорит об эндпоинте
+                endpoint.breaker.release()
+            else:
+                # Отменённый после slow_call_seconds вызов считается медленным
+                endpoint.breaker.record(elapsed, ok)
+                if ok:
+                    endpoint.latencies.append(elapsed)
@@ -0,0 +1,123 @@
+import re
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from src.bot.llm_service.cache import normalize_profile_text
+from src.bot.llm_service.prompt_templates.schemas import ProfileCheck
+
+
+class AhoCorasick:
+    """
+    Поиск всех словарных шаблонов за один проход по тексту.
+    Шаблон засчитывается только с начала слова — «хуй» не находится в «страхуй»,
+    а конец слова свободный, чтобы основа ловила все словоформы.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[str]] = [[]]
+        for pattern in patterns:
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(pattern)
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def find(self, text: str) -> set[str]:
+        found = set()
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern in self._out[state]:
+                start = end - len(pattern) + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    found.add(pattern)
+        return found
+
+
+# Словари по нормализованному тексту (нижний регистр, NFKC). Только однозначные случаи —
+# всё спорное решают классификатор и LLM. Уровень умеет только отклонять, поэтому голых основ вроде
+# «казино» или «крипто» здесь нет: они есть и в «Казино Рояль», и в «криптографии»
+PROFANITY = ("бля", "сука", "суки", "хуй", "хуе", "хуё", "пизд", "ебат", "ебан", "ёбан", "мудак", "fuck", "shit", "bitch")
+NSFW = ("секс за деньги", "интим услуг", "эскорт", "onlyfans", "нюдс", "nudes", "вебкам")
+ADS = (
+    "пассивный доход",
+    "заработок онлайн",
+    "заработок в интернете",
+    "онлайн казино",
+    "онлайн-казино",
+    "ставки на спорт",
+    "промокод",
+    "реферальн",
+    "подписывайтесь на канал",
+    "подписывайся на канал",
+    "переходи по ссылке",
+)
+
+LINK = re.compile(r"https?://|www\.|t\.me/|\b[\w-]+\.(?:ru|com|net|org|me|io|ly|su|рф)\b")
+PHONE = re.compile(r"(?:\+7|\b8)[\s(-]*\d{3}[\s)-]*\d{3}[\s-]*\d{2}[\s-]*\d{2}\b|\+\d[\d\s()-]{9,}\d")
+
+
+@dataclass
+class RuleMatch:
+    rule: str
+    pattern: str
+
+
+class RuleTier:
+    """Первый уровень модерации: ссылки, телефоны, рекламные фразы, мат и NSFW. Умеет только отклонять"""
+
+    def __init__(self):
+        self._categories = {pattern: "profanity" for pattern in PROFANITY}
+        self._categories |= {pattern: "nsfw" for pattern in NSFW}
+        self._categories |= {pattern: "ads" for pattern in ADS}
+        self._automaton = AhoCorasick(self._categories)
+
+    def match(self, profile_text: str) -> list[RuleMatch]:
+        text = normalize_profile_text(profile_text)
+        matches = [RuleMatch(self._categories[pattern], pattern) for pattern in sorted(self._automaton.find(text))]
+        for rule, regex in (("link", LINK), ("phone", PHONE)):
+            found = regex.search(text)
+            if found:
+                matches.append(RuleMatch(rule, found.group()))
+        return matches
+
+    def check(self, profile_text: str) -> ProfileCheck | None:
+        """Вердикт «отклонить», если сработало правило, иначе None (решают следующие уровни)"""
+        matches = self.match(profile_text)
+        if not matches:
+            return None
+        rules = {match.rule for match in matches}
+        return ProfileCheck(
+            is_valid=False,
+            toxicity=1.0 if "profanity" in rules else 0.0,
+            nsfw="nsfw" in rules,
+            spam=bool(rules & {"ads", "link", "phone"}),
+            summary="Отклонено правилами: " + ", ".join(f"{match.rule} ({match.pattern})" for match in matches),
+        )
@@ -0,0 +1,73 @@
+import time
+from dataclasses import dataclass
+
+from src.bot.llm_service.classifier import LinearClassifier
+from src.bot.llm_service.prompt_templates.schemas import ProfileCheck
+from src.bot.llm_service.rules import RuleTier
+
+TIERS = ("rules", "classifier", "llm")
+
+
+@dataclass
+class TierStats:
+    checks: int = 0  # сколько текстов дошло до уровня
+    verdicts: int = 0  # сколько из них уровень решил сам
+    seconds: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.seconds / self.checks * 1000 if self.checks else 0.0
+
+
+class TieredModerator:
+    """
+    Быстрые уровни модерации перед LLM: правила (только отклонение) и локальный классификатор.
+
+    Классификатор решает сам, только если уверен: вероятность «отклонить» ниже accept_below — анкета допустима,
+    выше reject_above — нет. Всё между порогами check возвращает как None — это уходит в LLM.
+    """
+
+    def __init__(self, rules: RuleTier, classifier: LinearClassifier | None, accept_below: float, reject_above: float):
+        self.rules = rules
+        self.classifier = classifier
+        self.accept_below = accept_below
+        self.reject_above = reject_above
+        self.stats = {tier: TierStats() for tier in TIERS}
+
+    @property
+    def escalation_rate(self) -> float:
+        checks = self.stats["rules"].checks
+        return self.stats["llm"].checks / checks if checks else 0.0
+
+    def check(self, profile_text: str) -> ProfileCheck | None:
+        started = time.perf_counter()
+        verdict = self.rules.check(profile_text)
+        self._record("rules", started, verdict)
+        if verdict is not None or self.classifier is None:
+            return verdict
+
+        started = time.perf_counter()
+        probability = self.classifier.predict(profile_text)
+        if probability < self.accept_below or probability > self.reject_above:
+            is_valid = probability < self.accept_below
+            verdict = ProfileCheck(
+                is_valid=is_valid,
+                toxicity=round(probability, 2),
+                nsfw=False,
+                spam=False,
+                summary=f"Локальный классификатор: {'допустимо' if is_valid else 'отклонить'} (p={probability:.2f})",
+            )
+        self._record("classifier", started, verdict)
+        return verdict
+
+    def record_llm(self, seconds: float, decided: bool) -> None:
+        stats = self.stats["llm"]
+        stats.checks += 1
+        stats.verdicts += decided
+        stats.seconds += seconds
+
+    def _record(self, tier: str, started: float, verdict: ProfileCheck | None) -> None:
+        stats = self.stats[tier]
+        stats.checks += 1
+        stats.verdicts += verdict is not None
+        stats.seconds += time.perf_counter() - started
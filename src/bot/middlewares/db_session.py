@@ -0,0 +1,29 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from src.core.database import unit_of_work
+
+
+class DbSessionMiddleware(BaseMiddleware):
+    """
+    Unit of work на апдейт: одна сессия на всю обработку.
+
+    Сессия доступна DAO через session_scope(), а хендлерам — как параметр session.
+    Сервисы коммитят запись сами (commit_unit_of_work) до того, как хендлер ответит в Telegram,
+    чтобы транзакция и блокировки не ждали сети; остальное коммитится после хендлера,
+    при исключении транзакция откатывается.
+    Автор апдейта запоминается для read-your-writes при чтении с реплики.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        async with unit_of_work(user_id=user.id if user else None) as session:
+            data["session"] = session
+            return await handler(event, data)
@@ -0,0 +1,51 @@
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from src.config import settings
+from src.core.database import current_user_id
+from src.core.send_scheduler import Lane, SendScheduler
+from src.logger import logger
+
+# Лимит бота общий для всех процессов: при BOT_WORKERS > 1 каждому обработчику достаётся своя доля
+send_scheduler = SendScheduler(
+    global_rate=settings.SEND_GLOBAL_RATE / settings.BOT_WORKERS,
+    chat_rate=settings.SEND_CHAT_RATE,
+    chat_burst=settings.SEND_CHAT_BURST,
+    metrics_interval=settings.SEND_METRICS_INTERVAL,
+)
+
+
+class SendSchedulerMiddleware(BaseRequestMiddleware):
+    """
+    Все запросы бота в чаты проходят через SendScheduler.
+
+    Ответ автору текущего апдейта идёт в полосе REPLY, всё остальное (уведомления другим) — в NOTIFICATION.
+    На RetryAfter чат ставится на паузу и запрос повторяется, не более SEND_MAX_RETRIES раз.
+    """
+
+    def __init__(self, scheduler: SendScheduler):
+        self.scheduler = scheduler
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is None:
+            return await make_request(bot, method)
+
+        lane = Lane.REPLY if chat_id == current_user_id.get() else Lane.NOTIFICATION
+        for attempt in range(settings.SEND_MAX_RETRIES + 1):
+            await self.scheduler.acquire(chat_id, lane)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt == settings.SEND_MAX_RETRIES:
+                    raise
+                logger.warning(f"RetryAfter {e.retry_after} с для чата {chat_id} ({method.__api_method__})")
+                self.scheduler.retry_after(chat_id, e.retry_after)
@@ -0,0 +1,63 @@
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Date, DateTime, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+
+
+class SwipeEvent(Base):
+    """
+    Outbox действий со свайпами: пишется в той же транзакции, что и сама оценка/мэтч/жалоба.
+
+    xid — номер транзакции записи. Потребители читают события по (xid, id) только из уже завершённых
+    транзакций (xid < xmin снимка), поэтому событие из транзакции, закоммиченной позже, не будет пропущено.
+    """
+
+    __tablename__ = "swipe_events"
+    __table_args__ = (Index("ix_swipe_events_xid_id", "xid", "id"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    xid: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=text("(pg_current_xact_id()::text)::bigint")
+    )
+    event_type: Mapped[str] = mapped_column(String(16), nullable=False)
+    actor_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    target_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    payload: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class EventConsumerOffset(Base):
+    """Позиция потребителя в swipe_events: последнее обработанное событие (xid, id)"""
+
+    __tablename__ = "event_consumer_offsets"
+
+    consumer: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_xid: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    last_event_id: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class UserSwipeCounters(Base):
+    """Счётчики по пользователю, которые ведёт потребитель событий"""
+
+    __tablename__ = "user_swipe_counters"
+
+    tg_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    likes_given: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    dislikes_given: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    likes_received: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    matches: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    reports_received: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class SwipeDailyStats(Base):
+    """Аналитика: число событий каждого типа по дням"""
+
+    __tablename__ = "swipe_daily_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(16), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,7 +1,7 @@
 # src/likes/models.py
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Integer
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.core.database import Base
@@ -11,6 +11,14 @@ class Likes(Base):
     """Модель лайков между пользователями"""
 
     __tablename__ = "likes"
+    __table_args__ = (
+        # Одна оценка на пару: check_mutual_like, already_rated, get_rated_user_ids, удаление по from_user_id
+        Index("uq_likes_from_user_id_to_user_id", "from_user_id", "to_user_id", unique=True),
+        # "Кто меня лайкнул" — только лайки, index-only scan по (to_user_id, from_user_id)
+        Index("ix_likes_to_user_id_liked", "to_user_id", "from_user_id", postgresql_where=text("is_like")),
+        # Удаление всех оценок пользователя (delete_likes_by_user, ветка to_user_id)
+        Index("ix_likes_to_user_id", "to_user_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     from_user_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.tg_id"), nullable=False)
@@ -23,8 +31,30 @@ class Matches(Base):
     """Модель мэтчей (взаимных лайков)"""
 
     __tablename__ = "matches"
+    __table_args__ = (
+        # Пара хранится упорядоченной (user1_id < user2_id), поэтому на пару возможен только один мэтч
+        UniqueConstraint("user1_id", "user2_id", name="uq_matches_user1_id_user2_id"),
+        # Страницы /matches по каждой стороне пары: WHERE userN_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_matches_user1_id_created_at", "user1_id", "created_at", "id"),
+        Index("ix_matches_user2_id_created_at", "user2_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user1_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.tg_id"), nullable=False)
     user2_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.tg_id"), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class LikesInbox(Base):
+    """Входящие лайки, на которые получатель ещё не ответил (ведёт потребитель swipe_events)"""
+
+    __tablename__ = "likes_inbox"
+    __table_args__ = (
+        # Самый старый неотвеченный лайк получателя — первая запись индекса
+        Index("ix_likes_inbox_recipient_id_created_at", "recipient_id", "created_at", "sender_id"),
+        Index("ix_likes_inbox_sender_id", "sender_id"),
+    )
+
+    recipient_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.tg_id"), primary_key=True)
+    sender_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.tg_id"), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
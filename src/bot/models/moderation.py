@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+
+
+class ModerationResult(Base):
+    """Результаты LLM-модерации по хэшу нормализованного текста анкеты, модели и версии промпта"""
+
+    __tablename__ = "moderation_results"
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model_name: Mapped[str] = mapped_column(String(128), primary_key=True)
+    prompt_version: Mapped[str] = mapped_column(String(16), primary_key=True)
+    result: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ModerationJob(Base):
+    """Анкеты, ждущие модерации: одна запись на пользователя, повторная анкета заменяет прежнюю"""
+
+    __tablename__ = "moderation_jobs"
+    __table_args__ = (Index("ix_moderation_jobs_available_at", "available_at"),)
+
+    tg_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    profile_text: Mapped[str] = mapped_column(Text, nullable=False)
+    # Растёт при каждой новой анкете: вердикт по старому тексту не применяется к новому
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # До этого момента задача занята обработчиком (или ждёт повтора)
+    available_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+
+
+class NotificationOutbox(Base):
+    """Неотправленные уведомления (NOTIFY_OUTBOX=true): пишутся в транзакции апдейта, удаляются после отправки"""
+
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        # Разбор хвоста после падения: WHERE available_at <= now() ORDER BY available_at
+        Index("ix_notification_outbox_available_at", "available_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    reply_markup: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # До этого момента запись занята процессом, который её отправляет (или ждёт повтора)
+    available_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
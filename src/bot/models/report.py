@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, Integer, Text
+from sqlalchemy import ForeignKey, Index, Integer, Text, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.core.database import Base
@@ -8,6 +8,10 @@ from src.core.database import Base
 
 class Reports(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        # Разбор жалоб: WHERE reviewed_at IS NULL ORDER BY id
+        Index("ix_reports_unreviewed", "id", postgresql_where=text("reviewed_at IS NULL")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     reporter_user_id: Mapped[int] = mapped_column(ForeignKey("users.tg_id"))
@@ -15,3 +19,7 @@ class Reports(Base):
     comment: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     reviewed_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    # До этого момента жалоба занята обработчиком разбора
+    claimed_until: Mapped[datetime | None] = mapped_column(nullable=True)
+    # Итог разбора: True — жалоба учтена в users.report_count, False — отклонена модерацией комментария
+    accepted: Mapped[bool | None] = mapped_column(nullable=True)
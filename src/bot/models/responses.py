@@ -25,6 +25,17 @@ class GenderResponse(BaseResponse):
     pass
 
 
+class LikeRegistration(BaseModel):
+    """Результат записи оценки одной операцией в БД"""
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    is_match: bool
+    match_created: bool
+    current_user: Users | None
+    target_user: Users | None
+
+
 class LikeProcessResult(BaseModel):
     """Результат обработки лайка"""
 
@@ -34,7 +45,6 @@ class LikeProcessResult(BaseModel):
     matched_user: Users | None
     current_user: Users
     next_profile: Users | None
-    can_notify_target: bool = True
 
 
 class DislikeProcessResult(BaseModel):
@@ -45,10 +55,20 @@ class DislikeProcessResult(BaseModel):
     next_profile: Users | None
 
 
-class MatchWithDetails(BaseModel):
-    """Мэтч с подробной информацией"""
+class MatchCard(BaseModel):
+    """Краткая карточка мэтча для списка /matches"""
 
-    model_config = {"arbitrary_types_allowed": True}
+    match_id: int
+    tg_id: int
+    name: str | None
+    age: int | None
+    city: str | None
+    username: str | None
+    matched_at: datetime
+
+
+class MatchesPage(BaseModel):
+    """Страница мэтчей и курсор (matched_at, match_id) для следующей"""
 
-    user: Users
-    match_date: datetime | None = None
+    cards: list[MatchCard]
+    next_cursor: tuple[datetime, int] | None = None
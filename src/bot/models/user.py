@@ -1,11 +1,16 @@
-from sqlalchemy import BigInteger, Boolean, Integer, String
+from sqlalchemy import BigInteger, Boolean, Index, Integer, String, text
 from sqlalchemy.orm import Mapped, mapped_column
 
+from src.bot.enum.moderation import ModerationStatus
 from src.core.database import Base
 
 
 class Users(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Лента: keyset по id среди одобренных анкет, порог жалоб проверяется по самому индексу
+        Index("ix_users_feed", "id", "report_count", postgresql_where=text("moderation_status = 'approved'")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     tg_id: Mapped[int] = mapped_column(BigInteger, unique=True, nullable=False)
@@ -18,3 +23,12 @@ class Users(Base):
     interests: Mapped[str | None] = mapped_column(nullable=True)
     photo_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
     status_of_the_questionnaire: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # В ленту и входящие попадают только одобренные анкеты; новая или изменённая ждёт модерации
+    moderation_status: Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+        default=ModerationStatus.PENDING.value,
+        server_default=ModerationStatus.PENDING.value,
+    )
+    # Учтённые жалобы на анкету (ведёт разбор жалоб); от REPORT_HIDE_THRESHOLD анкета не показывается в ленте
+    report_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
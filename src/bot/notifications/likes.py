@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from aiogram import Bot
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+
+from src.bot.keyboards.swipe import get_show_likes_keyboard
+from src.bot.notifications.worker import NotificationWorker
+from src.bot.presenters.swipe import SwipePresenter
+from src.bot.states.swipe_states import SwipeStates
+from src.core.database import run_detached
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LikeNotificationStats:
+    likes: int = 0  # лайков пришло на уведомление
+    sent: int = 0  # уведомлений поставлено в отправку
+    skipped: int = 0  # лайков без уведомления: получатель и так смотрит лайкнувших
+
+
+class LikeNotificationAggregator:
+    """
+    Уведомления о лайках, собранные по получателю.
+
+    Первый лайк открывает окно в window секунд, по его окончании получателю уходит одно сообщение
+    с числом лайков за окно. Если получатель в этот момент просматривает лайкнувших (SwipeStates.viewing_likes),
+    уведомление не отправляется — он и так их увидит.
+    Окна и проверка состояния — в памяти процесса (FSM_STORAGE=memory тоже), поэтому под супервизором каждый
+    процесс получает лайки только получателей своего шарда (см. NotificationConsumer).
+    """
+
+    def __init__(
+        self, storage: BaseStorage, presenter: SwipePresenter, notifications: NotificationWorker, window: float
+    ):
+        self.storage = storage
+        self.notifications = notifications
+        self.presenter = presenter
+        self.window = window
+        self.stats = LikeNotificationStats()
+        self._pending: dict[int, int] = {}
+        self._timers: dict[int, asyncio.Task] = {}
+
+    async def add(self, bot: Bot, recipient_id: int) -> None:
+        self.stats.likes += 1
+        if await self._is_viewing_likes(bot, recipient_id):
+            self.stats.skipped += 1
+            return
+
+        self._pending[recipient_id] = self._pending.get(recipient_id, 0) + 1
+        if recipient_id not in self._timers:
+            self._timers[recipient_id] = run_detached(self._flush_later(bot, recipient_id))
+
+    async def flush_all(self, bot: Bot) -> None:
+        """Отправить всё накопленное, не дожидаясь окон (при остановке бота)"""
+        for timer in self._timers.values():
+            timer.cancel()
+        await asyncio.gather(*(self._flush(bot, recipient_id) for recipient_id in list(self._pending)))
+        logger.info(
+            f"Уведомления о лайках: лайков {self.stats.likes}, сообщений {self.stats.sent}, "
+            f"пропущено {self.stats.skipped}"
+        )
+
+    async def _flush_later(self, bot: Bot, recipient_id: int) -> None:
+        await asyncio.sleep(self.window)
+        await self._flush(bot, recipient_id)
+
+    async def _flush(self, bot: Bot, recipient_id: int) -> None:
+        self._timers.pop(recipient_id, None)
+        count = self._pending.pop(recipient_id, 0)
+        if not count:
+            return
+
+        if await self._is_viewing_likes(bot, recipient_id):
+            self.stats.skipped += count
+            return
+
+        await self.notifications.enqueue(
+            recipient_id, self.presenter.format_likes_notification(count), reply_markup=get_show_likes_keyboard()
+        )
+        self.stats.sent += 1
+
+    async def _is_viewing_likes(self, bot: Bot, user_id: int) -> bool:
+        key = StorageKey(bot_id=bot.id, chat_id=user_id, user_id=user_id)
+        return await self.storage.get_state(key) == SwipeStates.viewing_likes.state
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramBadRequest, TelegramForbiddenError
+from aiogram.types import ReplyMarkupUnion
+
+from src.bot.dao.notification import NotificationOutboxDAO
+from src.core.database import after_commit, current_session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Notification:
+    chat_id: int
+    text: str
+    reply_markup: dict | None = None
+    outbox_id: int | None = None
+    attempts: int = 0
+
+
+@dataclass
+class NotificationStats:
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+class NotificationWorker:
+    """
+    Фоновая отправка уведомлений другим пользователям (мэтчи, лайки), чтобы хендлер не ждал чужой чат.
+
+    enqueue кладёт уведомление в очередь после коммита транзакции апдейта — о мэтче, который откатился,
+    никто не узнает. Отправляют concurrency задач-потребителей; сетевые ошибки и ошибки Telegram повторяются
+    с экспоненциальной паузой до max_attempts раз, «бот заблокирован» и неверный запрос — нет.
+
+    С durable=True уведомление ещё и пишется в notification_outbox в той же транзакции и удаляется после отправки;
+    то, что не успело уйти до падения процесса, подбирает периодический разбор хвоста.
+    Ждущие повтора уведомления лежат не в очереди, а в таймерах: stop их отменяет и пишет в лог, сколько
+    вернётся из outbox после аренды, а сколько (без durable) потеряно.
+    """
+
+    def __init__(
+        self,
+        outbox_dao: type[NotificationOutboxDAO],
+        durable: bool,
+        concurrency: int,
+        max_attempts: int,
+        lease_seconds: float,
+        poll_interval: float,
+    ):
+        self.outbox_dao = outbox_dao
+        self.durable = durable
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.stats = NotificationStats()
+        self._queue: asyncio.Queue[Notification] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._retries: dict[asyncio.TimerHandle, Notification] = {}
+
+    async def enqueue(self, chat_id: int, text: str, reply_markup: ReplyMarkupUnion | None = None) -> None:
+        markup = reply_markup.model_dump(mode="json", exclude_none=True) if reply_markup else None
+        notification = Notification(chat_id=chat_id, text=text, reply_markup=markup)
+        if self.durable:
+            notification.outbox_id = await self.outbox_dao.add_notification(
+                chat_id, text, markup, lease_seconds=self.lease_seconds
+            )
+
+        session = current_session.get()
+        if session is None:
+            self._queue.put_nowait(notification)
+            return
+
+        async def push():
+            self._queue.put_nowait(notification)
+
+        after_commit(session, push)
+
+    async def start(self, bot: Bot) -> None:
+        self._tasks = [asyncio.create_task(self._consume(bot)) for _ in range(self.concurrency)]
+        if self.durable:
+            self._tasks.append(asyncio.create_task(self._poll_outbox()))
+
+    async def stop(self, timeout: float = 10) -> None:
+        """Дождаться отправки очереди (не дольше timeout) и остановить потребителей"""
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except TimeoutError:
+            logger.warning(f"Остановка: не отправлено уведомлений {self._queue.qsize()}")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._cancel_retries()
+        logger.info(
+            f"Уведомления: отправлено {self.stats.sent}, повторов {self.stats.retried}, "
+            f"не доставлено {self.stats.failed}"
+        )
+
+    async def _consume(self, bot: Bot) -> None:
+        while True:
+            notification = await self._queue.get()
+            try:
+                await self._deliver(bot, notification)
+            except Exception:
+                logger.exception(f"Ошибка отправки уведомления в чат {notification.chat_id}")
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, bot: Bot, notification: Notification) -> None:
+        try:
+            await bot.send_message(notification.chat_id, notification.text, reply_markup=notification.reply_markup)
+        except (TelegramForbiddenError, TelegramBadRequest) as e:
+            # Пользователь заблокировал бота или чата нет — повтор не поможет
+            self.stats.failed += 1
+            logger.warning(f"Уведомление в чат {notification.chat_id} не доставлено: {e}")
+            await self._forget(notification)
+            return
+        except TelegramAPIError as e:
+            await self._retry_later(notification, e)
+            return
+
+        self.stats.sent += 1
+        await self._forget(notification)
+
+    async def _retry_later(self, notification: Notification, error: TelegramAPIError) -> None:
+        notification.attempts += 1
+        if notification.attempts >= self.max_attempts:
+            self.stats.failed += 1
+            logger.error(
+                f"Уведомление в чат {notification.chat_id} не доставлено за {notification.attempts} попыток: {error}"
+            )
+            await self._forget(notification)
+            return
+
+        delay = min(2**notification.attempts, 300)
+        self.stats.retried += 1
+        if notification.outbox_id is not None:
+            # Пока ждём повтора, запись остаётся за этим процессом
+            available_at = datetime.utcnow() + timedelta(seconds=delay + self.lease_seconds)
+            await self.outbox_dao.reschedule(notification.outbox_id, notification.attempts, available_at)
+
+        def requeue():
+            del self._retries[handle]
+            self._queue.put_nowait(notification)
+
+        handle = asyncio.get_running_loop().call_later(delay, requeue)
+        self._retries[handle] = notification
+
+    def _cancel_retries(self) -> None:
+        if not self._retries:
+            return
+        for handle in self._retries:
+            handle.cancel()
+        durable = [n for n in self._retries.values() if n.outbox_id is not None]
+        lost = [n.chat_id for n in self._retries.values() if n.outbox_id is None]
+        self._retries.clear()
+        if durable:
+            logger.warning(f"Остановка: {len(durable)} уведомлений ждали повтора, вернутся из outbox после аренды")
+        if lost:
+            self.stats.failed += len(lost)
+            logger.error(f"Остановка: {len(lost)} уведомлений ждали повтора и потеряны, чаты {lost}")
+
+    async def _forget(self, notification: Notification) -> None:
+        if notification.outbox_id is not None:
+            await self.outbox_dao.delete_notification(notification.outbox_id)
+
+    async def _poll_outbox(self) -> None:
+        while True:
+            try:
+                for row in await self.outbox_dao.claim_due(limit=100, lease_seconds=self.lease_seconds):
+                    self._queue.put_nowait(
+                        Notification(
+                            chat_id=row.chat_id,
+                            text=row.text,
+                            reply_markup=row.reply_markup,
+                            outbox_id=row.id,
+                            attempts=row.attempts,
+                        )
+                    )
+            except Exception:
+                logger.exception("Не удалось разобрать notification_outbox")
+            await asyncio.sleep(self.poll_interval)
@@ -1,6 +1,7 @@
 from aiogram.types import Message, ReplyKeyboardRemove
 
-from src.bot.keyboards.swipe import get_swipe_keyboard
+from src.bot.keyboards.swipe import get_more_matches_keyboard, get_search_only_keyboard, get_swipe_keyboard
+from src.bot.models.responses import MatchCard, MatchesPage
 from src.bot.models.user import Users
 
 
@@ -30,9 +31,41 @@ class SwipePresenter:
         """Сообщение 'Ты кому-то понравился'"""
         return "❤️ Ты кому-то понравился!\n\nПоказать кто это?"
 
+    @staticmethod
+    def format_likes_notification(count: int) -> str:
+        """Одно сообщение на несколько лайков, пришедших за окно агрегации"""
+        if count == 1:
+            return SwipePresenter.format_like_notification()
+        if count % 10 == 1 and count % 100 != 11:
+            likes = "новый лайк"
+        elif count % 10 in (2, 3, 4) and count % 100 not in (12, 13, 14):
+            likes = "новых лайка"
+        else:
+            likes = "новых лайков"
+        return f"❤️ У тебя {count} {likes}!\n\nПоказать, кто это?"
+
     @staticmethod
     async def send_no_profiles_message(message: Message):
         """Сообщение когда анкеты закончились"""
         text = "😔 К сожалению, подходящих анкет пока нет. Попробуй позже!"
 
         await message.answer(text, reply_markup=ReplyKeyboardRemove())
+
+    @staticmethod
+    def format_match_card(card: MatchCard) -> str:
+        """Одна строка списка мэтчей"""
+        username = f"@{card.username}" if card.username else "без username"
+        return f"{card.name}, {card.age}, {card.city} — {username} ({card.matched_at:%d.%m.%Y})"
+
+    @staticmethod
+    async def send_matches_page(message: Message, page: MatchesPage, first_page: bool):
+        """Отправка страницы мэтчей"""
+        if not page.cards:
+            text = "У тебя пока нет мэтчей 😔" if first_page else "Больше мэтчей нет"
+            await message.answer(text, reply_markup=get_search_only_keyboard())
+            return
+
+        lines = [SwipePresenter.format_match_card(card) for card in page.cards]
+        header = "🔥 Твои мэтчи:\n\n" if first_page else ""
+        keyboard = get_more_matches_keyboard() if page.next_cursor else get_search_only_keyboard()
+        await message.answer(header + "\n".join(lines), reply_markup=keyboard)
@@ -1,5 +1,6 @@
 from aiogram.types import Message, ReplyKeyboardRemove
 
+from src.bot.llm_service.prompt_templates.schemas import ProfileCheck
 from src.bot.models.user import Users
 from src.bot.presenters.swipe import SwipePresenter
 
@@ -14,3 +15,18 @@ class UserProfilePresenter(SwipePresenter):
             photo=profile.photo_id,
             caption=profile_text,
         )
+
+    @staticmethod
+    def format_moderation_verdict(verdict: ProfileCheck) -> str:
+        """Итог модерации анкеты для её владельца"""
+        if verdict.is_valid:
+            return "✅ Анкета прошла модерацию и теперь видна в поиске!"
+        reasons = []
+        if verdict.spam:
+            reasons.append("реклама или контакты")
+        if verdict.nsfw:
+            reasons.append("откровенный контент")
+        if verdict.toxicity >= 0.5:
+            reasons.append("оскорбления")
+        reason = f" ({', '.join(reasons)})" if reasons else ""
+        return f"❌ Анкета не прошла модерацию{reason}.\n\nИсправь её через /my_profile и она снова уйдёт на проверку."
@@ -1,22 +1,39 @@
 # src/bot/services/__init__.py
-from src.bot.dao.like import LikesDAO, MatchesDAO
+from src.bot.dao.like import LikesDAO, LikesInboxDAO, MatchesDAO
+from src.bot.dao.moderation import ModerationJobsDAO
 from src.bot.dao.report import ReportsDAO
 from src.bot.dao.user import UsersDAO
+from src.bot.services.dislike_buffer import DislikeBuffer
 from src.bot.services.questionnaire import QuestionnaireProcessService
 from src.bot.services.swipe import SwipeService
 from src.bot.services.user_profile import UserProfileService
+from src.config import settings
 
 
 def get_questionnaire_service() -> QuestionnaireProcessService:
     """Фабрика для создания сервиса опросника"""
-    return QuestionnaireProcessService(users_dao=UsersDAO)
+    return QuestionnaireProcessService(users_dao=UsersDAO, moderation_jobs_dao=ModerationJobsDAO)
 
 
 def get_swipe_service() -> SwipeService:
     """Фабрика для создания сервиса свайпов"""
-    return SwipeService(likes_dao=LikesDAO, matches_dao=MatchesDAO, users_dao=UsersDAO, reports_dao=ReportsDAO)
+    dislike_buffer = None
+    if settings.DISLIKE_BUFFER:
+        dislike_buffer = DislikeBuffer(
+            likes_dao=LikesDAO, max_rows=settings.DISLIKE_BUFFER_MAX_ROWS, max_delay=settings.DISLIKE_BUFFER_MAX_DELAY
+        )
+    return SwipeService(
+        likes_dao=LikesDAO,
+        matches_dao=MatchesDAO,
+        users_dao=UsersDAO,
+        reports_dao=ReportsDAO,
+        inbox_dao=LikesInboxDAO,
+        dislike_buffer=dislike_buffer,
+    )
 
 
 def get_user_profile_service() -> UserProfileService:
     """Фабрика для создания сервиса свайпов"""
-    return UserProfileService(likes_dao=LikesDAO, matches_dao=MatchesDAO, users_dao=UsersDAO, reports_dao=ReportsDAO)
+    return UserProfileService(
+        likes_dao=LikesDAO, matches_dao=MatchesDAO, users_dao=UsersDAO, reports_dao=ReportsDAO, inbox_dao=LikesInboxDAO
+    )
@@ -0,0 +1,136 @@
+# src/bot/services/candidate_queue.py
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from src.bot.models.user import Users
+from src.core.database import run_detached
+
+logger = logging.getLogger(__name__)
+
+# loader(user_id, after_id, limit) -> следующие анкеты с users.id > after_id, страница как есть из БД
+CandidateLoader = Callable[[int, int, int], Awaitable[list[Users]]]
+# exclude(user_id) -> tg_id анкет, которые в ленту не кладём (например, дизлайк ещё в буфере)
+CandidateExclude = Callable[[int], set[int]]
+
+
+@dataclass
+class _Feed:
+    """Состояние ленты одного пользователя"""
+
+    buffer: deque[Users] = field(default_factory=deque)
+    # Курсор keyset-пагинации: users.id последней загруженной анкеты.
+    # Всё, что уже лежит в буфере или показано, имеет id <= cursor и повторно не загрузится
+    cursor: int = 0
+    refill_task: asyncio.Task | None = None
+    exhausted: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class CandidateQueue:
+    """
+    Буфер заранее загруженных анкет для ленты каждого пользователя.
+
+    На каждый свайп анкета берётся из памяти, а когда в буфере остаётся меньше
+    low_water анкет, следующая пачка подгружается в фоне одним запросом.
+    Пачки идут по курсору users.id, поэтому новые анкеты подхватываются сами.
+    Данные в буфере могут немного устареть (анкету могли выключить после загрузки) —
+    /search сбрасывает буфер и курсор и загружает ленту заново.
+    Курсор и признак конца ленты считаются по странице загрузчика целиком, а анкеты из exclude отсеиваются
+    уже здесь: отсеянные строки не останавливают дозагрузку и не выдают конец ленты раньше времени.
+    """
+
+    def __init__(
+        self,
+        loader: CandidateLoader,
+        batch_size: int,
+        low_water: int,
+        max_users: int,
+        exclude: CandidateExclude | None = None,
+    ):
+        self.loader = loader
+        self.exclude = exclude
+        self.batch_size = batch_size
+        self.low_water = low_water
+        self.max_users = max_users
+        self._feeds: OrderedDict[int, _Feed] = OrderedDict()
+
+    def _get_feed(self, user_id: int) -> _Feed:
+        feed = self._feeds.get(user_id)
+        if feed is None:
+            feed = _Feed()
+            self._feeds[user_id] = feed
+            # Ограничиваем память: выбрасываем ленты давно неактивных пользователей
+            while len(self._feeds) > self.max_users:
+                _, stale = self._feeds.popitem(last=False)
+                if stale.refill_task:
+                    stale.refill_task.cancel()
+        else:
+            self._feeds.move_to_end(user_id)
+        return feed
+
+    async def pop(self, user_id: int) -> Users | None:
+        """Следующая анкета из буфера (при пустом буфере — загрузка синхронно)"""
+        feed = self._get_feed(user_id)
+
+        if not feed.buffer:
+            if feed.refill_task and not feed.refill_task.done():
+                await asyncio.wait({feed.refill_task})
+            if not feed.buffer:
+                await self._refill(user_id, feed)
+            # Пачка могла отсеяться целиком — идём дальше по курсору, пока лента не кончится
+            while not feed.buffer and not feed.exhausted:
+                await self._refill(user_id, feed)
+
+        if not feed.buffer:
+            return None
+
+        profile = feed.buffer.popleft()
+
+        if len(feed.buffer) < self.low_water and not feed.exhausted:
+            self._schedule_refill(user_id, feed)
+
+        return profile
+
+    def discard(self, user_id: int, profile_id: int) -> None:
+        """Анкета оценена — убираем её из буфера"""
+        feed = self._feeds.get(user_id)
+        if feed is None:
+            return
+        if any(profile.tg_id == profile_id for profile in feed.buffer):
+            feed.buffer = deque(profile for profile in feed.buffer if profile.tg_id != profile_id)
+
+    def reset(self, user_id: int) -> None:
+        """Сбросить ленту пользователя (например, при новом /search)"""
+        feed = self._feeds.pop(user_id, None)
+        if feed and feed.refill_task:
+            feed.refill_task.cancel()
+
+    def _schedule_refill(self, user_id: int, feed: _Feed) -> None:
+        if feed.refill_task and not feed.refill_task.done():
+            return
+        # Дозагрузка переживает апдейт, поэтому работает со своими сессиями, а не с unit of work апдейта
+        feed.refill_task = run_detached(self._background_refill(user_id, feed))
+
+    async def _background_refill(self, user_id: int, feed: _Feed) -> None:
+        try:
+            await self._refill(user_id, feed)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(f"Не удалось дозагрузить ленту пользователя {user_id}")
+
+    async def _refill(self, user_id: int, feed: _Feed) -> None:
+        async with feed.lock:
+            profiles = await self.loader(user_id, feed.cursor, self.batch_size)
+
+            feed.exhausted = len(profiles) < self.batch_size
+            excluded = self.exclude(user_id) if self.exclude else set()
+            for profile in profiles:
+                if profile.id > feed.cursor:
+                    feed.cursor = profile.id
+                    if profile.tg_id not in excluded:
+                        feed.buffer.append(profile)
@@ -0,0 +1,131 @@
+# src/bot/services/dislike_buffer.py
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.bot.dao.like import LikesDAO
+from src.core.database import run_detached
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DislikeBufferStats:
+    dislikes: int = 0
+    flushes: int = 0
+    written: int = 0
+    failed_flushes: int = 0
+    max_batch: int = 0
+
+
+class DislikeBuffer:
+    """
+    Отложенная запись дизлайков: вместо транзакции на каждый свайп они копятся в памяти
+    и пишутся одним многострочным запросом раз в max_delay секунд или по набору max_rows штук.
+
+    Пока дизлайк не записан, он виден через pending_targets — лента и входящие лайки
+    не покажут эту анкету снова. Неудачная запись возвращает пачку в буфер до следующей попытки;
+    при остановке бота stop() дописывает всё накопленное. Дизлайки, не записанные до падения процесса, теряются.
+    """
+
+    def __init__(self, likes_dao: type[LikesDAO], max_rows: int, max_delay: float):
+        self.likes_dao = likes_dao
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.stats = DislikeBufferStats()
+        self._pending: dict[tuple[int, int], datetime] = {}
+        self._in_flight: dict[tuple[int, int], datetime] = {}
+        self._targets: dict[int, set[int]] = {}
+        self._full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: asyncio.Task | None = None
+
+    async def add(self, from_user_id: int, to_user_id: int) -> None:
+        self.stats.dislikes += 1
+        self._pending[(from_user_id, to_user_id)] = datetime.utcnow()
+        self._targets.setdefault(from_user_id, set()).add(to_user_id)
+
+        if self._flusher is None or self._flusher.done():
+            self._flusher = run_detached(self._run())
+        if len(self._pending) >= self.max_rows:
+            self._full.set()
+        if len(self._pending) >= self.max_rows * 10:
+            # БД не успевает — притормаживаем свайпы, а не копим память без предела
+            await run_detached(self.flush())
+
+    def pending_targets(self, user_id: int) -> set[int]:
+        """Кого пользователь уже дизлайкнул, но ещё не записано в БД"""
+        return self._targets.get(user_id, set())
+
+    async def withdraw(self, from_user_id: int, to_user_id: int) -> None:
+        """
+        Пользователь переоценил анкету — незаписанный дизлайк выбрасывается.
+        Если он уже пишется, ждём окончания записи, чтобы новая оценка легла поверх.
+        """
+        pair = (from_user_id, to_user_id)
+        if self._pending.pop(pair, None) is not None and pair not in self._in_flight:
+            self._forget_target(pair)
+        if pair in self._in_flight:
+            async with self._flush_lock:
+                pass
+            # Неудачная запись могла вернуть дизлайк в буфер
+            if self._pending.pop(pair, None) is not None:
+                self._forget_target(pair)
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            self._in_flight, self._pending = self._pending, {}
+            batch = [(*pair, rated_at) for pair, rated_at in self._in_flight.items()]
+            try:
+                written = await self.likes_dao.add_dislikes(batch)
+            except Exception:
+                self.stats.failed_flushes += 1
+                logger.exception(f"Не удалось записать {len(batch)} дизлайков, повторим со следующей пачкой")
+                for pair, rated_at in self._in_flight.items():
+                    self._pending.setdefault(pair, rated_at)
+                return
+            finally:
+                in_flight, self._in_flight = self._in_flight, {}
+
+            for pair in in_flight:
+                if pair not in self._pending:
+                    self._forget_target(pair)
+            self.stats.flushes += 1
+            self.stats.written += written
+            self.stats.max_batch = max(self.stats.max_batch, len(batch))
+
+    async def stop(self) -> None:
+        if self._flusher:
+            # Под блокировкой — чтобы не прервать запись пачки на середине
+            async with self._flush_lock:
+                self._flusher.cancel()
+                await asyncio.gather(self._flusher, return_exceptions=True)
+        await self.flush()
+        if self._pending:
+            logger.error(f"Остановка: не записано дизлайков {len(self._pending)}")
+        logger.info(
+            f"Дизлайки: {self.stats.dislikes}, записано {self.stats.written} за {self.stats.flushes} запросов "
+            f"(макс. пачка {self.stats.max_batch}), неудачных записей {self.stats.failed_flushes}"
+        )
+
+    def _forget_target(self, pair: tuple[int, int]) -> None:
+        from_user_id, to_user_id = pair
+        targets = self._targets.get(from_user_id)
+        if targets is None:
+            return
+        targets.discard(to_user_id)
+        if not targets:
+            del self._targets[from_user_id]
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.max_delay)
+            except TimeoutError:
+                pass
+            self._full.clear()
+            await self.flush()
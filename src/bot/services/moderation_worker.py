@@ -0,0 +1,141 @@
+# src/bot/services/moderation_worker.py
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from src.bot.dao.moderation import ModerationJobsDAO, on_moderation_jobs
+from src.bot.dao.user import UsersDAO
+from src.bot.enum.moderation import ModerationStatus
+from src.bot.llm_service.moderation import ModerationService
+from src.bot.llm_service.prompt_templates.schemas import DegradedProfileCheck
+from src.bot.models.moderation import ModerationJob
+from src.bot.notifications.worker import NotificationWorker
+from src.bot.presenters.user_profile import UserProfilePresenter
+from src.core.database import unit_of_work
+
+# Пауза повтора растёт вдвое с каждой попыткой, но не дольше часа
+MAX_RETRY_DELAY = 3600
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModerationWorkerStats:
+    approved: int = 0
+    rejected: int = 0
+    retried: int = 0  # LLM недоступна — анкета осталась pending до повтора
+    stale: int = 0  # пока шла проверка, анкету заменили
+    errors: int = 0
+
+
+class ModerationWorker:
+    """
+    Фоновая модерация анкет из moderation_jobs.
+
+    Задачи забираются пачками с арендой на lease_seconds (SKIP LOCKED — несколько процессов не мешают друг другу)
+    и разбираются concurrency задачами, так что одновременные проверки собираются батчером в общие запросы к LLM.
+    Вердикт, снятие задачи и уведомление владельцу коммитятся вместе; вердикт по уже заменённой анкете
+    отбрасывается. Если LLM недоступна (DegradedProfileCheck), анкета остаётся pending и проверяется позже
+    с растущей паузой. Задачу упавшего процесса подберёт любой другой после окончания аренды.
+    """
+
+    def __init__(
+        self,
+        jobs_dao: type[ModerationJobsDAO],
+        users_dao: type[UsersDAO],
+        moderation: ModerationService,
+        presenter: UserProfilePresenter,
+        notifications: NotificationWorker,
+        concurrency: int,
+        lease_seconds: float,
+        retry_delay: float,
+        poll_interval: float,
+    ):
+        self.jobs_dao = jobs_dao
+        self.users_dao = users_dao
+        self.moderation = moderation
+        self.presenter = presenter
+        self.notifications = notifications
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self.stats = ModerationWorkerStats()
+        # Очередь размером с пул: пока все заняты, новые задачи не арендуются впустую
+        self._queue: asyncio.Queue[ModerationJob] = asyncio.Queue(maxsize=concurrency)
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        on_moderation_jobs(self._wakeup.set)
+
+    async def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._poll()))
+
+    async def stop(self) -> None:
+        """Недоделанные задачи останутся в moderation_jobs и вернутся в работу после аренды"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        logger.info(
+            f"Модерация анкет: одобрено {self.stats.approved}, отклонено {self.stats.rejected}, "
+            f"отложено {self.stats.retried}, устарело {self.stats.stale}, ошибок {self.stats.errors}"
+        )
+
+    async def _poll(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                jobs = await self.jobs_dao.claim_due(limit=self.concurrency, lease_seconds=self.lease_seconds)
+            except Exception:
+                logger.exception("Не удалось забрать задачи модерации")
+                jobs = []
+            for job in jobs:
+                await self._queue.put(job)
+
+            if len(jobs) < self.concurrency:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except TimeoutError:
+                    pass
+
+    async def _consume(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._moderate(job)
+            except Exception:
+                self.stats.errors += 1
+                logger.exception(f"Ошибка модерации анкеты {job.tg_id}")
+            finally:
+                self._queue.task_done()
+
+    async def _moderate(self, job: ModerationJob) -> None:
+        verdict = await self.moderation.moderate_profile(job.profile_text)
+        if isinstance(verdict, DegradedProfileCheck):
+            await self._retry_later(job)
+            return
+
+        status = ModerationStatus.APPROVED if verdict.is_valid else ModerationStatus.REJECTED
+        async with unit_of_work():
+            if not await self.jobs_dao.complete(job.tg_id, job.version):
+                self.stats.stale += 1
+                return
+            user = await self.users_dao.set_moderation_status(job.tg_id, status)
+            if user is None:
+                # Анкету удалили, пока она ждала проверки
+                return
+            await self.notifications.enqueue(job.tg_id, self.presenter.format_moderation_verdict(verdict))
+
+        if status == ModerationStatus.APPROVED:
+            self.stats.approved += 1
+        else:
+            self.stats.rejected += 1
+
+    async def _retry_later(self, job: ModerationJob) -> None:
+        attempts = job.attempts + 1
+        delay = min(self.retry_delay * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+        self.stats.retried += 1
+        logger.warning(f"LLM недоступна, анкета {job.tg_id} остаётся на модерации (попытка {attempts})")
+        await self.jobs_dao.reschedule(job.tg_id, job.version, attempts, datetime.utcnow() + timedelta(seconds=delay))
@@ -3,20 +3,24 @@
 
 from aiogram.fsm.context import FSMContext
 
+from src.bot.dao.moderation import ModerationJobsDAO
 from src.bot.dao.user import UsersDAO
 from src.bot.enum.gender import Gender
+from src.bot.enum.moderation import ModerationStatus
 from src.bot.models.responses import AgeResponse, GenderResponse
 from src.bot.states.form_states import FormStates
+from src.core.database import commit_unit_of_work
 from src.logger import logger
 
 
 class QuestionnaireProcessService:
-    def __init__(self, users_dao: UsersDAO):
+    def __init__(self, users_dao: UsersDAO, moderation_jobs_dao: type[ModerationJobsDAO]):
         self.users_dao = users_dao
+        self.moderation_jobs_dao = moderation_jobs_dao
 
     async def process_name(self, name: str, state: FSMContext) -> str:
         """Обработка имени"""
-        logger.info(f"Обработка имени: {name}")
+        logger.info("Обработка имени: {}", name)
         cleaned_name = name.strip()
         await state.update_data(name=cleaned_name)
         await state.set_state(FormStates.waiting_for_age)
@@ -24,42 +28,42 @@ class QuestionnaireProcessService:
 
     async def process_age(self, age_text: str, state: FSMContext) -> AgeResponse:
         """Обработка возраста"""
-        logger.info(f"Обработка возраста: {age_text}")
+        logger.info("Обработка возраста: {}", age_text)
         try:
             age = int(age_text.strip())
             if age < 10 or age > 100:
-                logger.warning(f"Некорректный возраст: {age}")
+                logger.warning("Некорректный возраст: {}", age)
                 return AgeResponse(success=False, message="Пожалуйста, введите реальный возраст (10-100):")
 
             await state.update_data(age=age)
             await state.set_state(FormStates.waiting_for_gender)
-            logger.debug(f"Возраст {age} принят")
+            logger.debug("Возраст {} принят", age)
             return AgeResponse(success=True, message="age_processed")
 
         except ValueError:
-            logger.warning(f"Нечисловой возраст: {age_text}")
+            logger.warning("Нечисловой возраст: {}", age_text)
             return AgeResponse(success=False, message="Пожалуйста, введите число:")
 
     async def process_gender(self, gender_text: str, state: FSMContext) -> GenderResponse:
         """Обработка пола"""
-        logger.info(f"Обработка пола: {gender_text}")
+        logger.info("Обработка пола: {}", gender_text)
 
         if gender_text == Gender.get_display_name(Gender.MALE):
             gender = Gender.MALE
         elif gender_text == Gender.get_display_name(Gender.FEMALE):
             gender = Gender.FEMALE
         else:
-            logger.warning(f"Неизвестный пол: {gender_text}")
+            logger.warning("Неизвестный пол: {}", gender_text)
             return GenderResponse(success=False, message="Пожалуйста, выбери пол из предложенных вариантов:")
 
         await state.update_data(user_gender=gender)
         await state.set_state(FormStates.waiting_for_gender_interest)
-        logger.debug(f"Пол {gender} принят")
+        logger.debug("Пол {} принят", gender)
         return GenderResponse(success=True, message="gender_processed")
 
     async def process_gender_interest(self, gender_interest_text: str, state: FSMContext) -> GenderResponse:
         """Обработка предпочтений по полу"""
-        logger.info(f"Обработка gender_interest: {gender_interest_text}")
+        logger.info("Обработка gender_interest: {}", gender_interest_text)
 
         if gender_interest_text == Gender.get_display_gender_interest(Gender.MALE):
             gender_interest = Gender.MALE
@@ -68,21 +72,21 @@ class QuestionnaireProcessService:
         elif gender_interest_text == Gender.get_display_gender_interest(Gender.SKIP_GENDER):
             gender_interest = Gender.SKIP_GENDER
         else:
-            logger.warning(f"Неизвестный gender_interest: {gender_interest_text}")
+            logger.warning("Неизвестный gender_interest: {}", gender_interest_text)
             return GenderResponse(success=False, message="Пожалуйста, выбери из предложенных вариантов:")
 
         await state.update_data(gender_interest=gender_interest)
         await state.set_state(FormStates.waiting_for_city)
-        logger.debug(f"Gender interest {gender_interest} принят")
+        logger.debug("Gender interest {} принят", gender_interest)
         return GenderResponse(success=True, message="gender_interest_processed")
 
     async def process_city(self, city: str, state: FSMContext) -> str:
         """Обработка города"""
-        logger.info(f"Обработка города: {city}")
+        logger.info("Обработка города: {}", city)
         cleaned_city = city.strip()
         await state.update_data(city=cleaned_city)
         await state.set_state(FormStates.waiting_for_interests)
-        logger.debug(f"Город {cleaned_city} принят")
+        logger.debug("Город {} принят", cleaned_city)
         return "Расскажи о своих интересах (хобби, увлечения):"
 
     async def process_interests(self, interests: str, state: FSMContext) -> str:
@@ -94,8 +98,12 @@ class QuestionnaireProcessService:
         return "📸 Отправь своё фото для профиля\n\nЭто поможет другим пользователям узнать тебя лучше!\n"
 
     async def complete_questionnaire(self, photo_id: str, user_id: int, state: FSMContext) -> tuple[str, str]:
-        """Завершение опроса и сохранение данных"""
-        logger.info(f"Завершение опроса для пользователя {user_id}")
+        """
+        Завершение опроса и сохранение данных.
+        Анкета сохраняется в статусе pending и ставится в очередь модерации в той же транзакции —
+        LLM пользователь не ждёт, а в ленту анкета попадёт после одобрения.
+        """
+        logger.info("Завершение опроса для пользователя {}", user_id)
 
         form_data = await state.get_data()
         # Сохраняем в базу
@@ -108,12 +116,14 @@ class QuestionnaireProcessService:
             city=form_data.get("city"),
             interests=form_data.get("interests"),
             photo_id=photo_id,
+            moderation_status=ModerationStatus.PENDING.value,
         )
-
-        await state.clear()
-        logger.info(f"Опрос завершен для пользователя {user_id}")
-
         caption = (
             f"{form_data.get('name')}, {form_data.get('age')}, {form_data.get('city')} – {form_data.get('interests')}"
         )
+        await self.moderation_jobs_dao.enqueue(user_id, caption)
+        await commit_unit_of_work()
+
+        await state.clear()
+        logger.info("Опрос завершен для пользователя {}", user_id)
         return caption, photo_id
@@ -0,0 +1,112 @@
+# src/bot/services/report_triage.py
+
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.bot.dao.report import ReportsDAO
+from src.bot.dao.user import UsersDAO
+from src.bot.llm_service.report_check import ReportCommentChecker
+from src.core.database import unit_of_work
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReportTriageStats:
+    batches: int = 0
+    accepted: int = 0
+    dismissed: int = 0
+    deferred: int = 0  # LLM недоступна — жалоба ждёт следующего прохода
+    errors: int = 0
+
+
+class ReportTriageWorker:
+    """
+    Фоновый разбор жалоб пачками.
+
+    Проход арендует до batch_size самых старых неразобранных жалоб на lease_seconds (SKIP LOCKED отдаёт другому
+    процессу следующую пачку) и проверяет их комментарии разом, одинаковые — один раз. Проверка идёт вне транзакции:
+    ни блокировки, ни соединение из пула не ждут LLM.
+    Проверка своя, не модерация анкет: цитата рекламы или телефона из анкеты — довод жалобы, а не нарушение.
+    Жалоба, чей комментарий сам спам или оскорбление без сути, закрывается без учёта, остальные группируются
+    по target_user_id и прибавляются к users.report_count одним запросом; reviewed_at ставится в той же короткой
+    транзакции. Если LLM недоступна, жалобы с непроверенным комментарием вернутся в разбор после аренды.
+    """
+
+    def __init__(
+        self,
+        reports_dao: type[ReportsDAO],
+        users_dao: type[UsersDAO],
+        checker: ReportCommentChecker,
+        batch_size: int,
+        lease_seconds: float,
+        poll_interval: float,
+    ):
+        self.reports_dao = reports_dao
+        self.users_dao = users_dao
+        self.checker = checker
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.stats = ReportTriageStats()
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        logger.info(
+            f"Жалобы: учтено {self.stats.accepted}, отклонено {self.stats.dismissed} в {self.stats.batches} пачках, "
+            f"отложено {self.stats.deferred}, ошибок {self.stats.errors}"
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                reviewed = await self.triage_batch()
+            except Exception:
+                self.stats.errors += 1
+                logger.exception("Не удалось разобрать пачку жалоб")
+                reviewed = 0
+            if reviewed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def triage_batch(self) -> int:
+        """Один проход; возвращает число разобранных жалоб"""
+        reports = await self.reports_dao.claim_unreviewed(limit=self.batch_size, lease_seconds=self.lease_seconds)
+        if not reports:
+            return 0
+
+        comments = list({report.comment.strip() for report in reports if report.comment and report.comment.strip()})
+        results = await asyncio.gather(*(self.checker.check(comment) for comment in comments))
+        verdicts = dict(zip(comments, results))
+
+        accepted, dismissed = [], []
+        for report in reports:
+            comment = (report.comment or "").strip()
+            verdict = verdicts.get(comment)
+            if comment and verdict is None:
+                self.stats.deferred += 1
+            elif not comment or verdict.is_genuine:
+                # Жалоба без комментария учитывается как есть
+                accepted.append(report.id)
+            else:
+                dismissed.append(report.id)
+        if not accepted and not dismissed:
+            return 0
+
+        async with unit_of_work():
+            targets = await self.reports_dao.mark_reviewed(accepted, dismissed, reviewed_at=datetime.utcnow())
+            if targets:
+                await self.users_dao.increment_report_counts(dict(Counter(targets)))
+
+        self.stats.batches += 1
+        self.stats.accepted += len(targets)
+        self.stats.dismissed += len(dismissed)
+        return len(accepted) + len(dismissed)
@@ -1,133 +1,153 @@
 # src/bot/services/swipe.py
 
 import logging
+from datetime import datetime
 
-from src.bot.dao.like import LikesDAO, MatchesDAO
+from src.bot.dao.like import LikesDAO, LikesInboxDAO, MatchesDAO
 from src.bot.dao.report import ReportsDAO
 from src.bot.dao.user import UsersDAO
-from src.bot.models.responses import DislikeProcessResult, LikeProcessResult, MatchWithDetails
+from src.bot.models.responses import DislikeProcessResult, LikeProcessResult, MatchesPage
 from src.bot.models.user import Users
+from src.bot.services.candidate_queue import CandidateQueue
+from src.bot.services.dislike_buffer import DislikeBuffer
+from src.config import settings
+from src.core.database import commit_unit_of_work
 
 logger = logging.getLogger(__name__)
 
 
 class SwipeService:
-    def __init__(self, likes_dao: LikesDAO, matches_dao: MatchesDAO, users_dao: UsersDAO, reports_dao: ReportsDAO):
+    def __init__(
+        self,
+        likes_dao: LikesDAO,
+        matches_dao: MatchesDAO,
+        users_dao: UsersDAO,
+        reports_dao: ReportsDAO,
+        inbox_dao: LikesInboxDAO,
+        dislike_buffer: DislikeBuffer | None = None,
+    ):
         self.likes_dao = likes_dao
         self.matches_dao = matches_dao
         self.users_dao = users_dao
         self.reports_dao = reports_dao
+        self.inbox_dao = inbox_dao
+        self.dislike_buffer = dislike_buffer
+        self.candidate_queue = CandidateQueue(
+            loader=self._load_candidates,
+            batch_size=settings.CANDIDATE_BATCH_SIZE,
+            low_water=settings.CANDIDATE_LOW_WATER,
+            max_users=settings.CANDIDATE_MAX_USERS,
+            # Дизлайк, который ещё в буфере и не дошёл до БД, запрос не отсекает
+            exclude=self._pending_dislikes,
+        )
 
-    async def get_next_profile(self, user_id: int) -> Users | None:
+    async def get_next_profile(self, user_id: int, refresh: bool = False) -> Users | None:
+        """Следующая анкета из буфера ленты; refresh=True начинает ленту заново"""
+        if refresh:
+            self.candidate_queue.reset(user_id)
+        profile = await self.candidate_queue.pop(user_id)
+        # Загрузка ленты может включить анкету обратно — фиксируем до отправки анкеты
+        await commit_unit_of_work()
+        return profile
+
+    async def _load_candidates(self, user_id: int, after_id: int, limit: int) -> list[Users]:
+        """Загрузка пачки анкет в буфер ленты"""
         # 1. Получаем текущего пользователя
         status = await self.users_dao.get_status_of_questionnaire(user_id)
         if status == False:
             await self.users_dao.set_status_questionnaire_true(user_id)
         current_user = await self.users_dao.get_by_tg_id(user_id)
         if not current_user:
-            logger.error(f"Пользователь {user_id} не найден")
-            return None
-
-        # 2. Получаем ID всех уже оценённых пользователей (лайк или дизлайк)
-        rated_user_ids = await self.likes_dao.get_rated_user_ids(user_id)
-
-        # 3. Получаем следующую анкету
-        next_profile = await self.users_dao.get_next_profile(
-            user_id=user_id,
-            rated_user_ids=rated_user_ids,
-            gender_interest=current_user.gender_interest,
-        )
-
-        return next_profile
-
-    async def get_profiles_who_liked_me(self, user_id: int) -> list[Users]:
-        """Получить анкеты тех, кто лайкнул меня, но кого я ещё не лайкнул в ответ и не дизлайкнул"""
-        liked_me_ids = await self.likes_dao.get_users_who_liked_me(user_id)
-        if not liked_me_ids:
+            logger.error("Пользователь %s не найден", user_id)
             return []
 
-        liked_back_ids = await self.likes_dao.get_users_i_liked_from_list(
+        # 2. Получаем пачку следующих анкет после курсора (оценённые отсекаются в БД)
+        return await self.users_dao.get_candidates(
             user_id=user_id,
-            other_user_ids=liked_me_ids,
-        )
-
-        disliked_ids = await self.likes_dao.get_users_i_disliked_from_list(
-            user_id=user_id,
-            other_user_ids=liked_me_ids,
+            gender_interest=current_user.gender_interest,
+            after_id=after_id,
+            limit=limit,
         )
 
-        liked_me_set = set(liked_me_ids)
-        liked_back_set = set(liked_back_ids)
-        disliked_set = set(disliked_ids)
+    def _pending_dislikes(self, user_id: int) -> set[int]:
+        return self.dislike_buffer.pending_targets(user_id) if self.dislike_buffer else set()
 
-        to_show_ids = list(liked_me_set - liked_back_set - disliked_set)
+    async def get_next_profile_who_liked_me(self, user_id: int) -> Users | None:
+        """Самая старая анкета из тех, кто лайкнул меня, а я ещё не ответил (ни лайком, ни дизлайком)"""
+        disliked = self._pending_dislikes(user_id)
+        profiles = await self.inbox_dao.get_oldest_senders(user_id, limit=1 + len(disliked))
+        return next((profile for profile in profiles if profile.tg_id not in disliked), None)
 
-        if not to_show_ids:
-            return []
-
-        return await self.users_dao.get_profiles_by_ids(to_show_ids)
+    async def _pick_next_profile(self, user_id: int, viewing_likes: bool) -> Users | None:
+        """Следующая анкета: из входящих лайков или из ленты (чтобы не вынимать анкету из буфера зря)"""
+        if viewing_likes:
+            return await self.get_next_profile_who_liked_me(user_id)
+        return await self.get_next_profile(user_id)
 
-    async def process_like(self, from_user_id: int, to_user_id: int) -> LikeProcessResult:
-        logger.info(f"Лайк от {from_user_id} к {to_user_id}")
+    async def process_like(self, from_user_id: int, to_user_id: int, viewing_likes: bool = False) -> LikeProcessResult:
+        logger.info("Лайк от %s к %s", from_user_id, to_user_id)
 
-        # Добавляем лайк
-        await self.likes_dao.add_like(from_user_id=from_user_id, to_user_id=to_user_id, is_like=True)
+        if self.dislike_buffer:
+            await self.dislike_buffer.withdraw(from_user_id, to_user_id)
+        # Лайк, проверка взаимности и создание мэтча — одна операция в БД
+        registration = await self.likes_dao.register_like(from_user_id, to_user_id, is_like=True)
+        self.candidate_queue.discard(from_user_id, to_user_id)
 
-        target_status = await self.users_dao.get_status_of_questionnaire(to_user_id)
-        can_notify_target = bool(target_status)
+        target_user = registration.target_user
 
-        # Проверяем взаимный лайк
-        is_match = await self.likes_dao.check_mutual_like(from_user_id, to_user_id)
-
-        matched_user = None
-        current_user = await self.users_dao.get_by_tg_id(from_user_id)
+        # Мэтч считаем только если он создан этим лайком — так сообщение о нём уйдёт ровно один раз
+        is_match = registration.match_created
         if is_match:
-            # Создаём мэтч
-            await self.matches_dao.create_match(from_user_id, to_user_id)
-            logger.info(f"🔥 MATCH! {from_user_id} и {to_user_id}")
-
-            matched_user = await self.users_dao.get_by_tg_id(to_user_id)
+            logger.info("🔥 MATCH! %s и %s", from_user_id, to_user_id)
 
         # Получаем следующую анкету
-        next_profile = await self.get_next_profile(from_user_id)
+        next_profile = await self._pick_next_profile(from_user_id, viewing_likes)
+        # Лайк и мэтч фиксируются до того, как пользователь увидит «мэтч»; заодно снимается advisory-блокировка пары
+        await commit_unit_of_work()
 
         return LikeProcessResult(
             is_match=is_match,
-            matched_user=matched_user,
-            current_user=current_user,
+            matched_user=target_user if is_match else None,
+            current_user=registration.current_user,
             next_profile=next_profile,
-            can_notify_target=can_notify_target,
         )
 
-    async def process_dislike(self, from_user_id: int, to_user_id: int) -> DislikeProcessResult:
+    async def process_dislike(
+        self, from_user_id: int, to_user_id: int, viewing_likes: bool = False
+    ) -> DislikeProcessResult:
         """
         Обработка дизлайка
         """
-        logger.info(f"Дизлайк от {from_user_id} к {to_user_id}")
+        logger.info("Дизлайк от %s к %s", from_user_id, to_user_id)
 
-        # Добавляем дизлайк
-        await self.likes_dao.add_like(from_user_id=from_user_id, to_user_id=to_user_id, is_like=False)
+        # Добавляем дизлайк (повторная оценка той же анкеты перезаписывает прежнюю)
+        if self.dislike_buffer:
+            await self.dislike_buffer.add(from_user_id, to_user_id)
+        else:
+            await self.likes_dao.register_like(from_user_id, to_user_id, is_like=False)
+        self.candidate_queue.discard(from_user_id, to_user_id)
 
         # Получаем следующую анкету
-        next_profile = await self.get_next_profile(from_user_id)
+        next_profile = await self._pick_next_profile(from_user_id, viewing_likes)
+        await commit_unit_of_work()
 
         return DislikeProcessResult(next_profile=next_profile)
 
     async def process_report(self, from_user_id: int, to_user_id: int, comment: str):
         """Обработка жалобы"""
-        logger.info(f"Жалоба от {from_user_id} к {to_user_id}")
+        logger.info("Жалоба от %s к %s", from_user_id, to_user_id)
         await self.reports_dao.add_report(reporter_user_id=from_user_id, target_user_id=to_user_id, comment=comment)
-        return
+        await commit_unit_of_work()
 
-    async def get_user_matches_with_details(self, user_id: int) -> list[MatchWithDetails]:
-        """Получить мэтчи с данными пользователей"""
-        matches = await self.matches_dao.get_user_matches(user_id)
-        result: list[MatchWithDetails] = []
+    async def get_matches_page(self, user_id: int, cursor: tuple[datetime, int] | None = None) -> MatchesPage:
+        """Страница мэтчей (от новых к старым); cursor — next_cursor предыдущей страницы"""
+        page_size = settings.MATCHES_PAGE_SIZE
+        # Берём на одну карточку больше, чтобы понять, есть ли следующая страница
+        cards = await self.matches_dao.get_match_cards(user_id, limit=page_size + 1, before=cursor)
 
-        for match in matches:
-            other_id = match.user2_id if match.user1_id == user_id else match.user1_id
-            other_user = await self.users_dao.get_by_tg_id(other_id)
-            if other_user:
-                result.append(MatchWithDetails(user=other_user, match_date=match.created_at))
+        next_cursor = None
+        if len(cards) > page_size:
+            cards = cards[:page_size]
+            next_cursor = (cards[-1].matched_at, cards[-1].match_id)
 
-        return result
+        return MatchesPage(cards=cards, next_cursor=next_cursor)
@@ -8,3 +8,4 @@ class SwipeStates(StatesGroup):
     normal_browsing = State()  # Обычный просмотр анкет
     viewing_likes = State()  # Просмотр тех, кто лайкнул
     reporting = State()  # Состояние для отправки жалобы
+    viewing_matches = State()  # Просмотр списка мэтчей (/matches)
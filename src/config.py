@@ -1,5 +1,7 @@
 from functools import lru_cache
+from typing import Literal
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,23 +13,168 @@ class Settings(BaseSettings):
     DB_NAME: str
     BOT_TOKEN: str
 
+    # Приём апдейтов: polling (getUpdates) или webhook (aiohttp-сервер)
+    BOT_RUN_MODE: Literal["polling", "webhook"] = "polling"
+    WEBHOOK_URL: str | None = None  # публичный адрес, например https://bot.example.com (None — вебхук не регистрируется)
+    WEBHOOK_PATH: str = "/webhook"
+    WEBHOOK_SECRET: str | None = None  # сверяется с заголовком X-Telegram-Bot-Api-Secret-Token; для webhook обязателен
+    WEBHOOK_HOST: str = "0.0.0.0"
+    WEBHOOK_PORT: int = 8080
+
+    # Несколько процессов-обработчиков (1 — всё в одном процессе). Апдейты делятся между ними по user id
+    BOT_WORKERS: int = 1
+    BOT_WORKER_CONCURRENCY: int = 100  # сколько апдейтов один процесс обрабатывает одновременно
+    BOT_WORKER_BACKLOG: int = 1000  # сколько прочитанных из очереди апдейтов процесс держит, включая ждущих своей очереди
+    BOT_WORKER_METRICS_INTERVAL: float = 60
+
+    # Исходящие сообщения: лимиты Telegram (около 30 в секунду на бота и 1 в секунду на чат);
+    # SEND_GLOBAL_RATE — на бота целиком, процессы-обработчики делят его поровну
+    SEND_GLOBAL_RATE: float = 30
+    SEND_CHAT_RATE: float = 1
+    SEND_CHAT_BURST: float = 3
+    SEND_MAX_RETRIES: int = 3
+    SEND_METRICS_INTERVAL: float = 60
+
+    # Пул соединений и asyncpg
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 500  # prepared_statement_cache_size диалекта asyncpg (на соединение)
+    DB_SERVER_SETTINGS: dict[str, str] = {"jit": "off"}
+    DB_WARMUP: bool = True
+
+    # Реплика для чтения (если DB_REPLICA_HOST не задан — всё читается с primary)
+    DB_REPLICA_HOST: str | None = None
+    DB_REPLICA_PORT: int | None = None
+    DB_REPLICA_USER: str | None = None
+    DB_REPLICA_PASS: str | None = None
+    # Сколько секунд после записи пользователь читает только с primary (read-your-writes)
+    DB_REPLICA_PIN_SECONDS: float = 5.0
+
     LOG_LEVEL: str
     LOG_FORMAT: str
     LOG_ROTATION: str
     LOG_RETENTION: str
     LOG_FILE_PATH: str
     LOG_COMPRESSION: str = "gz"
+    # Продакшен-режим логов: JSON через orjson пишет отдельный поток из очереди на LOG_QUEUE_SIZE записей
+    # (переполнение не блокирует, а отбрасывает и считает записи); частые события LOG_HOT_LOGGERS
+    # пишутся выборкой с долей LOG_SAMPLE_RATES по уровню, WARNING и выше — всегда
+    LOG_MODE: Literal["development", "production"] = "development"
+    LOG_QUEUE_SIZE: int = 10_000
+    LOG_HOT_LOGGERS: list[str] = [
+        "src.bot.services.swipe",
+        "src.bot.services.questionnaire",
+        "src.bot.dao.user",
+        "aiogram.event",
+    ]
+    LOG_SAMPLE_RATES: dict[str, float] = {"DEBUG": 0.01, "INFO": 0.1}
 
     API_KEY: str
     BASE_URL: str
     MODEL_NAME: str
+    # Кэш результатов модерации в памяти процесса (второй уровень — таблица moderation_results)
+    MODERATION_CACHE_SIZE: int = 10_000
+    MODERATION_CACHE_TTL: float = 86_400
+    # Микро-пачки запросов модерации (1 — без пачек) и предел одновременных запросов к LLM
+    MODERATION_BATCH_SIZE: int = 16
+    MODERATION_BATCH_WAIT: float = 0.02
+    MODERATION_CONCURRENCY: int = 8
+    # Локальные уровни модерации перед LLM: правила (только отклоняют) и классификатор, который решает сам
+    # при вероятности «отклонить» ниже ACCEPT_BELOW или выше REJECT_ABOVE. Классификатор выключен,
+    # пока его веса обучены только на тестовом корпусе tests/fixtures — включать после обучения на реальных анкетах
+    MODERATION_FAST_PATH: bool = True
+    MODERATION_CLASSIFIER: bool = False
+    MODERATION_ACCEPT_BELOW: float = 0.1
+    MODERATION_REJECT_ABOVE: float = 0.9
+    # Устойчивость вызовов LLM: общий дедлайн, дублирующий запрос в запасной эндпоинт после p95 основного
+    # (пока замеров мало — после HEDGE_DELAY) и предохранитель по ошибкам и медленным вызовам
+    MODERATION_TIMEOUT: float = 5
+    MODERATION_HEDGE_DELAY: float = 1.0
+    MODERATION_BREAKER_WINDOW: int = 20
+    MODERATION_BREAKER_MIN_CALLS: int = 10
+    MODERATION_BREAKER_FAILURE_RATE: float = 0.5
+    MODERATION_SLOW_CALL_SECONDS: float = 3.0
+    MODERATION_BREAKER_OPEN_SECONDS: float = 30
+    # Запасной эндпоинт (тот же API-ключ); без BASE_URL дублирующих запросов нет
+    MODERATION_FALLBACK_BASE_URL: str | None = None
+    MODERATION_FALLBACK_MODEL_NAME: str | None = None
+    # Вердикт, когда LLM недоступна: пропустить анкету или отклонить
+    MODERATION_DEGRADED_ALLOW: bool = True
+    # Очередь модерации анкет: обработчиков в процессе, аренда задачи, первая пауза повтора при недоступной LLM
+    # (дальше удваивается) и период опроса очереди, если новых задач в этом процессе не было
+    MODERATION_WORKERS: int = 8
+    MODERATION_LEASE_SECONDS: float = 60
+    MODERATION_RETRY_DELAY: float = 30
+    MODERATION_QUEUE_POLL_INTERVAL: float = 5
+    # Разбор жалоб: пачка за проход, аренда пачки, пауза, когда разбирать нечего,
+    # и сколько учтённых жалоб убирают анкету из ленты
+    REPORT_TRIAGE_BATCH_SIZE: int = 100
+    REPORT_TRIAGE_LEASE_SECONDS: float = 60
+    REPORT_TRIAGE_POLL_INTERVAL: float = 30
+    REPORT_HIDE_THRESHOLD: int = 5
+
+    # Лента анкет: сколько кандидатов подгружать за раз и когда дозагружать
+    CANDIDATE_BATCH_SIZE: int = 20
+    CANDIDATE_LOW_WATER: int = 5
+    CANDIDATE_MAX_USERS: int = 10_000
+    MATCHES_PAGE_SIZE: int = 10
+    # Отложенная запись дизлайков пачками: не реже раза в MAX_DELAY секунд или по набору MAX_ROWS штук
+    DISLIKE_BUFFER: bool = False
+    DISLIKE_BUFFER_MAX_ROWS: int = 200
+    DISLIKE_BUFFER_MAX_DELAY: float = 0.05
+    # За сколько секунд лайки одному получателю собираются в одно уведомление
+    LIKE_NOTIFICATION_WINDOW: float = 60
+
+    # Фоновая отправка уведомлений; NOTIFY_OUTBOX=true — ещё и через таблицу notification_outbox (переживает падение)
+    NOTIFY_CONCURRENCY: int = 4
+    NOTIFY_MAX_ATTEMPTS: int = 5
+    NOTIFY_OUTBOX: bool = False
+    NOTIFY_LEASE_SECONDS: float = 60
+    NOTIFY_OUTBOX_POLL_INTERVAL: float = 30
 
-    model_config = SettingsConfigDict(env_file=".env")
+    # Потребители swipe_events: размер пачки, как часто проверять события других процессов,
+    # и старше скольких секунд события не превращаются в уведомления (при переигрывании)
+    EVENTS_BATCH_SIZE: int = 100
+    EVENTS_POLL_INTERVAL: float = 1
+    EVENTS_NOTIFY_MAX_AGE: float = 3600
+
+    # Кэш анкет по tg_id: none — только память процесса, memory/redis — плюс общий кэш для нескольких процессов
+    PROFILE_CACHE_SIZE: int = 10_000
+    PROFILE_CACHE_TTL: float = 60
+    PROFILE_CACHE_BACKEND: Literal["none", "memory", "redis"] = "none"
+    PROFILE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Хранилище FSM: memory — в памяти процесса, redis — общее для нескольких процессов, шардируется по чату
+    FSM_STORAGE: Literal["memory", "redis"] = "memory"
+    FSM_REDIS_URLS: list[str] = ["redis://localhost:6379/1"]
+    FSM_TTL: int | None = None  # секунд без активности до удаления состояния (None — хранить всегда)
+
+    # В тексте ошибки валидации не печатаем значения: среди них токен бота и пароль БД
+    model_config = SettingsConfigDict(env_file=".env", hide_input_in_errors=True)
+
+    @model_validator(mode="after")
+    def require_webhook_secret(self) -> "Settings":
+        # Без секрета кто угодно, узнав адрес, может слать боту поддельные апдейты
+        if self.BOT_RUN_MODE == "webhook" and not self.WEBHOOK_SECRET:
+            raise ValueError("BOT_RUN_MODE=webhook требует WEBHOOK_SECRET")
+        return self
 
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def REPLICA_DATABASE_URL(self) -> str | None:
+        if not self.DB_REPLICA_HOST:
+            return None
+        user = self.DB_REPLICA_USER or self.DB_USER
+        password = self.DB_REPLICA_PASS or self.DB_PASS
+        port = self.DB_REPLICA_PORT or self.DB_PORT
+        return f"postgresql+asyncpg://{user}:{password}@{self.DB_REPLICA_HOST}:{port}/{self.DB_NAME}"
+
 
 @lru_cache(maxsize=None)
 def get_settings():
@@ -0,0 +1,148 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, Protocol, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """Счётчики кэша для метрик"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class TTLLRUCache(Generic[K, V]):
+    """In-process кэш с ограничением по размеру (LRU) и времени жизни записи (TTL)"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        item = self._data.get(key)
+        if item is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def delete(self, key: K) -> None:
+        if self._data.pop(key, None) is not None:
+            self.stats.invalidations += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(Protocol):
+    """Общий для всех процессов бота кэш (Redis или его локальная замена)"""
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+    async def publish(self, channel: str, message: str) -> None: ...
+
+    async def subscribe(self, channel: str, handler: Callable[[str], Any]) -> None: ...
+
+
+class InMemoryCacheBackend:
+    """
+    Локальная замена общего кэша: те же операции и pub/sub, но внутри одного процесса.
+    Несколько ProfileCache с одним таким бэкендом ведут себя как несколько процессов бота с одним Redis.
+    """
+
+    def __init__(self):
+        self._data: dict[str, tuple[float, bytes]] = {}
+        self._subscribers: dict[str, list[Callable[[str], Any]]] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def publish(self, channel: str, message: str) -> None:
+        for handler in self._subscribers.get(channel, []):
+            handler(message)
+
+    async def subscribe(self, channel: str, handler: Callable[[str], Any]) -> None:
+        self._subscribers.setdefault(channel, []).append(handler)
+
+
+class RedisCacheBackend:
+    """Общий кэш в Redis (пакет redis не входит в зависимости: uv add redis)"""
+
+    def __init__(self, url: str):
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise ImportError("Для общего кэша в Redis установите пакет redis: uv add redis") from e
+
+        self._redis = Redis.from_url(url)
+        self._listeners: list[asyncio.Task] = []
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis.set(key, value, px=int(ttl * 1000))
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(key)
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self._redis.publish(channel, message)
+
+    async def subscribe(self, channel: str, handler: Callable[[str], Any]) -> None:
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+
+        async def listen():
+            async for message in pubsub.listen():
+                handler(message["data"].decode())
+
+        self._listeners.append(asyncio.create_task(listen()))
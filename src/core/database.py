@@ -1,15 +1,211 @@
-from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
+import asyncio
+import contextvars
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Coroutine, Sequence
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from src.config import settings
 
 DATABASE_URL = settings.DATABASE_URL
 
+
+def build_engine(url: str) -> AsyncEngine:
+    """Движок с настройками пула и asyncpg из Settings (соединения открываются лениво)"""
+    url = make_url(url).update_query_dict({"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)})
+    return create_async_engine(
+        url=url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"server_settings": settings.DB_SERVER_SETTINGS},
+    )
+
+
 # Создаем асинхронный движок для работы с базой данных
-engine = create_async_engine(url=DATABASE_URL)
+engine = build_engine(DATABASE_URL)
 # Создаем фабрику сессий для взаимодействия с базой данных
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
+# Реплика для read-only запросов DAO (None — реплики нет, всё идёт в primary)
+replica_engine = build_engine(settings.REPLICA_DATABASE_URL) if settings.REPLICA_DATABASE_URL else None
+replica_session_maker = async_sessionmaker(replica_engine, expire_on_commit=False) if replica_engine else None
+
+# Сессия текущего апдейта Telegram (unit of work). Ставится DbSessionMiddleware,
+# вне апдейта (скрипты, фоновые задачи) остаётся None
+current_session: contextvars.ContextVar[AsyncSession | None] = contextvars.ContextVar("current_session", default=None)
+# Пользователь, чей апдейт обрабатывается, — для read-your-writes
+current_user_id: contextvars.ContextVar[int | None] = contextvars.ContextVar("current_user_id", default=None)
+
+
+class ReadYourWritesGuard:
+    """После записи пользователь на pin_seconds закрепляется за primary, чтобы не увидеть отставание реплики"""
+
+    def __init__(self, pin_seconds: float):
+        self.pin_seconds = pin_seconds
+        self._pinned_until: dict[int, float] = {}
+
+    def pin(self, user_id: int) -> None:
+        now = time.monotonic()
+        self._pinned_until[user_id] = now + self.pin_seconds
+        # Периодически выбрасываем истёкшие закрепления, чтобы словарь не рос
+        if len(self._pinned_until) > 10_000:
+            self._pinned_until = {uid: until for uid, until in self._pinned_until.items() if until > now}
+
+    def is_pinned(self, user_id: int) -> bool:
+        until = self._pinned_until.get(user_id)
+        return until is not None and until > time.monotonic()
+
+
+read_your_writes = ReadYourWritesGuard(settings.DB_REPLICA_PIN_SECONDS)
+
+
+def _reads_from_replica(session: AsyncSession | None) -> bool:
+    if replica_session_maker is None:
+        return False
+    # Транзакция апдейта уже что-то записала — дальше читаем из неё же;
+    # fixed — сессия привязана к конкретному соединению (прогрев пула)
+    if session is not None and (session.info.get("has_writes") or session.info.get("fixed")):
+        return False
+    user_id = current_user_id.get()
+    return user_id is None or not read_your_writes.is_pinned(user_id)
+
+
+@asynccontextmanager
+async def session_scope(read_only: bool = False) -> AsyncIterator[AsyncSession]:
+    """
+    Сессия для DAO.
+
+    Внутри unit of work возвращается общая сессия апдейта — коммит один, в конце апдейта.
+    Без неё (скрипты, фоновые задачи) открывается своя сессия и коммитится на выходе.
+    read_only=True разрешает уйти на реплику, если она настроена и пользователь не закреплён за primary.
+    """
+    session = current_session.get()
+
+    if read_only and _reads_from_replica(session):
+        if session is None:
+            async with replica_session_maker() as replica:
+                yield replica
+            return
+        # Одна сессия реплики на апдейт, закрывается вместе с unit of work
+        replica = session.info.get("replica_session")
+        if replica is None:
+            replica = session.info["replica_session"] = replica_session_maker()
+        yield replica
+        return
+
+    if not read_only:
+        user_id = current_user_id.get()
+        if user_id is not None:
+            read_your_writes.pin(user_id)
+
+    if session is not None:
+        if not read_only:
+            session.info["has_writes"] = True
+        yield session
+        return
+
+    async with async_session_maker() as session:
+        yield session
+        await session.commit()
+        await _run_after_commit(session)
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable]) -> None:
+    """Выполнить callback после успешного коммита сессии (при откате он отбрасывается)"""
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+async def _run_after_commit(session: AsyncSession) -> None:
+    for callback in session.info.pop("after_commit", []):
+        await callback()
+
+
+async def commit_unit_of_work() -> None:
+    """
+    Закоммитить транзакцию текущего unit of work, не дожидаясь конца блока. Сервисы зовут её в конце записи,
+    до ответов в Telegram: блокировки и соединение пула не ждут сети, а пользователь не увидит того,
+    что потом откатится. Дальше сессия работает в новой транзакции. Вне unit of work ничего не делает.
+    """
+    session = current_session.get()
+    if session is None:
+        return
+    await session.commit()
+    await _run_after_commit(session)
+
+
+@asynccontextmanager
+async def unit_of_work(user_id: int | None = None) -> AsyncIterator[AsyncSession]:
+    """
+    Одна сессия на весь блок: все DAO внутри пишут в неё, коммит — при успешном выходе
+    (и раньше, в commit_unit_of_work)
+    """
+    async with async_session_maker() as session:
+        session_token = current_session.set(session)
+        user_token = current_user_id.set(user_id)
+        try:
+            yield session
+            await session.commit()
+            await _run_after_commit(session)
+        except BaseException:
+            await session.rollback()
+            raise
+        finally:
+            current_session.reset(session_token)
+            current_user_id.reset(user_token)
+            replica = session.info.pop("replica_session", None)
+            if replica is not None:
+                await replica.close()
+
+
+def run_detached(coro: Coroutine) -> asyncio.Task:
+    """Запустить фоновую задачу вне unit of work текущего апдейта (со своими сессиями)"""
+    context = contextvars.copy_context()
+    context.run(current_session.set, None)
+    return asyncio.create_task(coro, context=context)
+
+
+async def warm_up_pool(hot_queries: Sequence[Callable[[], Awaitable]]) -> int:
+    """
+    Прогрев перед приёмом апдейтов: открыть DB_POOL_SIZE соединений одновременно
+    и на каждом выполнить горячие запросы, чтобы asyncpg подготовил их заранее
+    (кэш подготовленных выражений у каждого соединения свой). Реплика, если есть, прогревается так же.
+    Возвращает число прогретых соединений.
+    """
+    engines = [engine] if replica_engine is None else [engine, replica_engine]
+    for target in engines:
+        await _warm_up_engine(target, hot_queries)
+    return settings.DB_POOL_SIZE * len(engines)
+
+
+async def _warm_up_engine(target: AsyncEngine, hot_queries: Sequence[Callable[[], Awaitable]]) -> None:
+    barrier = asyncio.Barrier(settings.DB_POOL_SIZE)
+
+    async def warm_connection():
+        async with target.connect() as connection:
+            try:
+                async with AsyncSession(bind=connection, info={"fixed": True}) as session:
+                    token = current_session.set(session)
+                    try:
+                        for query in hot_queries:
+                            await query()
+                    finally:
+                        current_session.reset(token)
+                        await session.rollback()
+            except BaseException:
+                # Не оставляем остальные соединения ждать того, кто уже не придёт
+                await barrier.abort()
+                raise
+            # Держим соединение, пока не откроются все — иначе пул будет переиспользовать одно и то же
+            await barrier.wait()
+
+    await asyncio.gather(*(warm_connection() for _ in range(settings.DB_POOL_SIZE)))
+
 
 # Базовый класс для всех моделей
 class Base(AsyncAttrs, DeclarativeBase):
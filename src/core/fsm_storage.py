@@ -0,0 +1,78 @@
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import orjson
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from src.config import settings
+
+
+class ShardedRedisStorage(BaseStorage):
+    """
+    FSM-хранилище поверх Redis-совместимых серверов, шардированное по чату.
+
+    Состояние и данные одного ключа лежат в одном хэше (поля state и data), данные сериализуются orjson.
+    Запись и продление TTL уходят одним pipeline. Клиенты — redis.asyncio.Redis или InMemoryRedis.
+    """
+
+    def __init__(
+        self,
+        shards: Sequence[Any],
+        key_builder: KeyBuilder | None = None,
+        ttl: int | None = None,
+    ):
+        if not shards:
+            raise ValueError("Нужен хотя бы один шард")
+        self.shards = list(shards)
+        self.key_builder = key_builder or DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+        self.ttl_ms = ttl * 1000 if ttl else None
+
+    @classmethod
+    def from_urls(cls, urls: Sequence[str], ttl: int | None = None) -> "ShardedRedisStorage":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise ImportError("Для FSM в Redis установите пакет redis: uv add redis") from e
+
+        return cls([Redis.from_url(url) for url in urls], ttl=ttl)
+
+    def shard_for(self, key: StorageKey) -> Any:
+        # Все ключи одного чата живут на одном шарде
+        return self.shards[key.chat_id % len(self.shards)]
+
+    async def _write(self, key: StorageKey, field: str, value: bytes | str | None) -> None:
+        name = self.key_builder.build(key)
+        async with self.shard_for(key).pipeline(transaction=False) as pipe:
+            if value is None:
+                pipe.hdel(name, field)
+            else:
+                pipe.hset(name, field, value)
+                if self.ttl_ms:
+                    pipe.pexpire(name, self.ttl_ms)
+            await pipe.execute()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self._write(key, "state", state.state if isinstance(state, State) else state)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        value = await self.shard_for(key).hget(self.key_builder.build(key), "state")
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await self._write(key, "data", orjson.dumps(dict(data)) if data else None)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        value = await self.shard_for(key).hget(self.key_builder.build(key), "data")
+        return orjson.loads(value) if value else {}
+
+    async def close(self) -> None:
+        for shard in self.shards:
+            await shard.aclose()
+
+
+def build_fsm_storage() -> BaseStorage:
+    if settings.FSM_STORAGE == "redis":
+        return ShardedRedisStorage.from_urls(settings.FSM_REDIS_URLS, ttl=settings.FSM_TTL)
+    return MemoryStorage()
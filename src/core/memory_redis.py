@@ -0,0 +1,102 @@
+import time
+from typing import Any
+
+
+class InMemoryRedis:
+    """
+    Локальная замена redis.asyncio.Redis: только команды, которые нужны хранилищу FSM,
+    с той же сигнатурой и семантикой (включая pipeline и истечение ключей).
+    """
+
+    def __init__(self):
+        self._hashes: dict[str, dict[str, bytes]] = {}
+        self._expires_at: dict[str, float] = {}
+        self.commands = 0  # сколько команд пришло (pipeline считается одним обращением)
+
+    def _alive(self, key: str) -> dict[str, bytes] | None:
+        expires_at = self._expires_at.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._hashes.pop(key, None)
+            self._expires_at.pop(key, None)
+        return self._hashes.get(key)
+
+    def _hget(self, name: str, key: str) -> bytes | None:
+        fields = self._alive(name)
+        return fields.get(key) if fields else None
+
+    def _hset(self, name: str, key: str, value: str | bytes) -> int:
+        fields = self._alive(name)
+        if fields is None:
+            fields = self._hashes[name] = {}
+        created = key not in fields
+        fields[key] = value.encode() if isinstance(value, str) else value
+        return int(created)
+
+    def _hdel(self, name: str, *keys: str) -> int:
+        fields = self._alive(name)
+        if not fields:
+            return 0
+        removed = sum(fields.pop(key, None) is not None for key in keys)
+        if not fields:
+            self._hashes.pop(name, None)
+            self._expires_at.pop(name, None)
+        return removed
+
+    def _pexpire(self, name: str, time_ms: int) -> bool:
+        if self._alive(name) is None:
+            return False
+        self._expires_at[name] = time.monotonic() + time_ms / 1000
+        return True
+
+    async def hget(self, name: str, key: str) -> bytes | None:
+        self.commands += 1
+        return self._hget(name, key)
+
+    async def hset(self, name: str, key: str, value: str | bytes) -> int:
+        self.commands += 1
+        return self._hset(name, key, value)
+
+    async def hdel(self, name: str, *keys: str) -> int:
+        self.commands += 1
+        return self._hdel(name, *keys)
+
+    def pipeline(self, transaction: bool = True) -> "InMemoryPipeline":
+        return InMemoryPipeline(self)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class InMemoryPipeline:
+    """Копит команды и выполняет их разом в execute(), как redis.asyncio.client.Pipeline"""
+
+    def __init__(self, redis: InMemoryRedis):
+        self._redis = redis
+        self._queue: list[tuple[str, tuple[Any, ...]]] = []
+
+    def _queued(self, command: str, *args: Any) -> "InMemoryPipeline":
+        self._queue.append((command, args))
+        return self
+
+    def hget(self, name: str, key: str) -> "InMemoryPipeline":
+        return self._queued("_hget", name, key)
+
+    def hset(self, name: str, key: str, value: str | bytes) -> "InMemoryPipeline":
+        return self._queued("_hset", name, key, value)
+
+    def hdel(self, name: str, *keys: str) -> "InMemoryPipeline":
+        return self._queued("_hdel", name, *keys)
+
+    def pexpire(self, name: str, time_ms: int) -> "InMemoryPipeline":
+        return self._queued("_pexpire", name, time_ms)
+
+    async def execute(self) -> list[Any]:
+        self._redis.commands += 1
+        queue, self._queue = self._queue, []
+        return [getattr(self._redis, command)(*args) for command, args in queue]
+
+    async def __aenter__(self) -> "InMemoryPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._queue = []
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from src.logger import logger
+
+
+class Lane(IntEnum):
+    """Полосы приоритета: чем меньше значение, тем раньше отправка"""
+
+    REPLY = 0  # ответ автору текущего апдейта
+    NOTIFICATION = 1  # сообщения другим пользователям (лайки, мэтчи)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Через сколько секунд будет доступен токен (0 — уже есть)"""
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+    def block(self, seconds: float, now: float) -> None:
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def is_idle(self, now: float) -> bool:
+        return self.delay(now) == 0 and self.tokens >= self.capacity
+
+
+@dataclass
+class SendStats:
+    sent: dict[Lane, int] = field(default_factory=lambda: dict.fromkeys(Lane, 0))
+    retry_after: int = 0
+    max_wait_ms: float = 0.0
+
+
+@dataclass
+class _Waiter:
+    chat_id: int | str
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class SendScheduler:
+    """
+    Очередь исходящих запросов к Telegram: общий token bucket (лимит бота) и bucket на каждый чат,
+    внутри — полосы приоритета. Пока чат упирается в свой лимит, сообщения в другие чаты идут дальше.
+    """
+
+    def __init__(self, global_rate: float, chat_rate: float, chat_burst: float, metrics_interval: float = 60):
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.metrics_interval = metrics_interval
+        self.stats = SendStats()
+        self._chats: dict[int | str, TokenBucket] = {}
+        self._lanes: dict[Lane, deque[_Waiter]] = {lane: deque() for lane in Lane}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._last_metrics = time.monotonic()
+
+    def queue_depth(self) -> dict[Lane, int]:
+        return {lane: len(waiters) for lane, waiters in self._lanes.items()}
+
+    async def acquire(self, chat_id: int | str, lane: Lane) -> None:
+        """Дождаться своей очереди на отправку в чат"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        waiter = _Waiter(chat_id, asyncio.get_running_loop().create_future(), time.monotonic())
+        self._lanes[lane].append(waiter)
+        self._wakeup.set()
+        await waiter.future  # отменённого ожидающего планировщик просто пропустит
+
+    def retry_after(self, chat_id: int | str, seconds: float) -> None:
+        """Telegram ответил RetryAfter — не отправляем в этот чат, пока не истечёт пауза"""
+        self.stats.retry_after += 1
+        self._chat_bucket(chat_id).block(seconds, time.monotonic())
+        self._wakeup.set()
+
+    def _chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = self._chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    def _grant(self) -> float | None:
+        """Выдать разрешения всем, кому уже можно; вернуть, через сколько проверить снова"""
+        now = time.monotonic()
+        next_check = None
+        for lane, waiters in self._lanes.items():
+            remaining: deque[_Waiter] = deque()
+            while waiters:
+                waiter = waiters.popleft()
+                if waiter.future.done():
+                    continue
+
+                global_delay = self.global_bucket.delay(now)
+                if global_delay > 0:
+                    # Общий лимит исчерпан — дальше по этой и следующим полосам никто не пройдёт
+                    waiters.extendleft(reversed(remaining + deque([waiter])))
+                    return global_delay
+
+                chat_bucket = self._chat_bucket(waiter.chat_id)
+                chat_delay = chat_bucket.delay(now)
+                if chat_delay > 0:
+                    remaining.append(waiter)
+                    next_check = chat_delay if next_check is None else min(next_check, chat_delay)
+                    continue
+
+                self.global_bucket.take()
+                chat_bucket.take()
+                waiter.future.set_result(None)
+                self.stats.sent[lane] += 1
+                self.stats.max_wait_ms = max(self.stats.max_wait_ms, (now - waiter.enqueued_at) * 1000)
+            self._lanes[lane] = remaining
+        return next_check
+
+    def _forget_idle_chats(self) -> None:
+        now = time.monotonic()
+        self._chats = {chat_id: bucket for chat_id, bucket in self._chats.items() if not bucket.is_idle(now)}
+
+    def _log_metrics(self) -> None:
+        depth = self.queue_depth()
+        logger.info(
+            f"Исходящие: отправлено ответов {self.stats.sent[Lane.REPLY]}, "
+            f"уведомлений {self.stats.sent[Lane.NOTIFICATION]}, "
+            f"в очереди {depth[Lane.REPLY]}/{depth[Lane.NOTIFICATION]}, "
+            f"RetryAfter {self.stats.retry_after}, макс. ожидание {self.stats.max_wait_ms:.0f} ms"
+        )
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            timeout = self._grant()
+            if len(self._chats) > 10_000:
+                self._forget_idle_chats()
+            if time.monotonic() - self._last_metrics >= self.metrics_interval:
+                self._log_metrics()
+                self._last_metrics = time.monotonic()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except TimeoutError:
+                pass
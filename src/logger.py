@@ -1,8 +1,20 @@
+import atexit
+import copy
+import inspect
 import json
+import logging
+import queue
+import random
 import sys
+import threading
+import time
+import traceback
+from collections.abc import Callable, Sequence
 from datetime import datetime
+from pathlib import Path
 from uuid import UUID
 
+import orjson
 from loguru import logger
 
 from src.config import get_settings
@@ -19,7 +31,7 @@ class CustomJSONEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
-def json_serializer(record):
+def _log_record(record) -> dict:
     log_record = {
         "timestamp": record["time"].strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
         "level": record["level"].name,
@@ -36,31 +48,211 @@ def json_serializer(record):
             "value": record["exception"].value,
             "traceback": record["exception"].traceback,
         }
+    return log_record
 
-    return json.dumps(log_record, cls=CustomJSONEncoder)
 
+def json_serializer(record):
+    return json.dumps(_log_record(record), cls=CustomJSONEncoder)
 
-def setup_logging() -> None:
-    logger.remove()
 
-    logging_base_config = {
-        "level": settings.LOG_LEVEL,
-        "backtrace": True,
-        "diagnose": True,
-        "enqueue": True,
-    }
+def orjson_serializer() -> Callable[[dict], str]:
+    """Сериализатор записи в строку JSON (с переводом строки) на orjson; datetime и UUID он пишет сам"""
+    def serialize(record) -> str:
+        log_record = _log_record(record)
+        exception = log_record.get("exception")
+        if exception:
+            log_record["exception"] = {
+                "type": exception["type"].__name__ if exception["type"] else None,
+                "value": str(exception["value"]),
+                "traceback": "".join(
+                    traceback.format_exception(exception["type"], exception["value"], exception["traceback"])
+                ),
+            }
+        return orjson.dumps(log_record, default=str, option=orjson.OPT_APPEND_NEWLINE).decode()
 
-    logger.add(sys.stdout, format=settings.LOG_FORMAT, colorize=True, **logging_base_config)
+    return serialize
 
-    logger.add(
-        settings.LOG_FILE_PATH,
+
+class QueueSink:
+    """
+    Приёмник loguru, который не блокирует вызывающего: запись кладётся в очередь на maxsize записей,
+    а сериализует и пишет её отдельный поток. Если поток не успевает, новые записи отбрасываются
+    и считаются в dropped. О потерях поток пишет предупреждение мимо очереди (иначе и оно бы потерялось),
+    не чаще раза в report_interval секунд и ещё раз при остановке.
+    """
+
+    def __init__(
+        self, serialize: Callable[[dict], str], output: Callable[[str], None], maxsize: int, report_interval: float = 1
+    ):
+        # Не write: объект с write loguru принял бы за поток и писал бы в него напрямую, мимо очереди
+        self.serialize = serialize
+        self.output = output
+        self.written = 0
+        self.dropped = 0
+        self.report_interval = report_interval
+        self._reported_dropped = 0
+        self._reported_at = 0.0
+        self._queue: queue.Queue[dict | None] = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._drain, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def __call__(self, message) -> None:
+        try:
+            self._queue.put_nowait(message.record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self, timeout: float = 5) -> None:
+        """Дописать очередь (не дольше timeout) и остановить поток"""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        if not self._thread.is_alive() and self.dropped != self._reported_dropped:
+            self._report_dropped()
+
+    def _drain(self) -> None:
+        while True:
+            record = self._queue.get()
+            if record is None:
+                return
+            try:
+                self.output(self.serialize(record))
+                self.written += 1
+                if (
+                    self.dropped != self._reported_dropped
+                    and time.monotonic() - self._reported_at >= self.report_interval
+                ):
+                    self._report_dropped()
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+    def _report_dropped(self) -> None:
+        dropped, self._reported_dropped = self.dropped - self._reported_dropped, self.dropped
+        self._reported_at = time.monotonic()
+        log_record = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+            "level": "WARNING",
+            "message": f"Очередь логов переполнена: отброшено {dropped} записей (всего {self._reported_dropped})",
+            "module": __name__,
+            "function": "_report_dropped",
+            "line": 0,
+            "extra": {"dropped": dropped},
+        }
+        self.output(json.dumps(log_record, ensure_ascii=False) + "\n")
+
+
+def sample_hot_loggers(hot_loggers: Sequence[str], rates: dict[str, float]) -> Callable[[dict], bool]:
+    """
+    Фильтр приёмника: записи hot_loggers (модуль loguru или имя logging-логгера) проходят с долей rates[уровень],
+    остальные уровни и модули — все
+    """
+    prefixes = tuple(hot_loggers)
+
+    def keep(record) -> bool:
+        rate = rates.get(record["level"].name)
+        if rate is None:
+            return True
+        name = record["extra"].get("logger") or record["name"]
+        if not name.startswith(prefixes):
+            return True
+        return random.random() < rate
+
+    return keep
+
+
+class InterceptHandler(logging.Handler):
+    """Записи logging.getLogger(...) — в тот же конвейер loguru, с модулем и строкой исходного вызова"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            level: str | int = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+
+        # Пропускаем кадры самого logging, чтобы name/function/line указывали на вызывающий код
+        frame, depth = inspect.currentframe(), 0
+        while frame and (depth == 0 or frame.f_code.co_filename == logging.__file__):
+            frame = frame.f_back
+            depth += 1
+
+        logger.bind(logger=record.name).opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
+
+def add_production_sink(
+    log_file_path: str, level: str, queue_size: int, hot_loggers: Sequence[str], sample_rates: dict[str, float]
+) -> QueueSink:
+    """Продакшен-конвейер: очередь → поток-писатель → JSON-строки в stdout и в файл с ротацией"""
+    # Отдельный экземпляр логгера со своими приёмниками: им пользуется только поток-писатель
+    writer = copy.deepcopy(logger)
+    writer.remove()
+    writer.add(sys.stdout, format="{message}", colorize=False)
+    writer.add(
+        log_file_path,
         rotation=settings.LOG_ROTATION,
         retention=settings.LOG_RETENTION,
         compression=settings.LOG_COMPRESSION,
-        serialize=True,
         format="{message}",
-        **logging_base_config,
         colorize=False,
     )
 
+    sink = QueueSink(serialize=orjson_serializer(), output=writer.opt(raw=True).info, maxsize=queue_size)
+    logger.add(
+        sink,
+        level=level,
+        format="{message}",
+        filter=sample_hot_loggers(hot_loggers, sample_rates),
+        backtrace=False,
+        diagnose=False,
+        catch=True,
+    )
+    return sink
+
+
+def intercept_std_logging(level: str) -> None:
+    # Уровень корневого логгера отсекает лишние вызовы до форматирования сообщения
+    logging.basicConfig(handlers=[InterceptHandler()], level=logger.level(level).no, force=True)
+
+
+def setup_logging(worker: int | None = None) -> None:
+    """worker — номер процесса-обработчика: у каждого свой файл лога, чтобы ротации не мешали друг другу"""
+    logger.remove()
+
+    log_file_path = settings.LOG_FILE_PATH
+    if worker is not None:
+        path = Path(log_file_path)
+        log_file_path = str(path.with_name(f"{path.stem}.worker-{worker}{path.suffix}"))
+
+    if settings.LOG_MODE == "production":
+        sink = add_production_sink(
+            log_file_path,
+            level=settings.LOG_LEVEL,
+            queue_size=settings.LOG_QUEUE_SIZE,
+            hot_loggers=settings.LOG_HOT_LOGGERS,
+            sample_rates=settings.LOG_SAMPLE_RATES,
+        )
+        atexit.register(sink.stop)
+    else:
+        logging_base_config = {
+            "level": settings.LOG_LEVEL,
+            "backtrace": True,
+            "diagnose": True,
+            "enqueue": True,
+        }
+
+        logger.add(sys.stdout, format=settings.LOG_FORMAT, colorize=True, **logging_base_config)
+
+        logger.add(
+            log_file_path,
+            rotation=settings.LOG_ROTATION,
+            retention=settings.LOG_RETENTION,
+            compression=settings.LOG_COMPRESSION,
+            serialize=True,
+            format="{message}",
+            **logging_base_config,
+            colorize=False,
+        )
+
+    intercept_std_logging(settings.LOG_LEVEL)
     logger.debug("Logger successfully initialized.")
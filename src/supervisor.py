@@ -0,0 +1,347 @@
+"""
+Режим нескольких процессов (BOT_WORKERS > 1).
+
+Супервизор принимает апдейты (polling или вебхук) и раскладывает их по очередям процессов-обработчиков
+по хэшу user id, поэтому апдейты одного пользователя всегда попадают в один процесс и обрабатываются по порядку.
+Каждый обработчик — обычный setup_bot() + setup_dispatcher(), апдейты скармливаются через feed_raw_update.
+
+Сигналы супервизору: SIGTERM/SIGINT — остановить приём, дождаться обработки и выйти;
+SIGHUP — перезапустить обработчики по одному (очередь процесса сохраняется, апдейты не теряются).
+Кэш анкет и лента живут в памяти процесса — пользователь закреплён за процессом, но для согласованной
+инвалидации чужих анкет нужен общий кэш (PROFILE_CACHE_BACKEND=redis).
+"""
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from multiprocessing.process import BaseProcess
+from multiprocessing.queues import Queue
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.dispatcher.middlewares.user_context import UserContextMiddleware
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.types import Update
+from aiohttp import web
+
+from src.application import prepare_runtime, setup_bot, setup_dispatcher, setup_routers
+from src.config import settings
+from src.logger import logger, setup_logging
+
+
+@dataclass
+class WorkerMetrics:
+    """Метрики процесса-обработчика, которые он периодически отправляет супервизору"""
+
+    worker: int
+    pid: int
+    processed: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.processed if self.processed else 0.0
+
+
+class UpdateWorker:
+    """
+    Обработчик апдейтов внутри процесса: параллельно для разных пользователей, по порядку для одного.
+
+    Слот из concurrency занимается, только когда апдейт дошёл до своей очереди у пользователя: частый
+    пользователь держит не больше одного слота, а его ждущие апдейты не мешают остальным. Чтение из очереди
+    процесса ограничено отдельно — не больше backlog прочитанных и ещё не обработанных апдейтов.
+    """
+
+    def __init__(self, index: int, bot: Bot, dp: Dispatcher, reports: Queue, concurrency: int, backlog: int):
+        self.bot = bot
+        self.dp = dp
+        self.reports = reports
+        self.metrics = WorkerMetrics(worker=index, pid=os.getpid())
+        self.stopping = asyncio.Event()
+        self._slots = asyncio.Semaphore(concurrency)
+        self._backlog = asyncio.Semaphore(backlog)
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._pending: dict[int, int] = defaultdict(int)
+        self._tasks: set[asyncio.Task] = set()
+
+    async def run(self, updates: Queue) -> None:
+        loop = asyncio.get_running_loop()
+        reporter = asyncio.create_task(self._report_periodically())
+        try:
+            while not self.stopping.is_set():
+                await self._backlog.acquire()
+                try:
+                    item = await loop.run_in_executor(None, updates.get, True, 0.5)
+                except queue.Empty:
+                    self._backlog.release()
+                    continue
+                if item is None:
+                    self._backlog.release()
+                    break
+                user_id, update = item
+                task = asyncio.create_task(self._handle(user_id, update))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+            await asyncio.gather(*self._tasks)
+        finally:
+            reporter.cancel()
+            self.report()
+
+    async def _handle(self, user_id: int, update: dict[str, Any]) -> None:
+        # Задачи создаются в порядке очереди, а Lock будит ожидающих по порядку — апдейты пользователя не обгоняют друг друга
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        self._pending[user_id] += 1
+        self.metrics.in_flight += 1
+        try:
+            async with lock, self._slots:
+                started = time.perf_counter()
+                try:
+                    await self.dp.feed_raw_update(self.bot, update)
+                except Exception:
+                    self.metrics.failed += 1
+                    logger.exception(f"Ошибка обработки апдейта {update.get('update_id')}")
+                elapsed = (time.perf_counter() - started) * 1000
+                self.metrics.processed += 1
+                self.metrics.total_ms += elapsed
+                self.metrics.max_ms = max(self.metrics.max_ms, elapsed)
+        finally:
+            self.metrics.in_flight -= 1
+            self._backlog.release()
+            self._pending[user_id] -= 1
+            if not self._pending[user_id]:
+                del self._pending[user_id]
+                del self._locks[user_id]
+
+    def report(self) -> None:
+        self.reports.put(asdict(self.metrics))
+
+    async def _report_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(settings.BOT_WORKER_METRICS_INTERVAL)
+            self.report()
+
+
+def worker_process(index: int, updates: Queue, reports: Queue) -> None:
+    """Точка входа процесса-обработчика (запускается через spawn)"""
+    setup_logging(worker=index)
+    # Ctrl+C приходит всей группе процессов — останавливает нас супервизор, дав доработать апдейты
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_worker_main(index, updates, reports))
+
+
+async def _worker_main(index: int, updates: Queue, reports: Queue) -> None:
+    bot = setup_bot()
+    dp = setup_dispatcher(worker=index)
+    await prepare_runtime()
+
+    await dp.emit_startup(bot=bot, **dp.workflow_data)
+
+    worker = UpdateWorker(
+        index, bot, dp, reports, concurrency=settings.BOT_WORKER_CONCURRENCY, backlog=settings.BOT_WORKER_BACKLOG
+    )
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, worker.stopping.set)
+    logger.info(f"Обработчик {index} запущен (pid {os.getpid()})")
+    try:
+        await worker.run(updates)
+    finally:
+        await dp.emit_shutdown(bot=bot, **dp.workflow_data)
+        await dp.storage.close()
+        await bot.session.close()
+    logger.info(f"Обработчик {index} остановлен: обработано {worker.metrics.processed}")
+
+
+class Supervisor:
+    def __init__(self, workers: int):
+        self.context = multiprocessing.get_context("spawn")
+        # Очередь обработчика: (user_id, апдейт) или None — «доработай то, что взял, и выйди»
+        self.queues: list[Queue] = [self.context.Queue() for _ in range(workers)]
+        self.reports: Queue = self.context.Queue()
+        self.processes: list[BaseProcess | None] = [None] * workers
+        self.metrics: dict[int, dict[str, Any]] = {}
+        self.dispatched = [0] * workers
+        self.restarts = [0] * workers
+        self.stopping = asyncio.Event()
+        self._restarting: set[int] = set()
+        self._restart_task: asyncio.Task | None = None
+
+    def shard(self, update: Update) -> tuple[int, int]:
+        # Тем же остатком NotificationConsumer делит уведомления, чтобы получатель оставался в своём процессе
+        event_context = UserContextMiddleware.resolve_event_context(update)
+        user_id = event_context.user_id or event_context.chat_id or 0
+        return user_id % len(self.queues), user_id
+
+    def dispatch(self, update: Update) -> None:
+        worker, user_id = self.shard(update)
+        self.queues[worker].put((user_id, update.model_dump(mode="json", exclude_unset=True)))
+        self.dispatched[worker] += 1
+
+    def start_worker(self, index: int) -> None:
+        process = self.context.Process(
+            target=worker_process,
+            args=(index, self.queues[index], self.reports),
+            name=f"bot-worker-{index}",
+        )
+        process.start()
+        self.processes[index] = process
+
+    async def stop_worker(self, index: int) -> None:
+        process = self.processes[index]
+        if process is None:
+            return
+        self.queues[index].put(None)
+        await asyncio.to_thread(process.join)
+        self.processes[index] = None
+
+    async def restart_workers(self) -> None:
+        """Плавный перезапуск по одному: пока обработчик перезапускается, его апдейты копятся в очереди"""
+        for index in range(len(self.queues)):
+            self._restarting.add(index)
+            try:
+                await self.stop_worker(index)
+                self.start_worker(index)
+                self.restarts[index] += 1
+            finally:
+                self._restarting.discard(index)
+        logger.info("Обработчики перезапущены")
+
+    def request_restart(self) -> None:
+        if self._restart_task is None or self._restart_task.done():
+            self._restart_task = asyncio.create_task(self.restart_workers())
+
+    async def watch(self) -> None:
+        """Перезапуск упавших обработчиков, сбор и вывод метрик"""
+        last_log = time.monotonic()
+        while not self.stopping.is_set():
+            for index, process in enumerate(self.processes):
+                if (
+                    process is not None
+                    and not process.is_alive()
+                    and index not in self._restarting
+                    and not self.stopping.is_set()
+                ):
+                    logger.error(f"Обработчик {index} завершился с кодом {process.exitcode}, перезапускаем")
+                    self.start_worker(index)
+                    self.restarts[index] += 1
+            self.collect_reports()
+            if time.monotonic() - last_log >= settings.BOT_WORKER_METRICS_INTERVAL:
+                self.log_metrics()
+                last_log = time.monotonic()
+            await asyncio.sleep(1)
+
+    def collect_reports(self) -> None:
+        while True:
+            try:
+                report = self.reports.get_nowait()
+            except queue.Empty:
+                return
+            self.metrics[report["worker"]] = report
+
+    def log_metrics(self) -> None:
+        for index in range(len(self.queues)):
+            report = self.metrics.get(index, {})
+            processed = report.get("processed", 0)
+            avg_ms = report.get("total_ms", 0) / processed if processed else 0.0
+            logger.info(
+                f"Обработчик {index}: отправлено {self.dispatched[index]}, в очереди {self.queues[index].qsize()}, "
+                f"обработано {processed}, ошибок {report.get('failed', 0)}, в работе {report.get('in_flight', 0)}, "
+                f"среднее {avg_ms:.1f} ms, максимум {report.get('max_ms', 0):.1f} ms, перезапусков {self.restarts[index]}"
+            )
+
+    async def poll(self, bot: Bot, allowed_updates: list[str]) -> None:
+        offset = None
+        backoff = 1
+        while not self.stopping.is_set():
+            try:
+                updates = await bot.get_updates(offset=offset, timeout=30, allowed_updates=allowed_updates)
+            except TelegramRetryAfter as e:
+                logger.warning(f"getUpdates: флуд-лимит, повтор через {e.retry_after} с")
+                await asyncio.sleep(e.retry_after)
+                continue
+            except Exception as e:
+                # Сеть, 5xx, конфликт с другим getUpdates или вебхуком — приём не должен останавливаться молча
+                logger.error(f"getUpdates не удался: {e!r}, повтор через {backoff} с")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+                continue
+            backoff = 1
+            for update in updates:
+                self.dispatch(update)
+                offset = update.update_id + 1
+
+    async def serve_webhook(self, bot: Bot, allowed_updates: list[str]) -> None:
+        async def handle(request: web.Request) -> web.Response:
+            if request.headers.get("X-Telegram-Bot-Api-Secret-Token") != settings.WEBHOOK_SECRET:
+                return web.Response(status=401)
+            self.dispatch(Update.model_validate(await request.json(), context={"bot": bot}))
+            return web.json_response({})
+
+        app = web.Application()
+        app.router.add_post(settings.WEBHOOK_PATH, handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, host=settings.WEBHOOK_HOST, port=settings.WEBHOOK_PORT).start()
+        if settings.WEBHOOK_URL:
+            await bot.set_webhook(
+                url=settings.WEBHOOK_URL + settings.WEBHOOK_PATH,
+                secret_token=settings.WEBHOOK_SECRET,
+                allowed_updates=allowed_updates,
+            )
+        try:
+            await self.stopping.wait()
+        finally:
+            await runner.cleanup()
+
+    def install_signal_handlers(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stopping.set)
+        loop.add_signal_handler(signal.SIGHUP, self.request_restart)
+
+    def _on_ingest_done(self, task: asyncio.Task) -> None:
+        """Приём апдейтов завершился сам (например, порт вебхука занят) — без него работать нельзя, останавливаемся"""
+        if task.cancelled() or self.stopping.is_set():
+            return
+        logger.opt(exception=task.exception()).error("Приём апдейтов остановился, останавливаем бота")
+        self.stopping.set()
+
+    async def run(self) -> None:
+        bot = setup_bot()
+        # Супервизору хендлеры нужны только чтобы узнать, какие типы апдейтов запрашивать
+        allowed_updates = setup_routers().resolve_used_update_types()
+        self.install_signal_handlers()
+
+        for index in range(len(self.queues)):
+            self.start_worker(index)
+        logger.info(f"Запущено обработчиков: {len(self.queues)}")
+
+        watcher = asyncio.create_task(self.watch())
+        if settings.BOT_RUN_MODE == "webhook":
+            ingest = asyncio.create_task(self.serve_webhook(bot, allowed_updates))
+        else:
+            ingest = asyncio.create_task(self.poll(bot, allowed_updates))
+        ingest.add_done_callback(self._on_ingest_done)
+
+        await self.stopping.wait()
+        logger.info("Остановка: прекращаем приём апдейтов и ждём обработчики")
+        ingest.cancel()
+        await asyncio.gather(ingest, return_exceptions=True)
+        await asyncio.gather(*(self.stop_worker(index) for index in range(len(self.queues))))
+        await asyncio.gather(watcher, return_exceptions=True)
+        self.collect_reports()
+        self.log_metrics()
+        await bot.session.close()
+
+
+async def run_supervisor() -> None:
+    if settings.PROFILE_CACHE_BACKEND != "redis":
+        logger.warning("BOT_WORKERS > 1 без PROFILE_CACHE_BACKEND=redis: кэш анкет в процессах не согласован")
+    await Supervisor(settings.BOT_WORKERS).run()
@@ -0,0 +1,108 @@
+"""
+Бенчмарк выбора следующей анкеты в зависимости от длины истории свайпов.
+
+Сравнивает старый путь (список оценённых id → NOT IN) и новый (NOT EXISTS + keyset).
+Нужна отдельная PostgreSQL-база для бенчмарков с применёнными миграциями (настройки из .env).
+Тестовые пользователи создаются с tg_id от BASE_TG_ID и удаляются в конце; без BENCH_DB_NAME, равного
+DB_NAME, бенчмарк не запускается (см. tests/db_guard.py).
+
+    BENCH_DB_NAME=<DB_NAME> uv run python -m tests.bench_candidate_query
+"""
+
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+
+from src.bot.dao.like import LikesDAO
+from src.bot.dao.user import UsersDAO
+from src.bot.enum.gender import Gender
+from src.core.database import async_session_maker, engine
+from tests.db_guard import require_bench_database
+
+BASE_TG_ID = 9_000_000_000
+HISTORY_SIZES = [1_000, 10_000, 100_000]
+CANDIDATES = 1_000
+RUNS = 30
+
+VIEWER_ID = BASE_TG_ID
+
+
+async def seed(history_size: int):
+    """Зритель + history_size оценённых им анкет + CANDIDATES ещё не оценённых"""
+    async with async_session_maker() as session:
+        await session.execute(
+            text(
+                """
+                INSERT INTO users (tg_id, name, age, city, user_gender, gender_interest, status_of_the_questionnaire)
+                SELECT :base + g, 'bench', 25, 'bench', 'female', 'male', true
+                FROM generate_series(0, :total) AS g
+                """
+            ),
+            {"base": BASE_TG_ID, "total": history_size + CANDIDATES},
+        )
+        await session.execute(
+            text(
+                """
+                INSERT INTO likes (from_user_id, to_user_id, is_like, created_at)
+                SELECT :viewer, :base + g, g % 3 = 0, now()
+                FROM generate_series(1, :history) AS g
+                """
+            ),
+            {"viewer": VIEWER_ID, "base": BASE_TG_ID, "history": history_size},
+        )
+        await session.commit()
+    async with engine.connect() as connection:
+        await connection.execute(text("ANALYZE users"))
+        await connection.execute(text("ANALYZE likes"))
+
+
+async def cleanup():
+    async with async_session_maker() as session:
+        await session.execute(text("DELETE FROM likes WHERE from_user_id >= :base"), {"base": BASE_TG_ID})
+        await session.execute(text("DELETE FROM users WHERE tg_id >= :base"), {"base": BASE_TG_ID})
+        await session.commit()
+
+
+async def legacy_next_profile():
+    rated_user_ids = await LikesDAO.get_rated_user_ids(VIEWER_ID)
+    return await UsersDAO.get_next_profile(VIEWER_ID, rated_user_ids, Gender.FEMALE)
+
+
+async def anti_join_next_profile():
+    profiles = await UsersDAO.get_candidates(VIEWER_ID, Gender.FEMALE, after_id=0, limit=1)
+    return profiles[0] if profiles else None
+
+
+async def measure(func) -> str:
+    timings = []
+    try:
+        await func()  # прогрев
+    except Exception as e:
+        # asyncpg не принимает больше 32767 параметров — NOT IN на длинной истории просто падает
+        return f"ошибка: {type(e).__name__}"
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return f"{statistics.median(timings):.2f} / {statistics.quantiles(timings, n=20)[-1]:.2f}"
+
+
+async def main():
+    print(f"{'history':>8} | {'NOT IN p50/p95, ms':>20} | {'NOT EXISTS p50/p95, ms':>24}")
+    try:
+        for history_size in HISTORY_SIZES:
+            await cleanup()
+            await seed(history_size)
+            legacy = await measure(legacy_next_profile)
+            anti_join = await measure(anti_join_next_profile)
+            print(f"{history_size:>8} | {legacy:>20} | {anti_join:>24}")
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    require_bench_database()
+    asyncio.run(main())
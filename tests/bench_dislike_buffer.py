@@ -0,0 +1,115 @@
+"""
+Бенчмарк записи дизлайков: свайпов в секунду без буфера и с DislikeBuffer при разных размерах пачки.
+
+USERS пользователей одновременно дизлайкают по SWIPES анкет. «Без буфера» — register_like на каждый свайп
+(своя транзакция), с буфером — DislikeBuffer.add и финальный stop(); время считается до записи последнего
+дизлайка в БД. Нужна отдельная PostgreSQL-база для бенчмарков с применёнными миграциями (настройки из .env);
+без BENCH_DB_NAME, равного DB_NAME, бенчмарк не запускается (см. tests/db_guard.py).
+
+    BENCH_DB_NAME=<DB_NAME> uv run python -m tests.bench_dislike_buffer
+"""
+
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from src.bot.dao.like import LikesDAO
+from src.bot.services.dislike_buffer import DislikeBuffer
+from src.core.database import async_session_maker, engine
+from tests.db_guard import require_bench_database
+
+BASE_TG_ID = 9_300_000_000
+USERS = 50
+SWIPES = 100
+BATCH_SIZES = (1, 10, 50, 200, 1000)
+MAX_DELAY = 0.05
+
+
+async def seed():
+    async with async_session_maker() as session:
+        await session.execute(
+            text(
+                """
+                INSERT INTO users (tg_id, name, age, city, user_gender, gender_interest, status_of_the_questionnaire)
+                SELECT :base + g, 'bench', 25, 'bench', 'female', 'female', true
+                FROM generate_series(0, :total) AS g
+                """
+            ),
+            {"base": BASE_TG_ID, "total": USERS + SWIPES},
+        )
+        await session.commit()
+
+
+async def cleanup():
+    async with async_session_maker() as session:
+        for table, column in (
+            ("swipe_events", "actor_id"),
+            ("likes_inbox", "recipient_id"),
+            ("likes", "from_user_id"),
+            ("users", "tg_id"),
+        ):
+            await session.execute(text(f"DELETE FROM {table} WHERE {column} >= :base"), {"base": BASE_TG_ID})
+        await session.commit()
+
+
+async def reset_likes():
+    async with async_session_maker() as session:
+        await session.execute(text("DELETE FROM likes WHERE from_user_id >= :base"), {"base": BASE_TG_ID})
+        await session.commit()
+
+
+def targets():
+    first_target = BASE_TG_ID + USERS + 1
+    return range(first_target, first_target + SWIPES)
+
+
+async def unbuffered_user(user_id: int):
+    for target_id in targets():
+        await LikesDAO.register_like(user_id, target_id, is_like=False)
+
+
+async def buffered_user(buffer: DislikeBuffer, user_id: int):
+    for target_id in targets():
+        await buffer.add(user_id, target_id)
+        await asyncio.sleep(0)  # между свайпами пользователя управление уходит другим апдейтам
+
+
+async def run(name: str, swipe_all, buffer: DislikeBuffer | None = None):
+    await reset_likes()
+    started = time.perf_counter()
+    await swipe_all()
+    elapsed = time.perf_counter() - started
+    total = USERS * SWIPES
+    queries = buffer.stats.flushes if buffer else total
+    print(f"{name:>16} | {total / elapsed:>12.0f} | {elapsed * 1000:>9.0f} | {queries:>8}")
+
+
+async def main():
+    users = [BASE_TG_ID + i for i in range(USERS)]
+    try:
+        await cleanup()
+        await seed()
+        print(f"{'режим':>16} | {'свайпов/с':>12} | {'всего, ms':>9} | {'запросов':>8}")
+
+        async def unbuffered():
+            await asyncio.gather(*(unbuffered_user(user_id) for user_id in users))
+
+        await run("без буфера", unbuffered)
+
+        for batch_size in BATCH_SIZES:
+            buffer = DislikeBuffer(LikesDAO, max_rows=batch_size, max_delay=MAX_DELAY)
+
+            async def buffered(buffer=buffer):
+                await asyncio.gather(*(buffered_user(buffer, user_id) for user_id in users))
+                await buffer.stop()
+
+            await run(f"пачка {batch_size}", buffered, buffer)
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    require_bench_database()
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+Микробенчмарк логирования: сколько вызовов в секунду выдерживает вызывающий поток.
+
+«Как было» — приёмники development-режима (stdout с форматом LOG_FORMAT и JSON-файл, enqueue=True, diagnose=True)
+и f-строки. Production — очередь на QueueSink и поток-писатель с orjson: обычная запись, частое событие
+с выборкой, вызов через logging.getLogger (InterceptHandler) и DEBUG ниже уровня. stdout уходит в /dev/null,
+файлы — во временный каталог. Для production печатается ещё, сколько записано и отброшено при переполнении.
+
+    uv run python -m tests.bench_logging
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from src.config import settings
+from src.logger import add_production_sink, intercept_std_logging
+
+CALLS = 50_000
+LEVEL = "INFO"
+QUEUE_SIZE = 10_000
+HOT_LOGGER = "bench.hot"
+# Результаты печатаются в настоящий stdout: на время замеров sys.stdout подменён на /dev/null
+REPORT = sys.stdout
+
+
+def measure(label: str, call) -> None:
+    started = time.perf_counter()
+    for i in range(CALLS):
+        call(i)
+    elapsed = time.perf_counter() - started
+    print(f"{label:>34} | {CALLS / elapsed:>12,.0f} | {elapsed / CALLS * 1e6:>8.2f}", file=REPORT)
+
+
+def bench_development(directory: Path) -> None:
+    logger.remove()
+    base = {"level": LEVEL, "backtrace": True, "diagnose": True, "enqueue": True}
+    logger.add(sys.stdout, format=settings.LOG_FORMAT, colorize=True, **base)
+    logger.add(directory / "development.log", serialize=True, format="{message}", colorize=False, **base)
+
+    measure("development, f-строка", lambda i: logger.info(f"Лайк от {i} к {i + 1}"))
+    started = time.perf_counter()
+    logger.remove()
+    print(f"  очередь дописана за {time.perf_counter() - started:.2f} с", file=REPORT)
+
+
+def bench_production(directory: Path) -> None:
+    logger.remove()
+    sink = add_production_sink(
+        str(directory / "production.log"),
+        level=LEVEL,
+        queue_size=QUEUE_SIZE,
+        hot_loggers=[HOT_LOGGER],
+        sample_rates={"DEBUG": 0.01, "INFO": 0.1},
+    )
+    intercept_std_logging(LEVEL)
+    hot = logging.getLogger(HOT_LOGGER)
+
+    measure("production, ленивое форматирование", lambda i: logger.info("Лайк от {} к {}", i, i + 1))
+    measure("production, logging.getLogger", lambda i: logging.getLogger("bench").info("Лайк от %s к %s", i, i + 1))
+    measure("production, частое событие 10%", lambda i: hot.info("Лайк от %s к %s", i, i + 1))
+    measure("production, DEBUG ниже уровня", lambda i: logger.debug("Лайк от {} к {}", i, i + 1))
+
+    started = time.perf_counter()
+    sink.stop(timeout=60)
+    print(f"  очередь дописана за {time.perf_counter() - started:.2f} с", file=REPORT)
+    print(f"  записано {sink.written}, отброшено {sink.dropped} (очередь {QUEUE_SIZE})", file=REPORT)
+    logger.remove()
+
+
+def main():
+    print(f"{'сценарий':>34} | {'вызовов/с':>12} | {'мкс/вызов':>8}")
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, "w") as devnull:
+        # Приёмники stdout запоминают поток при добавлении
+        sys.stdout = devnull
+        try:
+            bench_development(Path(directory))
+            bench_production(Path(directory))
+        finally:
+            sys.stdout = REPORT
+
+
+if __name__ == "__main__":
+    main()
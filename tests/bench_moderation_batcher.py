@@ -0,0 +1,79 @@
+"""
+Бенчмарк модерации при всплеске регистраций: ModerationBatcher против вызова chain.ainvoke на каждую анкету.
+
+PROFILES анкет приходят одновременно (DUPLICATE_SHARE из них — повторы), запросы идут в локальный fake
+chat-completions сервер с задержкой LATENCY и пределом PROVIDER_LIMIT одновременных запросов (дальше — 429).
+Считаются успешные проверки в секунду, ошибки, запросы к LLM и задержка для вызывающего.
+
+    uv run python -m tests.bench_moderation_batcher
+"""
+
+import asyncio
+import statistics
+import time
+
+from src.bot.llm_service.batcher import ModerationBatcher
+from tests.fake_llm_server import FakeLLMServer
+from tests.test_moderation_batcher import make_chain
+
+PORT = 18091
+PROFILES = 500
+DUPLICATE_SHARE = 0.2
+LATENCY = 0.2
+PROVIDER_LIMIT = 16
+BATCH_SIZES = (4, 16, 64)
+
+
+def profile_texts() -> list[str]:
+    unique = int(PROFILES * (1 - DUPLICATE_SHARE))
+    return [f"Привет, я анкета {i % unique}" for i in range(PROFILES)]
+
+
+async def timed(call) -> tuple[float, bool]:
+    started = time.perf_counter()
+    try:
+        await call
+        ok = True
+    except Exception:
+        ok = False
+    return (time.perf_counter() - started) * 1000, ok
+
+
+async def run(name: str, moderate) -> None:
+    async with FakeLLMServer(PORT, latency=LATENCY, max_concurrent=PROVIDER_LIMIT) as server:
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(timed(call) for call in moderate(server)))
+        elapsed = time.perf_counter() - started
+
+    timings = [ms for ms, _ in outcomes]
+    succeeded = sum(ok for _, ok in outcomes)
+    p50 = statistics.median(timings)
+    p99 = statistics.quantiles(timings, n=100)[-1]
+    print(
+        f"{name:>14} | {succeeded / elapsed:>9.0f} | {PROFILES - succeeded:>6} | "
+        f"{server.stats.requests:>8} | {p50:>8.0f} | {p99:>8.0f}"
+    )
+
+
+async def main():
+    print(f"{'режим':>14} | {'успех/с':>9} | {'ошибок':>6} | {'запросов':>8} | {'p50, ms':>8} | {'p99, ms':>8}")
+
+    def direct(server):
+        chain = make_chain(server)
+        return [chain.ainvoke({"profile_text": text}) for text in profile_texts()]
+
+    await run("без пачек", direct)
+
+    for batch_size in BATCH_SIZES:
+
+        def batched(server, batch_size=batch_size):
+            batcher = ModerationBatcher(
+                make_chain(server), max_batch=batch_size, max_wait=0.02, max_concurrency=PROVIDER_LIMIT
+            )
+            return [batcher.submit(text) for text in profile_texts()]
+
+        await run(f"пачка {batch_size}", batched)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
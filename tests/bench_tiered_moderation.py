@@ -0,0 +1,67 @@
+"""
+Бенчмарк многоуровневой модерации на размеченном корпусе (tests/fixtures/moderation_corpus.jsonl, часть test).
+
+Каждая анкета проходит правила, затем классификатор; спорные уходят в LLM — локальный fake chat-completions
+сервер с задержкой LLM_LATENCY. Печатаются задержка и доля решений каждого уровня, доля эскалаций в LLM,
+ошибки локальных вердиктов против разметки и общее время в сравнении с «всё через LLM».
+
+    uv run python -m tests.bench_tiered_moderation
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+from src.bot.llm_service.classifier import WEIGHTS_PATH, LinearClassifier, load_corpus
+from src.bot.llm_service.moderation import ModerationService
+from src.bot.llm_service.rules import RuleTier
+from src.bot.llm_service.tiered import TieredModerator
+from src.config import settings
+from tests.fake_llm_server import FakeLLMServer
+from tests.test_moderation_batcher import make_chain
+
+CORPUS = Path(__file__).parent / "fixtures" / "moderation_corpus.jsonl"
+PORT = 18092
+LLM_LATENCY = 0.3
+
+
+async def moderate_all(service: ModerationService, texts: list[str]) -> float:
+    started = time.perf_counter()
+    for text in texts:
+        await service.moderate_profile(text)
+    return time.perf_counter() - started
+
+
+async def main():
+    rows = load_corpus(CORPUS, split="test")
+    texts = [row["text"] for row in rows]
+    fast_path = TieredModerator(
+        rules=RuleTier(),
+        classifier=LinearClassifier.load(WEIGHTS_PATH),
+        accept_below=settings.MODERATION_ACCEPT_BELOW,
+        reject_above=settings.MODERATION_REJECT_ABOVE,
+    )
+
+    wrong = 0
+    for row in rows:
+        verdict = fast_path.check(row["text"])
+        if verdict is not None and verdict.is_valid != (row["label"] == "ok"):
+            wrong += 1
+            print(f"  ошибка: {row['label']} → {verdict.summary}: {row['text']}")
+    fast_path.stats = {tier: type(stats)() for tier, stats in fast_path.stats.items()}
+
+    async with FakeLLMServer(PORT, latency=LLM_LATENCY) as server:
+        chain = make_chain(server)
+        llm_only = await moderate_all(ModerationService(chain), texts)
+        tiered = await moderate_all(ModerationService(chain, fast_path=fast_path), texts)
+
+    print(f"Анкет: {len(rows)}, пороги классификатора {fast_path.accept_below}/{fast_path.reject_above}")
+    print(f"{'уровень':>11} | {'дошло':>5} | {'решил':>5} | {'ср., ms':>8}")
+    for tier, stats in fast_path.stats.items():
+        print(f"{tier:>11} | {stats.checks:>5} | {stats.verdicts:>5} | {stats.avg_ms:>8.3f}")
+    print(f"В LLM: {fast_path.escalation_rate:.0%}, ошибок локальных вердиктов: {wrong}")
+    print(f"Всё через LLM: {llm_only:.1f} с, по уровням: {tiered:.1f} с")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
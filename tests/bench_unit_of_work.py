@@ -0,0 +1,103 @@
+"""
+Бенчмарк unit of work: выдачи соединений из пула и задержка на один апдейт-свайп.
+
+Апдейт моделируется той же цепочкой DAO-вызовов, что делает дизлайк с холодным буфером ленты.
+«До» — каждый DAO открывает свою сессию, «после» — весь апдейт внутри unit_of_work().
+Нужна отдельная PostgreSQL-база для бенчмарков с применёнными миграциями (настройки из .env);
+без BENCH_DB_NAME, равного DB_NAME, бенчмарк не запускается (см. tests/db_guard.py).
+
+    BENCH_DB_NAME=<DB_NAME> uv run python -m tests.bench_unit_of_work
+"""
+
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import event, text
+
+from src.bot.dao.like import LikesDAO
+from src.bot.dao.user import UsersDAO
+from src.core.database import async_session_maker, engine, unit_of_work
+from tests.db_guard import require_bench_database
+
+BASE_TG_ID = 9_200_000_000
+UPDATES = 300
+VIEWER_ID = BASE_TG_ID
+
+checkouts = 0
+
+
+def on_checkout(*_):
+    global checkouts
+    checkouts += 1
+
+
+async def seed():
+    async with async_session_maker() as session:
+        await session.execute(
+            text(
+                """
+                INSERT INTO users (tg_id, name, age, city, user_gender, gender_interest, status_of_the_questionnaire)
+                SELECT :base + g, 'bench', 25, 'bench', 'female', 'female', true
+                FROM generate_series(0, :total) AS g
+                """
+            ),
+            {"base": BASE_TG_ID, "total": 2 * UPDATES + 10},
+        )
+        await session.commit()
+
+
+async def cleanup():
+    async with async_session_maker() as session:
+        for table, column in (("likes_inbox", "recipient_id"), ("likes", "from_user_id"), ("users", "tg_id")):
+            await session.execute(text(f"DELETE FROM {table} WHERE {column} >= :base"), {"base": BASE_TG_ID})
+        await session.commit()
+
+
+async def swipe_update(target_id: int):
+    """Те же запросы, что делает дизлайк: оценка + дозагрузка ленты"""
+    await LikesDAO.register_like(VIEWER_ID, target_id, is_like=False)
+    await UsersDAO.get_status_of_questionnaire(VIEWER_ID)
+    viewer = await UsersDAO.get_by_tg_id(VIEWER_ID)
+    await UsersDAO.get_candidates(VIEWER_ID, viewer.gender_interest, after_id=0, limit=20)
+
+
+async def standalone_update(target_id: int):
+    await swipe_update(target_id)
+
+
+async def unit_of_work_update(target_id: int):
+    async with unit_of_work():
+        await swipe_update(target_id)
+
+
+async def run(name: str, update, first_target: int):
+    global checkouts
+    checkouts = 0
+    timings = []
+    for i in range(UPDATES):
+        started = time.perf_counter()
+        await update(first_target + i)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    p50 = statistics.median(timings)
+    p99 = statistics.quantiles(timings, n=100)[-1]
+    print(f"{name:>14} | {checkouts / UPDATES:>17.1f} | {p50:>8.2f} | {p99:>8.2f}")
+
+
+async def main():
+    event.listen(engine.sync_engine.pool, "checkout", on_checkout)
+    try:
+        await cleanup()
+        await seed()
+        print(f"{'режим':>14} | {'checkout/апдейт':>17} | {'p50, ms':>8} | {'p99, ms':>8}")
+        await run("по сессии DAO", standalone_update, BASE_TG_ID + 1)
+        await run("unit of work", unit_of_work_update, BASE_TG_ID + 1 + UPDATES)
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    require_bench_database()
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Нагрузочный тест вебхука: синтетические апдейты POST-ами на локальный aiohttp-сервер.
+
+Приложение собирается тем же setup_webhook_app, что и в боевом режиме, но диспетчер — с одним
+хендлером-счётчиком, поэтому БД и Telegram не нужны. Измеряется время до ответа 200 (ack)
+и сколько апдейтов в секунду обработано до конца в фоне.
+
+    uv run python -m tests.bench_webhook
+"""
+
+import asyncio
+import statistics
+import time
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Message
+from aiohttp import ClientSession, web
+
+from src.application import setup_webhook_app
+from src.config import settings
+
+HOST = "127.0.0.1"
+PORT = 18080
+UPDATES = 5000
+CONCURRENCY = 100
+HANDLER_DELAY = 0.01  # имитация работы хендлера (запросы в БД и т.п.)
+
+processed = 0
+all_processed = asyncio.Event()
+
+
+def build_dispatcher() -> Dispatcher:
+    dp = Dispatcher()
+
+    @dp.message()
+    async def count(message: Message):
+        global processed
+        await asyncio.sleep(HANDLER_DELAY)
+        processed += 1
+        if processed == UPDATES:
+            all_processed.set()
+
+    return dp
+
+
+def make_update(update_id: int) -> dict:
+    user_id = 1_000 + update_id % 500
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "bench"},
+            "text": "/start",
+        },
+    }
+
+
+async def post_updates(session: ClientSession, url: str, headers: dict, ids: range, timings: list):
+    for update_id in ids:
+        started = time.perf_counter()
+        async with session.post(url, json=make_update(update_id), headers=headers) as response:
+            assert response.status == 200, response.status
+        timings.append((time.perf_counter() - started) * 1000)
+
+
+async def main():
+    bot = Bot(token="42:BENCHMARK")
+    runner = web.AppRunner(setup_webhook_app(bot, build_dispatcher()))
+    await runner.setup()
+    await web.TCPSite(runner, host=HOST, port=PORT).start()
+
+    url = f"http://{HOST}:{PORT}{settings.WEBHOOK_PATH}"
+    headers = {"X-Telegram-Bot-Api-Secret-Token": settings.WEBHOOK_SECRET} if settings.WEBHOOK_SECRET else {}
+    timings: list[float] = []
+    try:
+        async with ClientSession() as session:
+            if settings.WEBHOOK_SECRET:
+                async with session.post(url, json=make_update(0)) as response:
+                    assert response.status == 401, "запрос без секретного токена должен отклоняться"
+
+            started = time.perf_counter()
+            per_worker = UPDATES // CONCURRENCY
+            await asyncio.gather(
+                *(
+                    post_updates(session, url, headers, range(1 + i * per_worker, 1 + (i + 1) * per_worker), timings)
+                    for i in range(CONCURRENCY)
+                )
+            )
+            acked = time.perf_counter() - started
+            await asyncio.wait_for(all_processed.wait(), timeout=60)
+            done = time.perf_counter() - started
+    finally:
+        await runner.cleanup()
+
+    print(f"апдейтов: {UPDATES}, параллельно: {CONCURRENCY}, хендлер: {HANDLER_DELAY * 1000:.0f} ms")
+    print(f"ack p50: {statistics.median(timings):.2f} ms, p99: {statistics.quantiles(timings, n=100)[-1]:.2f} ms")
+    print(f"приём: {UPDATES / acked:.0f} апдейтов/с, обработка: {UPDATES / done:.0f} апдейтов/с")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
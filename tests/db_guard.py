@@ -0,0 +1,20 @@
+"""
+Защита от запуска бенчмарков, которые засевают и чистят таблицы, на рабочей базе.
+
+Бенчмарк стартует, только если имя базы из .env явно подтверждено в BENCH_DB_NAME:
+
+    BENCH_DB_NAME=tg_botik_bench uv run python -m tests.bench_candidate_query
+"""
+
+import os
+
+from src.config import settings
+
+
+def require_bench_database() -> None:
+    confirmed = os.environ.get("BENCH_DB_NAME")
+    if confirmed != settings.DB_NAME:
+        raise SystemExit(
+            f"Бенчмарк пишет в базу {settings.DB_NAME!r} и удаляет за собой строки. "
+            f"Запустите его на отдельной базе и подтвердите её имя: BENCH_DB_NAME={settings.DB_NAME}"
+        )
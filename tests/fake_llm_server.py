@@ -0,0 +1,99 @@
+"""
+Локальная замена chat-completions API для тестов и бенчмарков модерации.
+
+Отвечает на POST /v1/chat/completions так, как отвечает Mistral на запрос со structured output:
+вызовом инструмента (tool_calls) с аргументами ProfileCheck. Анкета со словом «spam» не проходит.
+latency — задержка каждого ответа; больше max_concurrent одновременных запросов получают 429, как у провайдера.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+
+from aiohttp import web
+
+HOST = "127.0.0.1"
+
+
+@dataclass
+class FakeLLMStats:
+    requests: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+
+class FakeLLMServer:
+    def __init__(self, port: int, latency: float = 0.05, max_concurrent: int = 1000):
+        self.port = port
+        self.latency = latency
+        self.max_concurrent = max_concurrent
+        self.stats = FakeLLMStats()
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{HOST}:{self.port}/v1"
+
+    async def __aenter__(self) -> "FakeLLMServer":
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.chat_completions)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host=HOST, port=self.port).start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._runner.cleanup()
+
+    async def chat_completions(self, request: web.Request) -> web.Response:
+        self.stats.requests += 1
+        if self.stats.in_flight >= self.max_concurrent:
+            self.stats.rejected += 1
+            return web.json_response({"message": "Requests rate limit exceeded"}, status=429)
+
+        self.stats.in_flight += 1
+        self.stats.max_in_flight = max(self.stats.max_in_flight, self.stats.in_flight)
+        try:
+            body = await request.json()
+            await asyncio.sleep(self.latency)
+        finally:
+            self.stats.in_flight -= 1
+
+        profile_text = body["messages"][-1]["content"]
+        is_spam = "spam" in profile_text.lower()
+        arguments = {
+            "is_valid": not is_spam,
+            "toxicity": 0.0,
+            "nsfw": False,
+            "spam": is_spam,
+            "summary": "fake",
+        }
+        tool_name = body["tools"][0]["function"]["name"]
+        return web.json_response(
+            {
+                "id": f"fake-{self.stats.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {
+                            "role": "assistant",
+                            "content": "",
+                            "tool_calls": [
+                                {
+                                    "id": f"{self.stats.requests:09d}",
+                                    "type": "function",
+                                    "function": {"name": tool_name, "arguments": json.dumps(arguments)},
+                                }
+                            ],
+                        },
+                        "finish_reason": "tool_calls",
+                    }
+                ],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+            }
+        )
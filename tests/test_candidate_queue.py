@@ -0,0 +1,114 @@
+"""
+CandidateQueue с подставным загрузчиком вместо запроса к БД: дозагрузка ниже low_water, discard, reset и LRU лент.
+
+    uv run pytest tests/test_candidate_queue.py
+"""
+
+import asyncio
+
+from src.bot.models.user import Users
+from src.bot.services.candidate_queue import CandidateQueue
+
+
+class FakeLoader:
+    """Лента из анкет с id 1..total (tg_id = 1000 + id); запоминает каждый вызов"""
+
+    def __init__(self, total: int):
+        self.profiles = [Users(id=i, tg_id=1000 + i) for i in range(1, total + 1)]
+        self.calls: list[tuple[int, int, int]] = []
+
+    async def __call__(self, user_id: int, after_id: int, limit: int) -> list[Users]:
+        self.calls.append((user_id, after_id, limit))
+        return [profile for profile in self.profiles if profile.id > after_id][:limit]
+
+
+async def settle():
+    # Даём фоновой дозагрузке отработать
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_refills_in_background_below_low_water():
+    async def scenario():
+        loader = FakeLoader(total=10)
+        queue = CandidateQueue(loader, batch_size=4, low_water=2, max_users=10)
+
+        assert (await queue.pop(1)).id == 1  # пустой буфер — загрузка сразу
+        assert loader.calls == [(1, 0, 4)]
+        assert (await queue.pop(1)).id == 2
+        assert len(loader.calls) == 1  # в буфере ещё 2 — не ниже low_water
+
+        assert (await queue.pop(1)).id == 3
+        await settle()
+        assert loader.calls[1] == (1, 4, 4)  # следующая пачка по курсору
+
+        ids = [(await queue.pop(1)).id for _ in range(7)]
+        assert ids == [4, 5, 6, 7, 8, 9, 10]
+        assert await queue.pop(1) is None
+
+    asyncio.run(scenario())
+
+
+def test_discard_removes_rated_profile_from_buffer():
+    async def scenario():
+        loader = FakeLoader(total=5)
+        queue = CandidateQueue(loader, batch_size=5, low_water=0, max_users=10)
+
+        assert (await queue.pop(1)).id == 1
+        queue.discard(1, 1000 + 3)
+        queue.discard(2, 1000 + 4)  # у пользователя 2 ленты нет — ничего не происходит
+
+        assert [(await queue.pop(1)).id for _ in range(3)] == [2, 4, 5]
+
+    asyncio.run(scenario())
+
+
+def test_reset_starts_feed_from_the_beginning():
+    async def scenario():
+        loader = FakeLoader(total=5)
+        queue = CandidateQueue(loader, batch_size=2, low_water=1, max_users=10)
+
+        assert (await queue.pop(1)).id == 1
+        await settle()
+        queue.reset(1)
+
+        assert (await queue.pop(1)).id == 1
+        assert loader.calls[-1] == (1, 0, 2)
+
+    asyncio.run(scenario())
+
+
+def test_evicts_least_recently_used_feed():
+    async def scenario():
+        loader = FakeLoader(total=5)
+        queue = CandidateQueue(loader, batch_size=5, low_water=0, max_users=2)
+
+        await queue.pop(1)
+        await queue.pop(2)
+        await queue.pop(1)  # лента 1 свежее ленты 2
+        await queue.pop(3)
+
+        assert list(queue._feeds) == [1, 3]
+        # Ленту 2 выбросили — она загружается заново с начала
+        assert (await queue.pop(2)).id == 1
+        assert list(queue._feeds) == [3, 2]
+
+    asyncio.run(scenario())
+
+
+def test_excluded_rows_do_not_end_the_feed_early():
+    async def scenario():
+        loader = FakeLoader(total=10)
+        excluded = {1000 + i for i in (1, 2, 3, 4, 6)}
+        queue = CandidateQueue(loader, batch_size=4, low_water=1, max_users=10, exclude=lambda user_id: excluded)
+
+        # Первая пачка (1–4) отсеялась целиком — это не конец ленты, загрузка идёт дальше по курсору
+        assert (await queue.pop(1)).id == 5
+        assert [call[1] for call in loader.calls] == [0, 4]
+
+        # Во второй пачке (5–8) отсеялась одна строка, но страница полная — фоновая дозагрузка продолжается
+        ids = [(await queue.pop(1)).id for _ in range(4)]
+        assert ids == [7, 8, 9, 10]
+        assert await queue.pop(1) is None
+
+    asyncio.run(scenario())
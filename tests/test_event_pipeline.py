@@ -0,0 +1,211 @@
+"""
+EventPipeline и позиции потребителей без БД: подставной DAO хранит позиции в памяти и применяет save_offset
+только после коммита unit of work, как настоящая транзакция. SQL ensure_offsets и reset_offset проверяется
+на сессии, которая запоминает запросы.
+
+    uv run pytest tests/test_event_pipeline.py
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.bot.dao.event import SwipeEventsDAO
+from src.bot.events.pipeline import EventPipeline
+from src.core.database import after_commit, current_session
+
+
+def make_event(event_id: int, xid: int) -> SimpleNamespace:
+    return SimpleNamespace(id=event_id, xid=xid)
+
+
+class FakeEventsDAO:
+    """Журнал событий и позиции потребителей в памяти"""
+
+    def __init__(self, events: list[SimpleNamespace]):
+        self.events = events
+        self.offsets: dict[str, tuple[int, int]] = {}
+        self.locked: set[str] = set()  # позиции, которые держит другой процесс
+
+    async def ensure_offsets(self, consumers: list[str], start_from: dict[str, str] | None = None) -> None:
+        for consumer, source in (start_from or {}).items():
+            if consumer not in self.offsets and source in self.offsets:
+                self.offsets[consumer] = self.offsets[source]
+        for consumer in consumers:
+            self.offsets.setdefault(consumer, (0, 0))
+
+    async def claim_offset(self, consumer: str) -> tuple[int, int] | None:
+        if consumer in self.locked:
+            return None
+        return self.offsets[consumer]
+
+    async def read_after(self, last_xid: int, last_event_id: int, limit: int) -> list[SimpleNamespace]:
+        after = [event for event in self.events if (event.xid, event.id) > (last_xid, last_event_id)]
+        return sorted(after, key=lambda event: (event.xid, event.id))[:limit]
+
+    async def save_offset(self, consumer: str, last_xid: int, last_event_id: int) -> None:
+        async def apply():
+            self.offsets[consumer] = (last_xid, last_event_id)
+
+        after_commit(current_session.get(), apply)
+
+
+class RecordingConsumer:
+    def __init__(self, name: str = "counters", starts_from: str | None = None, fail: bool = False):
+        self.name = name
+        self.starts_from = starts_from
+        self.fail = fail
+        self.batches: list[list[int]] = []
+
+    async def handle(self, bot, events) -> None:
+        self.batches.append([event.id for event in events])
+        if self.fail:
+            raise RuntimeError("потребитель упал")
+
+
+def make_pipeline(dao: FakeEventsDAO, *consumers: RecordingConsumer, batch_size: int = 2) -> EventPipeline:
+    return EventPipeline(events_dao=dao, consumers=list(consumers), batch_size=batch_size, poll_interval=1)
+
+
+def test_batch_saves_offset_of_last_event():
+    async def scenario():
+        # Порядок — по (xid, id): событие 3 из ранней транзакции идёт раньше 2
+        dao = FakeEventsDAO([make_event(1, 10), make_event(2, 12), make_event(3, 11)])
+        consumer = RecordingConsumer()
+        pipeline = make_pipeline(dao, consumer)
+        await dao.ensure_offsets([consumer.name])
+
+        assert await pipeline._process_batch(None, consumer) == 2
+        assert dao.offsets[consumer.name] == (11, 3)
+        assert await pipeline._process_batch(None, consumer) == 1
+        assert dao.offsets[consumer.name] == (12, 2)
+        assert consumer.batches == [[1, 3], [2]]
+        assert pipeline.stats[consumer.name].events == 3
+        assert pipeline.stats[consumer.name].batches == 2
+
+    asyncio.run(scenario())
+
+
+def test_failed_batch_keeps_offset_and_is_retried():
+    async def scenario():
+        dao = FakeEventsDAO([make_event(1, 10), make_event(2, 10)])
+        consumer = RecordingConsumer(fail=True)
+        pipeline = make_pipeline(dao, consumer)
+        await dao.ensure_offsets([consumer.name])
+
+        with pytest.raises(RuntimeError):
+            await pipeline._process_batch(None, consumer)
+        assert dao.offsets[consumer.name] == (0, 0)
+        assert pipeline.stats[consumer.name].batches == 0
+
+        consumer.fail = False
+        assert await pipeline._process_batch(None, consumer) == 2
+        assert consumer.batches == [[1, 2], [1, 2]]
+        assert dao.offsets[consumer.name] == (10, 2)
+
+    asyncio.run(scenario())
+
+
+def test_empty_read_and_locked_offset_return_zero():
+    async def scenario():
+        dao = FakeEventsDAO([])
+        consumer = RecordingConsumer()
+        pipeline = make_pipeline(dao, consumer)
+        await dao.ensure_offsets([consumer.name])
+
+        assert await pipeline._process_batch(None, consumer) == 0
+        assert dao.offsets[consumer.name] == (0, 0)
+
+        dao.events.append(make_event(1, 10))
+        dao.locked.add(consumer.name)
+        assert await pipeline._process_batch(None, consumer) == 0
+        assert consumer.batches == []
+
+    asyncio.run(scenario())
+
+
+def test_new_consumer_starts_from_its_source_position():
+    async def scenario():
+        dao = FakeEventsDAO([])
+        dao.offsets["notifications"] = (50, 7)
+        sharded = RecordingConsumer("notifications.1", starts_from="notifications")
+        plain = RecordingConsumer("analytics")
+        pipeline = make_pipeline(dao, sharded, plain)
+
+        await pipeline.start(None)
+        await pipeline.stop()
+        assert dao.offsets["notifications.1"] == (50, 7)
+        assert dao.offsets["analytics"] == (0, 0)
+
+    asyncio.run(scenario())
+
+
+class CapturingSession:
+    """Сессия unit of work, которая запоминает запросы; scalar отдаёт заранее заданное значение"""
+
+    def __init__(self, scalar=None):
+        self.info: dict = {}
+        self.queries: list = []
+        self.scalar_value = scalar
+
+    async def execute(self, query):
+        self.queries.append(query)
+
+    async def scalar(self, query):
+        return self.scalar_value
+
+    def sql(self, index: int) -> tuple[str, dict]:
+        compiled = self.queries[index].compile(dialect=postgresql.dialect())
+        return str(compiled), compiled.params
+
+
+async def in_session(session: CapturingSession, call) -> None:
+    token = current_session.set(session)
+    try:
+        await call()
+    finally:
+        current_session.reset(token)
+
+
+def test_ensure_offsets_copies_source_position_for_new_consumers():
+    async def scenario():
+        session = CapturingSession()
+        await in_session(
+            session,
+            lambda: SwipeEventsDAO.ensure_offsets(
+                ["notifications.0", "counters"], start_from={"notifications.0": "notifications"}
+            ),
+        )
+
+        copy_sql, copy_params = session.sql(0)
+        assert "INSERT INTO event_consumer_offsets" in copy_sql and "SELECT" in copy_sql
+        assert "ON CONFLICT (consumer) DO NOTHING" in copy_sql
+        assert {"notifications.0", "notifications"} <= set(copy_params.values())
+
+        # Затем все — с начала; у скопированного уже есть строка, и ON CONFLICT её не трогает
+        rest_sql, rest_params = session.sql(1)
+        assert "ON CONFLICT (consumer) DO NOTHING" in rest_sql
+        assert {"notifications.0", "counters"} <= set(rest_params.values())
+
+    asyncio.run(scenario())
+
+
+def test_reset_offset_moves_position_before_event():
+    async def scenario():
+        session = CapturingSession(scalar=120)
+        await in_session(session, lambda: SwipeEventsDAO.reset_offset("counters", 42))
+        sql, params = session.sql(0)
+        assert "ON CONFLICT (consumer) DO UPDATE" in sql
+        assert (params["last_xid"], params["last_event_id"]) == (120, 41)
+
+        session = CapturingSession()
+        await in_session(session, lambda: SwipeEventsDAO.reset_offset("counters", 0))
+        _, params = session.sql(0)
+        assert (params["last_xid"], params["last_event_id"]) == (0, 0)
+
+        with pytest.raises(ValueError):
+            await in_session(CapturingSession(scalar=None), lambda: SwipeEventsDAO.reset_offset("counters", 42))
+
+    asyncio.run(scenario())
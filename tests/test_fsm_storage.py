@@ -0,0 +1,100 @@
+"""
+ShardedRedisStorage против локальной замены Redis (InMemoryRedis), без сервера.
+
+    uv run pytest tests/test_fsm_storage.py
+"""
+
+import asyncio
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+
+from src.bot.states.swipe_states import SwipeStates
+from src.core.fsm_storage import ShardedRedisStorage
+from src.core.memory_redis import InMemoryRedis
+
+BOT_ID = 1
+
+
+def make_key(chat_id: int) -> StorageKey:
+    return StorageKey(bot_id=BOT_ID, chat_id=chat_id, user_id=chat_id)
+
+
+def test_state_and_data_round_trip():
+    async def scenario():
+        storage = ShardedRedisStorage([InMemoryRedis()])
+        key = make_key(100)
+
+        await storage.set_state(key, SwipeStates.normal_browsing)
+        await storage.update_data(key, {"current_profile_id": 42})
+        await storage.update_data(key, {"matches_cursor": ["2026-01-01T00:00:00", 7]})
+
+        assert await storage.get_state(key) == SwipeStates.normal_browsing.state
+        assert await storage.get_data(key) == {
+            "current_profile_id": 42,
+            "matches_cursor": ["2026-01-01T00:00:00", 7],
+        }
+
+        await storage.set_state(key, None)
+        await storage.set_data(key, {})
+        assert await storage.get_state(key) is None
+        assert await storage.get_data(key) == {}
+
+    asyncio.run(scenario())
+
+
+def test_keys_are_sharded_by_chat():
+    async def scenario():
+        shards = [InMemoryRedis(), InMemoryRedis()]
+        storage = ShardedRedisStorage(shards)
+
+        await storage.set_state(make_key(10), "a")
+        await storage.set_state(make_key(11), "b")
+
+        assert storage.shard_for(make_key(10)) is shards[0]
+        assert storage.shard_for(make_key(11)) is shards[1]
+        assert await storage.get_state(make_key(10)) == "a"
+        assert await storage.get_state(make_key(11)) == "b"
+
+    asyncio.run(scenario())
+
+
+def test_write_with_ttl_is_one_round_trip():
+    async def scenario():
+        shard = InMemoryRedis()
+        storage = ShardedRedisStorage([shard], ttl=60)
+
+        await storage.set_data(make_key(5), {"current_profile_id": 1})
+
+        assert shard.commands == 1
+
+    asyncio.run(scenario())
+
+
+def test_state_expires_after_ttl():
+    async def scenario():
+        storage = ShardedRedisStorage([InMemoryRedis()], ttl=1)
+        storage.ttl_ms = 10
+        key = make_key(7)
+
+        await storage.set_state(key, "waiting")
+        await asyncio.sleep(0.05)
+
+        assert await storage.get_state(key) is None
+
+    asyncio.run(scenario())
+
+
+def test_two_processes_share_state_through_fsm_context():
+    async def scenario():
+        shards = [InMemoryRedis(), InMemoryRedis()]
+        first = FSMContext(ShardedRedisStorage(shards), make_key(3))
+        second = FSMContext(ShardedRedisStorage(shards), make_key(3))
+
+        await first.set_state(SwipeStates.viewing_matches)
+        await first.update_data(current_profile_id=9)
+
+        assert await second.get_state() == SwipeStates.viewing_matches.state
+        assert await second.get_value("current_profile_id") == 9
+
+    asyncio.run(scenario())
@@ -0,0 +1,96 @@
+"""
+LikeNotificationAggregator с коротким окном: лайки за окно — одно уведомление, получатель,
+который смотрит лайкнувших, уведомления не получает. FSM — MemoryStorage aiogram, без Telegram.
+
+    uv run pytest tests/test_like_notifications.py
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from src.bot.notifications.likes import LikeNotificationAggregator
+from src.bot.presenters.swipe import SwipePresenter
+from src.bot.states.swipe_states import SwipeStates
+
+WINDOW = 0.05
+BOT = SimpleNamespace(id=1)
+
+
+class FakeNotifications:
+    def __init__(self):
+        self.sent: list[tuple[int, str]] = []
+
+    async def enqueue(self, chat_id: int, text: str, reply_markup=None) -> None:
+        self.sent.append((chat_id, text))
+
+
+def make_aggregator() -> tuple[LikeNotificationAggregator, MemoryStorage, FakeNotifications]:
+    storage, notifications = MemoryStorage(), FakeNotifications()
+    aggregator = LikeNotificationAggregator(
+        storage=storage, presenter=SwipePresenter(), notifications=notifications, window=WINDOW
+    )
+    return aggregator, storage, notifications
+
+
+async def view_likes(storage: MemoryStorage, user_id: int) -> None:
+    await storage.set_state(StorageKey(bot_id=BOT.id, chat_id=user_id, user_id=user_id), SwipeStates.viewing_likes)
+
+
+def test_likes_within_window_are_sent_as_one_notification():
+    async def scenario():
+        aggregator, _, notifications = make_aggregator()
+        for recipient_id in (10, 10, 20, 10):
+            await aggregator.add(BOT, recipient_id)
+        assert notifications.sent == []
+
+        await asyncio.sleep(WINDOW * 3)
+        assert sorted(notifications.sent) == [
+            (10, SwipePresenter.format_likes_notification(3)),
+            (20, SwipePresenter.format_likes_notification(1)),
+        ]
+        assert aggregator.stats.likes == 4
+        assert aggregator.stats.sent == 2
+
+        # Следующий лайк открывает новое окно
+        await aggregator.add(BOT, 10)
+        await asyncio.sleep(WINDOW * 3)
+        assert notifications.sent[-1] == (10, SwipePresenter.format_likes_notification(1))
+
+    asyncio.run(scenario())
+
+
+def test_recipient_viewing_likes_is_not_notified():
+    async def scenario():
+        aggregator, storage, notifications = make_aggregator()
+        await view_likes(storage, 10)
+        await aggregator.add(BOT, 10)
+        assert not aggregator._timers
+
+        # Начал смотреть лайкнувших, пока окно было открыто, — накопленное тоже не отправляется
+        await aggregator.add(BOT, 20)
+        await aggregator.add(BOT, 20)
+        await view_likes(storage, 20)
+        await asyncio.sleep(WINDOW * 3)
+
+        assert notifications.sent == []
+        assert aggregator.stats.skipped == 3
+        assert aggregator.stats.sent == 0
+
+    asyncio.run(scenario())
+
+
+def test_flush_all_sends_pending_without_waiting_for_window():
+    async def scenario():
+        aggregator, _, notifications = make_aggregator()
+        aggregator.window = 60
+        await aggregator.add(BOT, 10)
+        await aggregator.add(BOT, 10)
+
+        await aggregator.flush_all(BOT)
+        assert notifications.sent == [(10, SwipePresenter.format_likes_notification(2))]
+        assert not aggregator._pending
+
+    asyncio.run(scenario())
@@ -0,0 +1,64 @@
+"""
+Продакшен-конвейер логов: очередь без блокировок, выборка частых событий и перехват logging.
+
+    uv run pytest tests/test_logging.py
+"""
+
+import json
+import logging
+import threading
+
+from loguru import logger
+
+from src.logger import QueueSink, intercept_std_logging, orjson_serializer, sample_hot_loggers
+
+
+def test_full_queue_drops_and_counts_instead_of_blocking():
+    release = threading.Event()
+    lines = []
+
+    def slow_output(line: str) -> None:
+        release.wait()
+        lines.append(json.loads(line))
+
+    logger.remove()
+    sink = QueueSink(orjson_serializer(), slow_output, maxsize=5)
+    logger.add(sink, format="{message}")
+    try:
+        for i in range(20):
+            logger.info("запись {}", i)
+        assert sink.dropped >= 14
+
+        release.set()
+        sink.stop()
+    finally:
+        logger.remove()
+
+    assert sink.written + sink.dropped == 20
+    assert lines[0]["message"] == "запись 0"
+    # О потерях сообщается мимо очереди, все отброшенные записи учтены
+    reports = [line for line in lines if "Очередь логов переполнена" in line["message"]]
+    assert sum(report["extra"]["dropped"] for report in reports) == sink.dropped
+
+
+def test_std_logging_is_intercepted_and_hot_loggers_sampled():
+    records = []
+    logger.remove()
+    logger.add(
+        lambda message: records.append(message.record),
+        level="DEBUG",
+        filter=sample_hot_loggers(["bench.hot"], {"INFO": 0.0}),
+    )
+    intercept_std_logging("INFO")
+    try:
+        logging.getLogger("bench.hot").info("частое %s", 1)
+        logging.getLogger("bench.hot").warning("важное %s", 2)
+        logging.getLogger("bench.other").info("обычное %s", 3)
+        logging.getLogger("bench.other").debug("ниже уровня %s", 4)
+    finally:
+        logger.remove()
+        logging.basicConfig(handlers=[], force=True)
+
+    assert [record["message"] for record in records] == ["важное 2", "обычное 3"]
+    assert records[0]["extra"]["logger"] == "bench.hot"
+    assert records[0]["function"] == "test_std_logging_is_intercepted_and_hot_loggers_sampled"
@@ -0,0 +1,69 @@
+"""
+ModerationBatcher против локального fake chat-completions сервера (tests/fake_llm_server.py), без сети.
+
+    uv run pytest tests/test_moderation_batcher.py
+"""
+
+import asyncio
+
+from langchain_mistralai import ChatMistralAI
+
+from src.bot.llm_service.batcher import ModerationBatcher
+from src.bot.llm_service.client import prompt
+from src.bot.llm_service.prompt_templates.schemas import ProfileCheck
+from tests.fake_llm_server import FakeLLMServer
+
+PORT = 18090
+
+
+def make_chain(server: FakeLLMServer):
+    llm = ChatMistralAI(api_key="test", base_url=server.base_url, model_name="fake", max_retries=0, timeout=5)
+    return prompt | llm.with_structured_output(ProfileCheck)
+
+
+def test_results_are_dispatched_to_callers():
+    async def scenario():
+        async with FakeLLMServer(PORT, latency=0.01) as server:
+            batcher = ModerationBatcher(make_chain(server), max_batch=8, max_wait=0.05, max_concurrency=4)
+            texts = [f"profile {i}" for i in range(20)] + ["buy now, spam"]
+            results = await asyncio.gather(*(batcher.submit(text) for text in texts))
+            await batcher.stop()
+
+            assert all(result.is_valid for result in results[:-1])
+            assert not results[-1].is_valid and results[-1].spam
+            assert batcher.stats.batches == 3
+            assert server.stats.max_in_flight <= 4
+
+    asyncio.run(scenario())
+
+
+def test_identical_texts_share_one_request():
+    async def scenario():
+        async with FakeLLMServer(PORT, latency=0.01) as server:
+            batcher = ModerationBatcher(make_chain(server), max_batch=8, max_wait=0.05, max_concurrency=4)
+            results = await asyncio.gather(*(batcher.submit("same bio") for _ in range(5)))
+            await batcher.stop()
+
+            assert len(results) == 5
+            assert server.stats.requests == 1
+            assert batcher.stats.deduplicated == 4
+
+    asyncio.run(scenario())
+
+
+def test_errors_reach_every_caller_of_the_text():
+    async def scenario():
+        async with FakeLLMServer(PORT, latency=0.05, max_concurrent=1) as server:
+            batcher = ModerationBatcher(make_chain(server), max_batch=8, max_wait=0.01, max_concurrency=8)
+            results = await asyncio.gather(
+                *(batcher.submit(f"profile {i}") for i in range(4)), return_exceptions=True
+            )
+            await batcher.stop()
+
+            # Сервер пропускает один запрос за раз — остальные получают 429
+            assert sum(isinstance(result, ProfileCheck) for result in results) == 1
+            assert sum(isinstance(result, Exception) for result in results) == 3
+            assert batcher.stats.failed == 3
+            assert server.stats.rejected == 3
+
+    asyncio.run(scenario())
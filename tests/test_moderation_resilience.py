@@ -0,0 +1,146 @@
+"""
+Предохранитель и дублирующие запросы модерации против двух локальных fake chat-completions серверов.
+
+    uv run pytest tests/test_moderation_resilience.py
+"""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from src.bot.llm_service.cache import ModerationCache
+from src.bot.llm_service.moderation import ModerationService
+from src.bot.llm_service.prompt_templates.schemas import DegradedProfileCheck, FallbackProfileCheck, ProfileCheck
+from src.bot.llm_service.resilience import (
+    BreakerState,
+    CircuitBreaker,
+    CircuitOpenError,
+    Endpoint,
+    ResilientModerationChain,
+)
+from tests.fake_llm_server import FakeLLMServer
+from tests.test_moderation_batcher import make_chain
+
+PRIMARY_PORT = 18093
+SECONDARY_PORT = 18094
+
+
+def make_endpoint(name: str, server: FakeLLMServer, slow_call_seconds: float = 1.0) -> Endpoint:
+    breaker = CircuitBreaker(
+        name, window=5, min_calls=3, failure_rate=0.5, slow_call_seconds=slow_call_seconds, open_seconds=0.2
+    )
+    return Endpoint(name, make_chain(server), breaker, max_concurrency=4)
+
+
+def test_slow_primary_is_hedged_to_secondary():
+    async def scenario():
+        async with (
+            FakeLLMServer(PRIMARY_PORT, latency=0.5) as primary,
+            FakeLLMServer(SECONDARY_PORT, latency=0.01) as secondary,
+        ):
+            chain = ResilientModerationChain(
+                make_endpoint("primary", primary), make_endpoint("secondary", secondary), timeout=2, hedge_delay=0.05
+            )
+            started = time.perf_counter()
+            result = await chain.ainvoke({"profile_text": "люблю горы"})
+
+            assert result.is_valid
+            assert time.perf_counter() - started < 0.4
+            assert chain.stats.hedged == 1
+            assert chain.stats.secondary_wins == 1
+            assert secondary.stats.requests == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_hedge_loser_does_not_trip_its_breaker():
+    async def scenario():
+        async with (
+            FakeLLMServer(PRIMARY_PORT, latency=0.1) as primary,
+            FakeLLMServer(SECONDARY_PORT, latency=0.5) as secondary,
+        ):
+            fallback = make_endpoint("secondary", secondary)
+            chain = ResilientModerationChain(make_endpoint("primary", primary), fallback, timeout=2, hedge_delay=0.02)
+            for _ in range(5):
+                await chain.ainvoke({"profile_text": "люблю горы"})
+
+            # Запасной каждый раз отменяли быстрее slow_call_seconds — это не его ошибка
+            assert chain.stats.hedged == 5
+            assert chain.stats.secondary_wins == 0
+            assert fallback.breaker.state == BreakerState.CLOSED
+            assert not fallback.breaker._outcomes
+
+    asyncio.run(scenario())
+
+
+def test_breaker_opens_on_slow_calls_and_recovers():
+    async def scenario():
+        async with FakeLLMServer(PRIMARY_PORT, latency=0.15) as server:
+            endpoint = make_endpoint("primary", server, slow_call_seconds=0.1)
+            chain = ResilientModerationChain(endpoint, None, timeout=2, hedge_delay=1)
+            for _ in range(3):
+                await chain.ainvoke({"profile_text": "люблю горы"})
+            assert endpoint.breaker.state == BreakerState.OPEN
+
+            # Разомкнутый предохранитель отвечает сразу, не нагружая провайдера
+            with pytest.raises(CircuitOpenError):
+                await chain.ainvoke({"profile_text": "люблю горы"})
+            assert server.stats.requests == 3
+            assert chain.stats.rejected_open == 1
+
+            server.latency = 0.01
+            await asyncio.sleep(0.2)
+            await chain.ainvoke({"profile_text": "люблю горы"})
+            assert endpoint.breaker.state == BreakerState.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_unavailable_llm_gives_degraded_verdict():
+    async def scenario():
+        async with FakeLLMServer(PRIMARY_PORT, latency=0.5) as server:
+            resilient = ResilientModerationChain(make_endpoint("primary", server), None, timeout=0.1, hedge_delay=1)
+            chain = RunnableLambda(resilient.ainvoke)
+
+            result = await ModerationService(chain, degraded_allow=True).moderate_profile("люблю горы")
+            assert isinstance(result, DegradedProfileCheck)
+            assert result.is_valid
+            assert resilient.stats.timeouts == 1
+
+            assert not await ModerationService(chain, degraded_allow=False).valid_text("люблю горы")
+
+    asyncio.run(scenario())
+
+
+class FakeResultsDAO:
+    saved: list[str] = []
+
+    @classmethod
+    async def get_result(cls, content_hash: str, model_name: str, prompt_version: str) -> dict | None:
+        return None
+
+    @classmethod
+    async def save_result(cls, content_hash: str, model_name: str, prompt_version: str, result: dict):
+        cls.saved.append(content_hash)
+
+
+def test_fallback_verdicts_are_not_cached():
+    async def scenario():
+        answers = iter([FallbackProfileCheck, ProfileCheck])
+
+        async def answer(inputs: dict) -> ProfileCheck:
+            return next(answers)(is_valid=True, toxicity=0.0, nsfw=False, spam=False, summary="ok")
+
+        cache = ModerationCache(FakeResultsDAO, model_name="primary", prompt_version="v1", maxsize=10, ttl=60)
+        service = ModerationService(RunnableLambda(answer), cache=cache)
+
+        # Ответ запасной модели не кэшируется — следующая проверка снова идёт в LLM, и её ответ уже кэшируется
+        assert isinstance(await service.moderate_profile("люблю горы"), FallbackProfileCheck)
+        assert len(cache.local) == 0
+        assert not isinstance(await service.moderate_profile("люблю горы"), FallbackProfileCheck)
+        assert len(cache.local) == 1
+        assert len(FakeResultsDAO.saved) == 1
+
+    asyncio.run(scenario())
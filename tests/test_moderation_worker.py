@@ -0,0 +1,182 @@
+"""
+ModerationWorker без БД и LLM: подставной DAO задач хранит версии в памяти, ModerationService заменён заглушкой.
+Проверяются повтор при недоступной LLM, защита от устаревшего вердикта и её SQL в ModerationJobsDAO.complete.
+
+    uv run pytest tests/test_moderation_worker.py
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from src.bot.dao.moderation import ModerationJobsDAO
+from src.bot.enum.moderation import ModerationStatus
+from src.bot.llm_service.prompt_templates.schemas import DegradedProfileCheck, ProfileCheck
+from src.bot.models.moderation import ModerationJob
+from src.bot.presenters.user_profile import UserProfilePresenter
+from src.bot.services.moderation_worker import MAX_RETRY_DELAY, ModerationWorker
+from src.core.database import current_session
+
+RETRY_DELAY = 10
+
+
+def verdict(is_valid: bool) -> ProfileCheck:
+    return ProfileCheck(is_valid=is_valid, toxicity=0.0, nsfw=False, spam=not is_valid, summary="")
+
+
+def degraded() -> DegradedProfileCheck:
+    return DegradedProfileCheck(is_valid=False, toxicity=0.0, nsfw=False, spam=False, summary="")
+
+
+class FakeJobsDAO:
+    """Текущая версия анкеты каждого пользователя в очереди и отложенные повторы"""
+
+    def __init__(self):
+        self.versions: dict[int, int] = {}
+        self.rescheduled: list[tuple[int, int, int, datetime]] = []
+
+    async def complete(self, tg_id: int, version: int) -> bool:
+        if self.versions.get(tg_id) != version:
+            return False
+        del self.versions[tg_id]
+        return True
+
+    async def reschedule(self, tg_id: int, version: int, attempts: int, available_at: datetime) -> None:
+        self.rescheduled.append((tg_id, version, attempts, available_at))
+
+
+class FakeUsersDAO:
+    statuses: dict[int, ModerationStatus] = {}
+
+    @classmethod
+    async def set_moderation_status(cls, tg_id: int, status: ModerationStatus):
+        cls.statuses[tg_id] = status
+        return SimpleNamespace(tg_id=tg_id)
+
+
+class StubModeration:
+    def __init__(self, result: ProfileCheck):
+        self.result = result
+
+    async def moderate_profile(self, text: str) -> ProfileCheck:
+        return self.result
+
+
+class FakeNotifications:
+    def __init__(self):
+        self.sent: list[tuple[int, str]] = []
+
+    async def enqueue(self, chat_id: int, text: str, reply_markup=None) -> None:
+        self.sent.append((chat_id, text))
+
+
+def make_worker(result: ProfileCheck) -> tuple[ModerationWorker, FakeJobsDAO, FakeNotifications]:
+    FakeUsersDAO.statuses = {}
+    jobs, notifications = FakeJobsDAO(), FakeNotifications()
+    worker = ModerationWorker(
+        jobs_dao=jobs,
+        users_dao=FakeUsersDAO,
+        moderation=StubModeration(result),
+        presenter=UserProfilePresenter(),
+        notifications=notifications,
+        concurrency=1,
+        lease_seconds=60,
+        retry_delay=RETRY_DELAY,
+        poll_interval=1,
+    )
+    return worker, jobs, notifications
+
+
+def make_job(tg_id: int, version: int, attempts: int = 0) -> ModerationJob:
+    return ModerationJob(tg_id=tg_id, profile_text="Аня, 25, Москва", version=version, attempts=attempts)
+
+
+def test_degraded_verdict_reschedules_with_growing_delay():
+    async def scenario():
+        worker, jobs, notifications = make_worker(degraded())
+        jobs.versions[1] = 3
+
+        started = datetime.utcnow()
+        await worker._moderate(make_job(1, version=3, attempts=2))
+
+        [(tg_id, version, attempts, available_at)] = jobs.rescheduled
+        assert (tg_id, version, attempts) == (1, 3, 3)
+        delay = (available_at - started).total_seconds()
+        assert RETRY_DELAY * 4 <= delay < RETRY_DELAY * 4 + 5
+        # Анкета остаётся в очереди и на модерации, владелец ничего не получает
+        assert jobs.versions == {1: 3}
+        assert FakeUsersDAO.statuses == {}
+        assert notifications.sent == []
+        assert worker.stats.retried == 1
+
+        jobs.rescheduled.clear()
+        await worker._moderate(make_job(1, version=3, attempts=20))
+        assert jobs.rescheduled[0][3] - started <= timedelta(seconds=MAX_RETRY_DELAY + 5)
+
+    asyncio.run(scenario())
+
+
+def test_verdict_for_replaced_profile_is_dropped():
+    async def scenario():
+        worker, jobs, notifications = make_worker(verdict(is_valid=True))
+        # Пока шла проверка версии 1, пользователь прислал новую анкету
+        jobs.versions[1] = 2
+
+        await worker._moderate(make_job(1, version=1))
+        assert jobs.versions == {1: 2}
+        assert FakeUsersDAO.statuses == {}
+        assert notifications.sent == []
+        assert worker.stats.stale == 1
+        assert worker.stats.approved == 0
+
+        await worker._moderate(make_job(1, version=2))
+        assert FakeUsersDAO.statuses == {1: ModerationStatus.APPROVED}
+        assert notifications.sent == [(1, UserProfilePresenter.format_moderation_verdict(verdict(is_valid=True)))]
+        assert worker.stats.approved == 1
+
+    asyncio.run(scenario())
+
+
+def test_rejected_verdict_sets_status_and_notifies():
+    async def scenario():
+        worker, jobs, notifications = make_worker(verdict(is_valid=False))
+        jobs.versions[1] = 1
+
+        await worker._moderate(make_job(1, version=1))
+        assert FakeUsersDAO.statuses == {1: ModerationStatus.REJECTED}
+        assert len(notifications.sent) == 1
+        assert worker.stats.rejected == 1
+
+    asyncio.run(scenario())
+
+
+class CapturingSession:
+    def __init__(self, rowcount: int):
+        self.info: dict = {}
+        self.rowcount = rowcount
+        self.queries: list = []
+
+    async def execute(self, query):
+        self.queries.append(query)
+        return SimpleNamespace(rowcount=self.rowcount)
+
+
+def test_complete_deletes_only_the_moderated_version():
+    async def scenario():
+        for rowcount, expected in ((1, True), (0, False)):
+            session = CapturingSession(rowcount)
+            token = current_session.set(session)
+            try:
+                assert await ModerationJobsDAO.complete(1, 2) is expected
+            finally:
+                current_session.reset(token)
+
+            compiled = session.queries[0].compile(dialect=postgresql.dialect())
+            sql = str(compiled)
+            assert sql.startswith("DELETE FROM moderation_jobs")
+            assert "moderation_jobs.version = " in sql
+            assert sorted(compiled.params.values()) == [1, 2]
+
+    asyncio.run(scenario())
@@ -0,0 +1,95 @@
+"""
+NotificationWorker без БД и сети: какие ошибки Telegram повторяются, какие нет, и что остановка делает с повторами.
+
+    uv run pytest tests/test_notification_worker.py
+"""
+
+import asyncio
+
+from aiogram.exceptions import TelegramForbiddenError, TelegramNetworkError
+from aiogram.methods import SendMessage
+
+from src.bot.notifications.worker import NotificationWorker
+
+METHOD = SendMessage(chat_id=1, text="мэтч")
+
+
+class FakeBot:
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.sent: list[int] = []
+
+    async def send_message(self, chat_id: int, text: str, reply_markup=None):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent.append(chat_id)
+
+
+def make_worker(max_attempts: int = 3) -> NotificationWorker:
+    return NotificationWorker(
+        outbox_dao=None, durable=False, concurrency=1, max_attempts=max_attempts, lease_seconds=60, poll_interval=1
+    )
+
+
+async def deliver(worker: NotificationWorker, bot: FakeBot, chat_id: int) -> None:
+    await worker.start(bot)
+    await worker.enqueue(chat_id, "мэтч")
+    await asyncio.wait_for(worker._queue.join(), timeout=1)
+
+
+def test_network_error_is_retried_and_stop_drops_pending_retry():
+    async def scenario():
+        worker = make_worker()
+        bot = FakeBot(TelegramNetworkError(method=METHOD, message="timeout"))
+
+        await deliver(worker, bot, 1)
+        assert worker.stats.retried == 1
+        assert len(worker._retries) == 1
+
+        await worker.stop(timeout=1)
+        assert not worker._retries
+        assert worker.stats.failed == 1
+        assert bot.sent == []
+
+    asyncio.run(scenario())
+
+
+def test_blocked_bot_is_not_retried():
+    async def scenario():
+        worker = make_worker()
+        bot = FakeBot(TelegramForbiddenError(method=METHOD, message="bot was blocked by the user"))
+
+        await deliver(worker, bot, 1)
+        assert worker.stats.failed == 1
+        assert worker.stats.retried == 0
+        assert not worker._retries
+        await worker.stop(timeout=1)
+
+    asyncio.run(scenario())
+
+
+def test_retries_stop_after_max_attempts():
+    async def scenario():
+        worker = make_worker(max_attempts=1)
+        bot = FakeBot(TelegramNetworkError(method=METHOD, message="timeout"))
+
+        await deliver(worker, bot, 1)
+        assert worker.stats.failed == 1
+        assert worker.stats.retried == 0
+        assert not worker._retries
+        await worker.stop(timeout=1)
+
+    asyncio.run(scenario())
+
+
+def test_successful_send():
+    async def scenario():
+        worker = make_worker()
+        bot = FakeBot()
+
+        await deliver(worker, bot, 7)
+        await worker.stop(timeout=1)
+        assert bot.sent == [7]
+        assert worker.stats.sent == 1
+
+    asyncio.run(scenario())
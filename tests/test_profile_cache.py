@@ -0,0 +1,122 @@
+"""
+Кэш анкет: TTLLRUCache, два уровня ProfileCache с общим бэкендом (InMemoryCacheBackend) и чтение
+UsersDAO.get_by_tg_id после записи в том же unit of work, без БД.
+
+    uv run pytest tests/test_profile_cache.py
+"""
+
+import asyncio
+
+from src.bot.dao import user as user_dao
+from src.bot.dao.profile_cache import ProfileCache
+from src.bot.dao.user import UsersDAO
+from src.bot.models.user import Users
+from src.core.cache import InMemoryCacheBackend, TTLLRUCache
+from src.core.database import current_session
+
+
+def test_ttl_lru_cache_evicts_least_recently_used():
+    cache = TTLLRUCache(maxsize=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    assert cache.get(1) == "a"  # 1 становится самым свежим
+
+    cache.set(3, "c")
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.get(3) == "c"
+    assert cache.stats.evictions == 1
+    assert cache.stats.hits == 3
+    assert cache.stats.misses == 1
+
+
+def test_ttl_lru_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("src.core.cache.time.monotonic", lambda: now[0])
+    cache = TTLLRUCache(maxsize=10, ttl=5)
+    cache.set(1, "a")
+
+    now[0] += 4.9
+    assert cache.get(1) == "a"
+    now[0] += 0.1
+    assert cache.get(1) is None
+    assert len(cache) == 0
+    assert cache.stats.expirations == 1
+
+    cache.set(2, "b")
+    cache.delete(2)
+    cache.delete(2)
+    assert cache.stats.invalidations == 1
+
+
+def test_profile_cache_shares_values_and_invalidations_between_processes():
+    async def scenario():
+        backend = InMemoryCacheBackend()
+        first, second = ProfileCache(100, 60, backend), ProfileCache(100, 60, backend)
+        await first.start()
+        await second.start()
+
+        await first.set(Users(id=1, tg_id=10, name="Аня", report_count=0))
+        user = await second.get(10)
+        assert user.name == "Аня"
+        assert second.shared_stats.hits == 1
+        assert len(second.local) == 1
+
+        # Инвалидация в одном процессе убирает копию и из общего кэша, и из локального у другого
+        await first.invalidate(10)
+        assert len(second.local) == 0
+        assert await second.get(10) is None
+        assert second.shared_stats.misses == 1
+
+    asyncio.run(scenario())
+
+
+class FakeResult:
+    def __init__(self, user: Users):
+        self.user = user
+
+    def scalar_one_or_none(self) -> Users:
+        return self.user
+
+
+class FakeSession:
+    """Сессия unit of work, которая на любой запрос отдаёт анкету из «БД»"""
+
+    def __init__(self, user: Users):
+        self.info: dict = {}
+        self.user = user
+        self.queries = 0
+
+    async def execute(self, query) -> FakeResult:
+        self.queries += 1
+        return FakeResult(self.user)
+
+
+def test_get_by_tg_id_bypasses_cache_after_write_in_same_unit_of_work(monkeypatch):
+    async def scenario():
+        cache = ProfileCache(100, 60, InMemoryCacheBackend())
+        monkeypatch.setattr(user_dao, "profile_cache", cache)
+        await cache.set(Users(id=1, tg_id=10, name="Старое имя", report_count=0))
+
+        session = FakeSession(Users(id=1, tg_id=10, name="Новое имя", report_count=0))
+        token = current_session.set(session)
+        try:
+            assert (await UsersDAO.get_by_tg_id(10)).name == "Старое имя"
+            assert session.queries == 0
+
+            # Запись (как в session_scope) сбросила только локальную копию; в общем кэше до коммита лежит старая
+            session.info["has_writes"] = True
+            UsersDAO._invalidate_profile(session, 10)
+            assert (await UsersDAO.get_by_tg_id(10)).name == "Новое имя"
+            assert (await UsersDAO.get_by_tg_id(10)).name == "Новое имя"
+            assert session.queries == 2
+            assert len(cache.local) == 0
+        finally:
+            current_session.reset(token)
+
+        # После коммита инвалидация доходит и до общего кэша
+        for callback in session.info["after_commit"]:
+            await callback()
+        assert await cache.get(10) is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,147 @@
+"""
+Проверка планов горячих запросов DAO к таблице likes.
+
+Каждый DAO-метод вызывается на засеянной локальной PostgreSQL (настройки из .env,
+миграции применены), его SQL перехватывается и прогоняется через EXPLAIN.
+Тест падает, если планировщик выбрал Seq Scan по likes.
+
+Тест пишет в базу и удаляет за собой анкеты с tg_id от 9_100_000_000, поэтому запускается только явно,
+с RUN_DB_TESTS=1; если база недоступна, он пропускается.
+
+    RUN_DB_TESTS=1 uv run pytest tests/test_query_plans.py
+"""
+
+import asyncio
+import json
+import os
+
+import pytest
+from sqlalchemy import event, text
+
+from src.bot.dao.like import LikesDAO
+from src.core.database import async_session_maker, engine
+
+BASE_TG_ID = 9_100_000_000
+USERS = 2_000
+LIKES_PER_USER = 20
+WATCHED_TABLES = {"likes"}
+
+ME = BASE_TG_ID + 1
+OTHER = BASE_TG_ID + 2
+
+pytestmark = pytest.mark.skipif(
+    os.environ.get("RUN_DB_TESTS") != "1", reason="пишет в базу из .env: запускается с RUN_DB_TESTS=1"
+)
+
+
+def run(coro):
+    async def wrapper():
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(wrapper())
+
+
+async def seed():
+    async with async_session_maker() as session:
+        await session.execute(
+            text(
+                """
+                INSERT INTO users (tg_id, name, age, city, user_gender, gender_interest, status_of_the_questionnaire)
+                SELECT :base + g, 'plan', 25, 'plan', 'female', 'male', true FROM generate_series(0, :users) AS g
+                """
+            ),
+            {"base": BASE_TG_ID, "users": USERS},
+        )
+        await session.execute(
+            text(
+                """
+                INSERT INTO likes (from_user_id, to_user_id, is_like, created_at)
+                SELECT :base + u, :base + (u + k) % :users, (u + k) % 2 = 0, now()
+                FROM generate_series(1, :users - 1) AS u, generate_series(1, :per_user) AS k
+                ON CONFLICT DO NOTHING
+                """
+            ),
+            {"base": BASE_TG_ID, "users": USERS, "per_user": LIKES_PER_USER},
+        )
+        await session.commit()
+    async with engine.connect() as connection:
+        await connection.execute(text("ANALYZE users"))
+        await connection.execute(text("ANALYZE likes"))
+
+
+async def cleanup():
+    async with async_session_maker() as session:
+        await session.execute(
+            text("DELETE FROM likes WHERE from_user_id >= :base OR to_user_id >= :base"), {"base": BASE_TG_ID}
+        )
+        await session.execute(text("DELETE FROM users WHERE tg_id >= :base"), {"base": BASE_TG_ID})
+        await session.commit()
+
+
+async def capture_statements(call) -> list[tuple[str, tuple]]:
+    """Выполнить DAO-вызов и вернуть все отправленные им SQL-запросы с параметрами"""
+    statements: list[tuple[str, tuple]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        await call()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def seq_scanned_tables(plan: dict) -> set[str]:
+    tables = set()
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in WATCHED_TABLES:
+        tables.add(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        tables |= seq_scanned_tables(child)
+    return tables
+
+
+async def explain(call) -> set[str]:
+    statements = await capture_statements(call)
+    assert statements, "DAO-метод не отправил ни одного запроса"
+
+    tables = set()
+    async with engine.connect() as connection:
+        for statement, parameters in statements:
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = result.scalar_one()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            tables |= seq_scanned_tables(plan[0]["Plan"])
+    return tables
+
+
+HOT_QUERIES = {
+    "check_mutual_like": lambda: LikesDAO.check_mutual_like(ME, OTHER),
+    "already_rated": lambda: LikesDAO.already_rated(ME, OTHER),
+    "get_rated_user_ids": lambda: LikesDAO.get_rated_user_ids(ME),
+    "get_users_who_liked_me": lambda: LikesDAO.get_users_who_liked_me(ME),
+    "get_users_i_liked_from_list": lambda: LikesDAO.get_users_i_liked_from_list(ME, [OTHER, OTHER + 1]),
+    "delete_likes_by_user": lambda: LikesDAO.delete_likes_by_user(BASE_TG_ID + USERS + 1),
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seeded_database():
+    try:
+        run(cleanup())
+        run(seed())
+    except Exception as e:
+        # Нет сервера, не та база, не применены миграции — проверять нечего
+        pytest.skip(f"Локальная PostgreSQL недоступна: {e!r}")
+    yield
+    run(cleanup())
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_indexes(name):
+    tables = run(explain(HOT_QUERIES[name]))
+    assert not tables, f"{name}: Seq Scan по {', '.join(sorted(tables))}"
@@ -0,0 +1,114 @@
+"""
+ReportTriageWorker.triage_batch без БД и LLM: подставные DAO жалоб и анкет, проверка комментариев — заглушка.
+
+    uv run pytest tests/test_report_triage.py
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from src.bot.llm_service.prompt_templates.schemas import ReportCheck
+from src.bot.services.report_triage import ReportTriageWorker
+
+
+def report(report_id: int, target: int, comment: str | None) -> SimpleNamespace:
+    return SimpleNamespace(id=report_id, target_user_id=target, comment=comment)
+
+
+class FakeReportsDAO:
+    def __init__(self, reports: list[SimpleNamespace]):
+        self.reports = {item.id: item for item in reports}
+        self.reviewed: dict[int, bool] = {}  # id -> учтена ли жалоба
+
+    async def claim_unreviewed(self, limit: int, lease_seconds: float) -> list[SimpleNamespace]:
+        return [item for item_id, item in self.reports.items() if item_id not in self.reviewed][:limit]
+
+    async def mark_reviewed(self, accepted: list[int], dismissed: list[int], reviewed_at) -> list[int]:
+        self.reviewed.update({item_id: True for item_id in accepted})
+        self.reviewed.update({item_id: False for item_id in dismissed})
+        return [self.reports[item_id].target_user_id for item_id in accepted]
+
+
+class FakeUsersDAO:
+    increments: list[dict[int, int]] = []
+
+    @classmethod
+    async def increment_report_counts(cls, counts: dict[int, int]) -> None:
+        cls.increments.append(counts)
+
+
+class StubChecker:
+    """Вердикт по комментарию из словаря; None — LLM недоступна"""
+
+    def __init__(self, verdicts: dict[str, bool | None]):
+        self.verdicts = verdicts
+        self.checked: list[str] = []
+
+    async def check(self, comment: str) -> ReportCheck | None:
+        self.checked.append(comment)
+        is_genuine = self.verdicts[comment]
+        return None if is_genuine is None else ReportCheck(is_genuine=is_genuine, summary="")
+
+
+def make_worker(reports: list[SimpleNamespace], verdicts: dict[str, bool | None]):
+    FakeUsersDAO.increments = []
+    reports_dao, checker = FakeReportsDAO(reports), StubChecker(verdicts)
+    worker = ReportTriageWorker(
+        reports_dao=reports_dao,
+        users_dao=FakeUsersDAO,
+        checker=checker,
+        batch_size=10,
+        lease_seconds=60,
+        poll_interval=1,
+    )
+    return worker, reports_dao, checker
+
+
+def test_triage_batch_accepts_dismisses_and_defers():
+    async def scenario():
+        worker, reports_dao, checker = make_worker(
+            [
+                report(1, target=100, comment="Просит перевести деньги"),
+                report(2, target=100, comment="  Просит перевести деньги "),
+                report(3, target=200, comment=None),
+                report(4, target=200, comment="   "),
+                report(5, target=300, comment="купи крипту t.me/spam"),
+                report(6, target=400, comment="фото чужие"),
+            ],
+            {"Просит перевести деньги": True, "купи крипту t.me/spam": False, "фото чужие": None},
+        )
+
+        assert await worker.triage_batch() == 5
+
+        # Одинаковые комментарии проверяются один раз
+        assert sorted(checker.checked) == sorted(["Просит перевести деньги", "купи крипту t.me/spam", "фото чужие"])
+        # Без комментария жалоба учитывается как есть; спам в комментарии — отклоняется; без вердикта — ждёт
+        assert reports_dao.reviewed == {1: True, 2: True, 3: True, 4: True, 5: False}
+        # Учтённые жалобы складываются по анкете одним запросом
+        assert FakeUsersDAO.increments == [{100: 2, 200: 2}]
+        assert (worker.stats.accepted, worker.stats.dismissed, worker.stats.deferred) == (4, 1, 1)
+        assert worker.stats.batches == 1
+
+    asyncio.run(scenario())
+
+
+def test_batch_with_only_deferred_reports_writes_nothing():
+    async def scenario():
+        worker, reports_dao, _ = make_worker([report(1, target=100, comment="фото чужие")], {"фото чужие": None})
+
+        assert await worker.triage_batch() == 0
+        assert reports_dao.reviewed == {}
+        assert FakeUsersDAO.increments == []
+        assert worker.stats.deferred == 1
+        assert worker.stats.batches == 0
+
+    asyncio.run(scenario())
+
+
+def test_empty_claim_returns_zero():
+    async def scenario():
+        worker, _, checker = make_worker([], {})
+        assert await worker.triage_batch() == 0
+        assert checker.checked == []
+
+    asyncio.run(scenario())
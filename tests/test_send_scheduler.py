@@ -0,0 +1,97 @@
+"""
+Планировщик исходящих запросов: token bucket, приоритет полос и RetryAfter, без сети.
+
+    uv run pytest tests/test_send_scheduler.py
+"""
+
+import asyncio
+import time
+
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import SendMessage
+
+from src.bot.middlewares.send_scheduler import SendSchedulerMiddleware
+from src.core.send_scheduler import Lane, SendScheduler, TokenBucket
+
+
+def test_token_bucket_refills_at_rate_up_to_capacity():
+    bucket = TokenBucket(rate=2, capacity=3)
+    now = bucket.updated
+
+    for _ in range(3):
+        assert bucket.delay(now) == 0
+        bucket.take()
+    assert bucket.delay(now) == 0.5
+
+    assert bucket.delay(now + 0.5) == 0
+    assert bucket.delay(now + 100) == 0
+    assert bucket.tokens == 3
+    assert bucket.is_idle(now + 100)
+
+
+def test_token_bucket_block_overrides_tokens():
+    bucket = TokenBucket(rate=10, capacity=10)
+    now = bucket.updated
+
+    bucket.block(2, now)
+    bucket.block(1, now)  # более короткая пауза не сокращает уже назначенную
+
+    assert bucket.delay(now + 0.5) == 1.5
+    assert bucket.delay(now + 2) == 0
+
+
+def test_replies_overtake_queued_notifications():
+    async def scenario():
+        scheduler = SendScheduler(global_rate=10, chat_rate=100, chat_burst=100)
+        scheduler.global_bucket = TokenBucket(rate=10, capacity=1)
+        order = []
+
+        async def send(chat_id: int, lane: Lane):
+            await scheduler.acquire(chat_id, lane)
+            order.append(lane)
+
+        # Уведомления встали в очередь раньше ответа, но ответ уходит первым
+        await asyncio.gather(
+            send(1, Lane.NOTIFICATION), send(2, Lane.NOTIFICATION), send(3, Lane.REPLY), send(4, Lane.NOTIFICATION)
+        )
+        assert order == [Lane.REPLY, Lane.NOTIFICATION, Lane.NOTIFICATION, Lane.NOTIFICATION]
+        assert scheduler.stats.sent == {Lane.REPLY: 1, Lane.NOTIFICATION: 3}
+
+    asyncio.run(scenario())
+
+
+def test_retry_after_pauses_only_that_chat():
+    async def scenario():
+        scheduler = SendScheduler(global_rate=100, chat_rate=100, chat_burst=100)
+        scheduler.retry_after(1, 0.3)
+
+        started = time.monotonic()
+        await scheduler.acquire(2, Lane.NOTIFICATION)
+        assert time.monotonic() - started < 0.1
+
+        await scheduler.acquire(1, Lane.NOTIFICATION)
+        assert time.monotonic() - started >= 0.29
+        assert scheduler.stats.retry_after == 1
+
+    asyncio.run(scenario())
+
+
+def test_middleware_repeats_request_after_retry_after():
+    async def scenario():
+        scheduler = SendScheduler(global_rate=100, chat_rate=100, chat_burst=100)
+        middleware = SendSchedulerMiddleware(scheduler)
+        method = SendMessage(chat_id=42, text="мэтч")
+        calls = []
+
+        async def make_request(bot, request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise TelegramRetryAfter(method=request, message="Flood control exceeded", retry_after=0)
+            return "ok"
+
+        assert await middleware(make_request, None, method) == "ok"
+        assert len(calls) == 2
+        assert scheduler.stats.retry_after == 1
+        assert scheduler.stats.sent[Lane.NOTIFICATION] == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,130 @@
+"""
+Режим нескольких процессов без Telegram и без запуска процессов: порядок апдейтов одного пользователя
+и слоты в UpdateWorker, раскладка апдейтов по обработчикам и перезапуск по SIGHUP.
+
+    uv run pytest tests/test_supervisor.py
+"""
+
+import asyncio
+import os
+import queue
+import signal
+
+from aiogram.types import Update
+
+from src.supervisor import Supervisor, UpdateWorker
+
+
+class FakeDispatcher:
+    """Апдейт {"update_id", "delay"} обрабатывается delay секунд; порядок начала и конца записывается"""
+
+    def __init__(self):
+        self.started: list[int] = []
+        self.finished: list[int] = []
+
+    async def feed_raw_update(self, bot, update: dict) -> None:
+        self.started.append(update["update_id"])
+        await asyncio.sleep(update["delay"])
+        self.finished.append(update["update_id"])
+
+
+def make_updates(*items: tuple[int, int, float]) -> queue.Queue:
+    """(user_id, update_id, delay) по порядку и None в конце — «доработай и выйди»"""
+    updates = queue.Queue()
+    for user_id, update_id, delay in items:
+        updates.put((user_id, {"update_id": update_id, "delay": delay}))
+    updates.put(None)
+    return updates
+
+
+def test_updates_of_one_user_are_handled_in_order():
+    async def scenario():
+        dp = FakeDispatcher()
+        worker = UpdateWorker(0, None, dp, queue.Queue(), concurrency=10, backlog=100)
+        # У первого апдейта пользователя 1 самая долгая обработка, но следующие его не обгоняют
+        await worker.run(make_updates((1, 1, 0.05), (2, 2, 0), (1, 3, 0), (1, 4, 0.01), (2, 5, 0)))
+
+        assert [update_id for update_id in dp.finished if update_id in (1, 3, 4)] == [1, 3, 4]
+        assert [update_id for update_id in dp.finished if update_id in (2, 5)] == [2, 5]
+        assert dp.finished.index(2) < dp.finished.index(1)  # другой пользователь не ждёт первого
+        assert worker.metrics.processed == 5
+        assert worker.metrics.in_flight == 0
+        assert not worker._locks
+
+    asyncio.run(scenario())
+
+
+def test_chatty_user_does_not_take_all_slots():
+    async def scenario():
+        dp = FakeDispatcher()
+        worker = UpdateWorker(0, None, dp, queue.Queue(), concurrency=2, backlog=100)
+        # Пять апдейтов пользователя 1 ждут друг друга, но слот держит только один из них
+        chatty = [(1, update_id, 0.02) for update_id in range(1, 6)]
+        await worker.run(make_updates(*chatty, (2, 6, 0)))
+
+        assert dp.finished.index(6) < dp.finished.index(2)
+        assert [update_id for update_id in dp.finished if update_id != 6] == [1, 2, 3, 4, 5]
+
+    asyncio.run(scenario())
+
+
+def message_update(update_id: int, user_id: int) -> Update:
+    return Update.model_validate(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": 0,
+                "chat": {"id": user_id, "type": "private"},
+                "from": {"id": user_id, "is_bot": False, "first_name": "Аня"},
+                "text": "/search",
+            },
+        }
+    )
+
+
+def test_updates_are_sharded_by_user_id():
+    supervisor = Supervisor(workers=3)
+    for update_id, user_id in enumerate([7, 9, 7, 11, 3], start=1):
+        supervisor.dispatch(message_update(update_id, user_id))
+
+    received = {}
+    for index, worker_queue in enumerate(supervisor.queues):
+        for _ in range(supervisor.dispatched[index]):
+            user_id, update = worker_queue.get(timeout=1)
+            received.setdefault(index, []).append((user_id, update["update_id"]))
+
+    # user_id % 3: пользователь всегда в одном обработчике, его апдейты — в порядке прихода
+    assert received == {0: [(9, 2), (3, 5)], 1: [(7, 1), (7, 3)], 2: [(11, 4)]}
+    assert supervisor.dispatched == [2, 2, 1]
+
+
+def test_sighup_restarts_workers_one_by_one():
+    async def scenario():
+        supervisor = Supervisor(workers=2)
+        events = []
+
+        async def stop_worker(index: int) -> None:
+            events.append(("stop", index, sorted(supervisor._restarting)))
+            await asyncio.sleep(0)
+
+        supervisor.stop_worker = stop_worker
+        supervisor.start_worker = lambda index: events.append(("start", index))
+        supervisor.install_signal_handlers()
+        try:
+            os.kill(os.getpid(), signal.SIGHUP)
+            for _ in range(100):
+                if supervisor._restart_task is not None and supervisor._restart_task.done():
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+                loop.remove_signal_handler(sig)
+
+        # Пока обработчик перезапускается, watch() не поднимает его второй раз
+        assert events == [("stop", 0, [0]), ("start", 0), ("stop", 1, [1]), ("start", 1)]
+        assert supervisor.restarts == [1, 1]
+        assert not supervisor._restarting
+
+    asyncio.run(scenario())
@@ -0,0 +1,46 @@
+"""
+Локальные уровни модерации: правила и классификатор, без LLM.
+
+    uv run pytest tests/test_tiered_moderation.py
+"""
+
+from src.bot.llm_service.classifier import LinearClassifier
+from src.bot.llm_service.rules import AhoCorasick, RuleTier
+from src.bot.llm_service.tiered import TieredModerator
+
+
+def test_aho_corasick_matches_from_word_start():
+    automaton = AhoCorasick(["хуй", "пизд", "ставки на спорт"])
+
+    assert automaton.find("страхуй меня") == set()
+    assert automaton.find("ну ты пиздец") == {"пизд"}
+    assert automaton.find("лучшие ставки на спорт тут") == {"ставки на спорт"}
+
+
+def test_rules_reject_links_phones_and_profanity():
+    rules = RuleTier()
+
+    assert rules.check("Пиши в телеграм t.me/deals").spam
+    assert rules.check("Звони +7 (912) 345-67-89").spam
+    assert rules.check("Ты СУКА").toxicity == 1.0
+    assert rules.check("Мне 27, рост 180, страхую жизни") is None
+
+
+def test_rules_leave_ambiguous_words_to_next_tiers():
+    rules = RuleTier()
+
+    assert rules.check("Работаю программистом, увлекаюсь криптографией") is None
+    assert rules.check("Люблю фильм Казино Рояль") is None
+    assert not rules.check("Лучшее онлайн-казино, пиши").is_valid
+
+
+def test_uncertain_texts_escalate_to_llm():
+    texts = ["люблю горы и походы", "люблю кино и театр", "заработок без вложений", "доход без вложений пиши"]
+    classifier = LinearClassifier.fit(texts, [0, 0, 1, 1], n_features=2**12)
+    moderator = TieredModerator(RuleTier(), classifier, accept_below=0.2, reject_above=0.8)
+
+    assert moderator.check("люблю горы").is_valid
+    assert not moderator.check("заработок без вложений").is_valid
+    assert moderator.check("люблю заработок") is None
+    assert moderator.stats["classifier"].checks == 3
+    assert moderator.stats["classifier"].verdicts == 2